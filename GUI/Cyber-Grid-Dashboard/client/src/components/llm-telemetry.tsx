@@ -0,0 +1,128 @@
+import { motion } from "framer-motion";
+import { useState } from "react";
+import type { LlmTelemetry } from "@/hooks/use-websocket";
+
+interface LlmTelemetryPanelProps {
+  telemetry: LlmTelemetry | null;
+}
+
+const HISTOGRAM_METRICS = ["wall_ms", "queue_ms", "prefill_ms", "decode_ms"];
+
+function formatMs(ms: number): string {
+  if (!ms) return "-";
+  return ms >= 1000 ? `${(ms / 1000).toFixed(1)}s` : `${Math.round(ms)}ms`;
+}
+
+function bucketLabel(bucket: string): string {
+  if (bucket === "inf") return ">";
+  const edge = Number(bucket.replace("le_", ""));
+  return edge >= 1000 ? `${edge / 1000}s` : `${edge}`;
+}
+
+export function LlmTelemetryPanel({ telemetry }: LlmTelemetryPanelProps) {
+  const [metric, setMetric] = useState("wall_ms");
+  const rows = Object.entries(telemetry?.breakdown ?? {}).sort((a, b) => b[1].count - a[1].count);
+  const histogram = telemetry?.histograms?.[metric] ?? {};
+  const buckets = Object.entries(histogram);
+  const peak = Math.max(1, ...buckets.map(([, n]) => n));
+
+  return (
+    <motion.div
+      className="relative rounded-md p-3"
+      style={{
+        background: "rgba(10,15,30,0.6)",
+        backdropFilter: "blur(16px)",
+        border: "1px solid rgba(148,163,184,0.06)",
+      }}
+      initial={{ opacity: 0 }}
+      animate={{ opacity: 1 }}
+      transition={{ duration: 0.5, delay: 0.35 }}
+      data-testid="llm-telemetry"
+    >
+      <div className="flex items-center justify-between mb-3 px-1">
+        <div className="text-[10px] font-mono tracking-[0.3em] text-muted-foreground/60 uppercase">
+          LLM Calls
+        </div>
+        <div className="text-[9px] font-mono text-muted-foreground/40">
+          {telemetry ? `${telemetry.total_calls} total / last ${telemetry.window}` : "no calls yet"}
+        </div>
+      </div>
+
+      {telemetry?.single_flight && telemetry.single_flight.hits > 0 && (
+        <div className="text-[9px] font-mono text-muted-foreground/50 mb-2 px-1" data-testid="llm-telemetry-shared">
+          shared {telemetry.single_flight.hits}/{telemetry.single_flight.calls} identical requests
+          {telemetry.single_flight.timeouts > 0 && ` (${telemetry.single_flight.timeouts} gave up waiting)`}
+        </div>
+      )}
+
+      {rows.length > 0 && (
+        <table className="w-full text-[9px] font-mono mb-3" data-testid="llm-telemetry-breakdown">
+          <thead>
+            <tr className="text-muted-foreground/50">
+              <th className="text-left font-normal pb-1">site/tier</th>
+              <th className="text-right font-normal pb-1">n</th>
+              <th className="text-right font-normal pb-1">prefill p50/p95</th>
+              <th className="text-right font-normal pb-1">tok/s</th>
+              <th className="text-right font-normal pb-1">queue p95</th>
+            </tr>
+          </thead>
+          <tbody>
+            {rows.map(([key, s]) => (
+              <tr key={key} className="text-foreground/70">
+                <td className="truncate max-w-[90px] pr-1" title={key}>{key}</td>
+                <td className="text-right">{s.count}</td>
+                <td className="text-right">
+                  {formatMs(s.prefill_ms.p50)}/{formatMs(s.prefill_ms.p95)}
+                </td>
+                <td className="text-right">{s.decode_tps.p50 ? Math.round(s.decode_tps.p50) : "-"}</td>
+                <td className="text-right">{formatMs(s.queue_ms.p95)}</td>
+              </tr>
+            ))}
+          </tbody>
+        </table>
+      )}
+
+      {buckets.length > 0 && (
+        <div data-testid="llm-telemetry-histogram">
+          <div className="flex gap-1 mb-2">
+            {HISTOGRAM_METRICS.map((m) => (
+              <button
+                key={m}
+                onClick={() => setMetric(m)}
+                className="text-[8px] font-mono px-1.5 py-0.5 rounded-sm"
+                style={{
+                  color: m === metric ? "rgb(234,179,8)" : "rgba(148,163,184,0.5)",
+                  background: m === metric ? "rgba(234,179,8,0.1)" : "transparent",
+                }}
+              >
+                {m.replace("_ms", "")}
+              </button>
+            ))}
+          </div>
+          <div className="flex items-end gap-[2px] h-12">
+            {buckets.map(([bucket, n]) => (
+              <div key={bucket} className="flex-1 flex flex-col items-center justify-end h-full" title={`${bucket}: ${n}`}>
+                <div
+                  className="w-full rounded-sm"
+                  style={{
+                    height: `${(n / peak) * 100}%`,
+                    minHeight: n ? 2 : 0,
+                    background: "rgba(234,179,8,0.6)",
+                    boxShadow: "0 0 6px rgba(234,179,8,0.3)",
+                  }}
+                />
+              </div>
+            ))}
+          </div>
+          <div className="flex gap-[2px] mt-1">
+            {buckets.map(([bucket]) => (
+              <div key={bucket} className="flex-1 text-center text-[7px] font-mono text-muted-foreground/40">
+                {bucketLabel(bucket)}
+              </div>
+            ))}
+          </div>
+        </div>
+      )}
+    </motion.div>
+  );
+}
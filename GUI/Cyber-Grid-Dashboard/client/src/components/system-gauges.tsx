@@ -79,6 +79,24 @@ export function SystemGauges({ metrics }: SystemGaugesProps) {
           glowColor="rgba(234,179,8,0.4)"
           testId="gauge-ollama"
         />
+        <CircularGauge
+          label="LLM Prefill"
+          value={metrics.llmPrefillMs ?? 0}
+          maxValue={5000}
+          unit="ms"
+          color="rgb(244,114,182)"
+          glowColor="rgba(244,114,182,0.4)"
+          testId="gauge-llm-prefill"
+        />
+        <CircularGauge
+          label="LLM Decode"
+          value={metrics.llmTokensPerSec ?? 0}
+          maxValue={100}
+          unit="tok/s"
+          color="rgb(45,212,191)"
+          glowColor="rgba(45,212,191,0.4)"
+          testId="gauge-llm-decode"
+        />
       </div>
     </motion.div>
   );
@@ -7,6 +7,10 @@ export interface SystemMetrics {
   cpuTemp: number;
   npu: number;
   ollama: number;
+  llmTokensPerSec?: number;
+  llmPrefillMs?: number;
+  llmDecodeMs?: number;
+  llmQueueMs?: number;
 }
 
 export interface JarvisState {
@@ -34,12 +38,47 @@ export interface TickerItem {
   label: string;
 }
 
+export interface Percentiles {
+  p50: number;
+  p95: number;
+}
+
+export interface LlmCallSummary {
+  count: number;
+  wall_ms: Percentiles;
+  queue_ms: Percentiles;
+  load_ms: Percentiles;
+  prefill_ms: Percentiles;
+  decode_ms: Percentiles;
+  prefill_tps: Percentiles;
+  decode_tps: Percentiles;
+}
+
+export interface SingleFlightStats {
+  calls: number;
+  executed: number;
+  hits: number;  // calls that shared an identical in-flight request
+  max_attached: number;
+  timeouts: number;
+  hit_rate: number;
+}
+
+export interface LlmTelemetry {
+  total_calls: number;
+  window: number;
+  buckets_ms: number[];
+  breakdown: Record<string, LlmCallSummary>;  // keyed by "call_site/tier"
+  histograms: Record<string, Record<string, number>>;  // metric -> {"le_50": n, ..., "inf": n}
+  single_flight?: SingleFlightStats;
+}
+
 export interface DashboardData {
   metrics: SystemMetrics;
   jarvisState: JarvisState;
   logs: LogEntry[];
   focusContent: FocusContent;
   tickerItems: TickerItem[];
+  llmTelemetry: LlmTelemetry | null;
   networkStatus: "5G" | "4G" | "3G" | "disconnected";
   encryptionStatus: "AES-256" | "AES-128" | "none";
   isConnected: boolean;
@@ -60,6 +99,7 @@ const initialData: DashboardData = {
     content: "Jarvis is listening. Ask a question, request a search, or just start talking.",
   },
   tickerItems: [],
+  llmTelemetry: null,
   networkStatus: "5G",
   encryptionStatus: "AES-256",
   isConnected: false,
@@ -98,6 +138,8 @@ export function useWebSocket() {
             setData((prev) => ({ ...prev, focusContent: message.data }));
           } else if (message.type === "ticker") {
             setData((prev) => ({ ...prev, tickerItems: message.data || [] }));
+          } else if (message.type === "llm_telemetry") {
+            setData((prev) => ({ ...prev, llmTelemetry: message.data }));
           } else if (message.type === "full") {
             setData((prev) => ({ ...prev, ...message.data, isConnected: true }));
           }
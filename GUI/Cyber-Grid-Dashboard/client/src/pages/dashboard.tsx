@@ -3,6 +3,7 @@ import { DashboardHeader } from "@/components/dashboard-header";
 import { AIOrb } from "@/components/ai-orb";
 import { SidebarControls } from "@/components/sidebar-controls";
 import { SystemGauges } from "@/components/system-gauges";
+import { LlmTelemetryPanel } from "@/components/llm-telemetry";
 import { FocusWindow } from "@/components/focus-window";
 import { TerminalLog } from "@/components/terminal-log";
 import { MoodTracker } from "@/components/mood-tracker";
@@ -83,6 +84,8 @@ export default function Dashboard() {
             />
 
             <SystemGauges metrics={data.metrics} />
+
+            <LlmTelemetryPanel telemetry={data.llmTelemetry} />
           </motion.aside>
 
           <main className="flex-1 flex flex-col gap-4 p-4 overflow-hidden">
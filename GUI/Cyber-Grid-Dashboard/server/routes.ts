@@ -11,6 +11,10 @@ interface SystemMetrics {
   cpuTemp: number;
   npu: number;
   ollama: number;
+  llmTokensPerSec?: number;
+  llmPrefillMs?: number;
+  llmDecodeMs?: number;
+  llmQueueMs?: number;
 }
 
 interface JarvisState {
@@ -25,6 +29,9 @@ interface TickerItem {
   label: string;
 }
 
+// Rolling LLM call breakdown from core/llm_telemetry.py (LLMTelemetry.snapshot)
+type LlmTelemetry = Record<string, unknown>;
+
 
 export async function registerRoutes(
   httpServer: Server,
@@ -44,6 +51,7 @@ export async function registerRoutes(
   let logs: Array<{ id: string; timestamp: string; level: string; message: string }> = [];
   const maxLogs = 50;  // Keep last 50 logs
   let tickerItems: TickerItem[] = [];
+  let llmTelemetry: LlmTelemetry | null = null;
 
   let currentFocus: any = {
     type: "docs",
@@ -62,6 +70,7 @@ export async function registerRoutes(
           logs: logs.slice(-8),  // Last 8 real logs
           focusContent: currentFocus,
           tickerItems,
+          llmTelemetry,
           networkStatus: "Connected",
           encryptionStatus: "AES-256",
         },
@@ -90,6 +99,9 @@ export async function registerRoutes(
         } else if (msg.type === "ticker" && msg.data) {
           tickerItems = msg.data;
           broadcast(wss, msg, ws);
+        } else if (msg.type === "llm_telemetry" && msg.data) {
+          llmTelemetry = msg.data;
+          broadcast(wss, msg, ws);
         } else if (msg.command === "health_update") {
           // Forward health updates (pain/anxiety) to Jarvis
           broadcast(wss, msg, ws);
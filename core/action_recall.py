@@ -0,0 +1,312 @@
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+# The user's own chat turns would match any earlier question about them
+EXCLUDED_TYPES = frozenset({"conversation"})
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _epoch_seconds(timestamp: str) -> float:
+    try:
+        dt = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return 0.0
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return (dt - _EPOCH).total_seconds()
+
+
+def _recallable(action: Dict) -> bool:
+    return bool(action.get("description")) and action.get("action_type") not in EXCLUDED_TYPES
+
+
+def action_text(action: Dict, max_chars: int = 400) -> str:
+    """Text embedded for an action: description plus its short string metadata values."""
+    parts = [action.get("description", "")]
+    for key, value in (action.get("metadata") or {}).items():
+        if isinstance(value, str) and key != "short_key" and len(value) <= 200:
+            parts.append(value)
+    return " ".join(p for p in parts if p)[:max_chars]
+
+
+class _Rows(NamedTuple):
+    matrix: np.ndarray  # (capacity, dims) float32, first `count` rows valid
+    times: np.ndarray   # (capacity,) float64 epoch seconds
+    labels: List[Dict]  # row -> {timestamp, action_type, description}
+    count: int
+
+
+class ActionRecallIndex:
+    """Semantic recall over the action history.
+
+    Each action's description and metadata are embedded once, as the action
+    is logged, into a growing normalized float32 matrix. A query is one
+    embedding, one mat-vec and an argpartition; similarity is blended with
+    an exponential recency weight so recent matches win ties.
+
+    Embedding runs on a background thread fed by add_actions() (hooked to
+    MemoryIndex.on_actions_added), so logging an action never waits on the
+    embedding model. Embedding happens outside the lock, which is only held
+    to publish rows; readers use the last published rows without locking.
+
+    Like the hot MemoryIndex, only the last window_days (and at most
+    max_rows actions) are kept. The index is saved after a sync and on
+    close; anything logged after the last save is embedded by the next sync.
+    Conversation turns are not indexed.
+    """
+    def __init__(self, embed_fn: Callable[[str], Sequence[float]], path: Optional[str] = None,
+                 backend: str = "", half_life_days: float = 30.0, recency_weight: float = 0.1,
+                 window_days: float = 90.0, max_rows: int = 20000):
+        self.embed_fn = embed_fn
+        self.path = path  # base path: <path>.npy (matrix) and <path>.json (row labels)
+        self.backend = backend
+        self.half_life_days = float(half_life_days)
+        self.recency_weight = float(recency_weight)
+        self.window_days = float(window_days)  # 0 keeps every age
+        self.max_rows = max_rows
+        self._rows = _Rows(np.zeros((0, 0), dtype=np.float32), np.zeros(0), [], 0)
+        self._lock = threading.Lock()  # publishing rows (worker, sync, load, save)
+        self._queue: "queue.Queue[Optional[Callable[[], None]]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()  # starting / stopping the worker
+        # Keys of actions a sync embedded that may also still be queued by the hook
+        self._synced_recent: set = set()
+
+    def __len__(self) -> int:
+        return self._rows.count
+
+    def _vector(self, text: str) -> np.ndarray:
+        vec = np.asarray(self.embed_fn(text), dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm > 0 else vec
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def _cutoff(self, now: Optional[datetime] = None) -> float:
+        if not self.window_days:
+            return float("-inf")
+        return ((now or datetime.now()) - _EPOCH).total_seconds() - self.window_days * 86400.0
+
+    def _append(self, actions: List[Dict]) -> None:
+        """Embed actions, then publish them as new rows."""
+        vectors = [self._vector(action_text(a)) for a in actions]  # the slow part, outside the lock
+        with self._lock:
+            self._publish_rows(actions, vectors)
+
+    def _publish_rows(self, actions: List[Dict], vectors: List[np.ndarray]) -> None:
+        """Append rows (call with _lock held); trims to the window when it is exceeded."""
+        rows = self._rows
+        dims = max([rows.matrix.shape[1]] + [len(v) for v in vectors])
+        needed = rows.count + len(vectors)
+        matrix, times, labels = rows.matrix, rows.times, rows.labels
+        if needed > matrix.shape[0] or dims > matrix.shape[1]:
+            # Grow into fresh buffers so readers keep the arrays they hold
+            capacity = max(needed, min(2 * matrix.shape[0], self.max_rows + 1024), 256)
+            matrix = self._copy_rows(rows.matrix, np.arange(rows.count), capacity, dims)
+            times = np.zeros(capacity, dtype=np.float64)
+            times[:rows.count] = rows.times[:rows.count]
+        for offset, (action, vec) in enumerate(zip(actions, vectors)):
+            matrix[rows.count + offset, :len(vec)] = vec
+            times[rows.count + offset] = _epoch_seconds(action.get("timestamp"))
+            labels.append({
+                "timestamp": action.get("timestamp", ""),
+                "action_type": action.get("action_type", "unknown"),
+                "description": action.get("description", ""),
+            })
+        self._rows = _Rows(matrix, times, labels, needed)
+        if needed > self.max_rows or (needed and times[:needed].min() < self._cutoff() - 86400.0):
+            self._trim()
+
+    @staticmethod
+    def _copy_rows(matrix: np.ndarray, keep: np.ndarray, capacity: int, dims: int) -> np.ndarray:
+        out = np.zeros((capacity, dims), dtype=np.float32)
+        out[:len(keep), :matrix.shape[1]] = matrix[keep]
+        return out
+
+    def _trim(self) -> None:
+        """Drop rows older than the window and the oldest beyond max_rows, into fresh buffers.
+
+        A count trim keeps the newest 90% of max_rows and leaves the rest of
+        the buffer spare, so the next trim is max_rows / 10 appends away
+        rather than one.
+        """
+        rows = self._rows
+        times = rows.times[:rows.count]
+        keep = np.flatnonzero(times >= self._cutoff())
+        if len(keep) > self.max_rows:
+            target = max(1, int(self.max_rows * 0.9))
+            newest = np.argpartition(-times[keep], target - 1)[:target]
+            keep = np.sort(keep[newest])
+        capacity = max(len(keep), self.max_rows, 256)
+        matrix = self._copy_rows(rows.matrix, keep, capacity, rows.matrix.shape[1])
+        kept_times = np.zeros(capacity, dtype=np.float64)
+        kept_times[:len(keep)] = times[keep]
+        self._rows = _Rows(matrix, kept_times, [rows.labels[i] for i in keep], len(keep))
+
+    def add_actions(self, actions: Iterable[Dict]) -> None:
+        """Queue actions for embedding (MemoryIndex.on_actions_added hook)."""
+        actions = [a for a in actions if _recallable(a)]
+        if actions:
+            self._submit(lambda: self._append_live(actions))
+
+    def _append_live(self, actions: List[Dict]) -> None:
+        if self._synced_recent:
+            actions = [a for a in actions if (a.get("timestamp"), a.get("description")) not in self._synced_recent]
+        if actions:
+            self._append(actions)
+
+    def _submit(self, job: Callable[[], None]) -> None:
+        self._queue.put(job)
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, daemon=True, name="action-recall")
+                    self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                job()
+            except Exception as e:
+                logger.warning(f"Action recall embedding failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued actions are embedded (tests and shutdown)."""
+        if self._worker is None:
+            return True
+        done = threading.Event()
+        threading.Thread(target=lambda: (self._queue.join(), done.set()), daemon=True).start()
+        return done.wait(timeout)
+
+    def sync(self, memory_index) -> int:
+        """Load the saved matrix and embed whatever the action history has beyond it.
+
+        The saved rows are trusted only when they were built with the same
+        embedding backend; otherwise every action in the window is embedded
+        again. Call before the hook is set, or through sync_in_background().
+        Returns the number of actions embedded.
+        """
+        self.load()
+        rows = self._rows
+        labels = rows.labels[:rows.count]
+        last = max((l["timestamp"] for l in labels), default="")
+        now = datetime.now()
+        start = datetime.fromisoformat(last) if last else _EPOCH
+        if self.window_days:
+            start = max(start, now - timedelta(days=self.window_days))
+        candidates = [a for a in memory_index.search_by_date_range(start, now) if _recallable(a)]
+        # Rows at or after the last saved timestamp may already be here (same-second batches)
+        known = {(l["timestamp"], l["description"]) for l in labels if l["timestamp"] >= last}
+        missing = [a for a in candidates if (a.get("timestamp"), a.get("description")) not in known]
+        # The hook may have queued the newest of these before this sync ran
+        self._synced_recent = {(a.get("timestamp"), a.get("description")) for a in missing[-256:]}
+        for i in range(0, len(missing), 256):
+            self._append(missing[i:i + 256])
+        if missing:
+            self.save()
+            logger.info(f"Action recall: embedded {len(missing)} actions")
+        return len(missing)
+
+    def sync_in_background(self, memory_index) -> None:
+        """Run sync() on the worker, ahead of any action the hook queues afterwards."""
+        def _safe_sync():
+            try:
+                self.sync(memory_index)
+            except Exception as e:
+                logger.warning(f"Action recall sync failed: {e}")
+        self._submit(_safe_sync)
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, limit: int = 3, min_similarity: float = 0.0,
+               now: Optional[datetime] = None) -> List[Dict]:
+        """Top actions for query, best first: {timestamp, action_type, description, score, similarity}."""
+        rows = self._rows
+        if not rows.count or not (query or "").strip():
+            return []
+        q = self._vector(query.strip())
+        n = min(len(q), rows.matrix.shape[1])
+        sims = rows.matrix[:rows.count, :n] @ q[:n]
+        now_s = ((now or datetime.now()) - _EPOCH).total_seconds()
+        age_days = np.maximum(now_s - rows.times[:rows.count], 0.0) / 86400.0
+        scores = sims + self.recency_weight * np.exp2(-age_days / self.half_life_days)
+        scores = np.where(sims >= min_similarity, scores, -np.inf)
+
+        k = min(limit, rows.count)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [dict(rows.labels[i], score=float(scores[i]), similarity=float(sims[i]))
+                for i in top if np.isfinite(scores[i])]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self) -> bool:
+        if not self.path or not os.path.exists(self.path + ".json") or not os.path.exists(self.path + ".npy"):
+            return False
+        try:
+            with open(self.path + ".json", "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("version") != INDEX_VERSION or saved.get("backend") != self.backend:
+                return False
+            matrix = np.load(self.path + ".npy")
+            labels = saved["rows"]
+            count = min(len(labels), matrix.shape[0])
+        except Exception as e:
+            logger.warning(f"Ignoring saved action recall index: {e}")
+            return False
+        labels = labels[:count]
+        times = np.array([_epoch_seconds(l["timestamp"]) for l in labels], dtype=np.float64)
+        with self._lock:
+            self._rows = _Rows(np.ascontiguousarray(matrix[:count], dtype=np.float32), times, labels, count)
+            self._trim()
+        return True
+
+    def save(self) -> bool:
+        if not self.path:
+            return False
+        with self._lock:
+            rows = self._rows
+            labels = rows.labels[:rows.count]
+        try:
+            # Matrix first: load() uses the shorter of the two, so a crash in between is harmless
+            tmp = self.path + ".tmp.npy"
+            np.save(tmp, rows.matrix[:rows.count].astype(np.float16))  # half the disk; cosine barely moves
+            os.replace(tmp, self.path + ".npy")
+            tmp = self.path + ".json.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "backend": self.backend, "rows": labels}, f)
+            os.replace(tmp, self.path + ".json")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to save action recall index: {e}")
+            return False
+
+    def close(self) -> None:
+        """Embed what is queued, stop the worker and save."""
+        with self._worker_lock:
+            if self._worker is not None:
+                self._queue.put(None)
+                self._worker.join(timeout=10)
+                self._worker = None
+        self.save()
@@ -0,0 +1,262 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+def _model_key(name: str) -> str:
+    """Ollama treats 'llama3.2' and 'llama3.2:latest' as the same model."""
+    name = (name or "").strip().lower()
+    return name if ":" in name else f"{name}:latest"
+
+
+@dataclass
+class BrainEndpoint:
+    """One Ollama host in the pool."""
+    url: str                                    # full generate URL, e.g. http://gpu2:11434/api/generate
+    models: List[str] = field(default_factory=list)  # configured models; empty = anything it reports
+    healthy: bool = True
+    available: Optional[set] = None             # models reported by the last /api/tags probe
+    ewma_ms: Optional[float] = None
+    inflight: int = 0
+    failures: int = 0
+    last_probe: float = 0.0
+
+    @property
+    def base_url(self) -> str:
+        parsed = urlparse(self.url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def url_for(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def serves(self, model: str) -> bool:
+        key = _model_key(model)
+        if self.models and key not in {_model_key(m) for m in self.models}:
+            return False
+        if self.available is not None:
+            return key in self.available
+        return True
+
+
+class BrainPool:
+    """Routes brain calls across several Ollama hosts.
+
+    Each request goes to the healthy host that serves the model with the lowest
+    observed latency (EWMA, weighted by in-flight calls). Connection errors
+    (including connect timeouts) and 5xx replies mark the host down and fail
+    over to the next one; a background thread probes /api/tags to bring hosts
+    back and refresh their model lists.
+    """
+    def __init__(self, endpoints: Sequence[BrainEndpoint], probe_interval: float = 30.0,
+                 probe_timeout: float = 2.0, ewma_alpha: float = 0.3):
+        if not endpoints:
+            raise ValueError("BrainPool needs at least one endpoint")
+        self.endpoints = list(endpoints)
+        self.probe_interval = float(probe_interval)
+        self.probe_timeout = float(probe_timeout)
+        self.ewma_alpha = float(ewma_alpha)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(2, 2 * len(self.endpoints)), thread_name_prefix="brain-pool")
+        self._stop = threading.Event()
+        self._probe_thread: Optional[threading.Thread] = None
+        self._local = threading.local()  # queue wait of the submit()/map() task on this thread
+
+    @classmethod
+    def from_config(cls, brain_url: str, pool_config: Iterable[Any], **kwargs) -> "BrainPool":
+        """Build from config entries ({"url", "models"} dicts or bare URLs); falls back to brain_url."""
+        endpoints = []
+        for entry in pool_config or []:
+            if isinstance(entry, str):
+                entry = {"url": entry}
+            url = (entry.get("url") or "").strip()
+            if not url:
+                continue
+            if not urlparse(url).path.strip("/"):
+                url = url.rstrip("/") + "/api/generate"
+            endpoints.append(BrainEndpoint(url=url, models=list(entry.get("models") or [])))
+        if not endpoints:
+            endpoints.append(BrainEndpoint(url=brain_url))
+        return cls(endpoints, **kwargs)
+
+    # ---- health ----
+    def probe(self, endpoint: BrainEndpoint) -> bool:
+        try:
+            resp = requests.get(endpoint.url_for("/api/tags"), timeout=self.probe_timeout)
+            resp.raise_for_status()
+            names = {_model_key(m.get("name") or m.get("model") or "") for m in resp.json().get("models", [])}
+            with self._lock:
+                was_down = not endpoint.healthy
+                endpoint.healthy = True
+                endpoint.failures = 0
+                endpoint.available = names
+                endpoint.last_probe = time.time()
+            if was_down:
+                logger.info(f"Brain host back online: {endpoint.base_url}")
+            return True
+        except Exception as e:
+            with self._lock:
+                endpoint.healthy = False
+                endpoint.last_probe = time.time()
+            logger.debug(f"Brain host probe failed for {endpoint.base_url}: {e}")
+            return False
+
+    def probe_all(self) -> None:
+        for endpoint in self.endpoints:
+            self.probe(endpoint)
+
+    def start_health_checks(self) -> None:
+        if self._probe_thread and self._probe_thread.is_alive():
+            return
+
+        def loop():
+            while not self._stop.is_set():
+                self.probe_all()
+                self._stop.wait(self.probe_interval)
+
+        self._probe_thread = threading.Thread(target=loop, daemon=True, name="brain-pool-probe")
+        self._probe_thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._executor.shutdown(wait=False)
+
+    # ---- routing ----
+    def candidates(self, model: str) -> List[BrainEndpoint]:
+        """Endpoints to try for model, best first."""
+        with self._lock:
+            return self._ranked(model)
+
+    def _ranked(self, model: str) -> List[BrainEndpoint]:
+        """candidates() body; call with _lock held."""
+        serving = [e for e in self.endpoints if e.serves(model)] or list(self.endpoints)
+        healthy = [e for e in serving if e.healthy]
+        down = [e for e in serving if not e.healthy]
+        healthy.sort(key=lambda e: (e.ewma_ms if e.ewma_ms is not None else 1.0) * (1 + e.inflight))
+        # Down hosts stay as a last resort in case the probe is stale.
+        return healthy + down
+
+    def _acquire(self, model: str, tried: List[BrainEndpoint]) -> Optional[BrainEndpoint]:
+        """Pick the best host not tried yet and count the call in flight, atomically.
+
+        Ranking and incrementing under one lock hold is what spreads a burst of
+        concurrent calls: each sees the in-flight load of the ones before it.
+        """
+        with self._lock:
+            for endpoint in self._ranked(model):
+                if endpoint not in tried:
+                    endpoint.inflight += 1
+                    return endpoint
+        return None
+
+    def _mark_failed(self, endpoint: BrainEndpoint) -> None:
+        with self._lock:
+            endpoint.healthy = False
+            endpoint.failures += 1
+
+    def parallelism(self) -> int:
+        with self._lock:
+            return sum(1 for e in self.endpoints if e.healthy)
+
+    def _observe(self, endpoint: BrainEndpoint, elapsed_ms: float) -> None:
+        with self._lock:
+            if endpoint.ewma_ms is None:
+                endpoint.ewma_ms = float(elapsed_ms)
+            else:
+                endpoint.ewma_ms = self.ewma_alpha * elapsed_ms + (1 - self.ewma_alpha) * endpoint.ewma_ms
+
+    def post(self, body: Dict[str, Any], timeout: float, path: Optional[str] = None) -> Tuple[requests.Response, BrainEndpoint]:
+        """POST body to the best host for body['model'], failing over to the next host.
+
+        Connection errors (including connect timeouts) and 5xx replies move on
+        to the next host. A read timeout means the host is up but the
+        generation is slow: it is raised straight away, without marking the
+        host down, so the caller's timeout budget is spent once and it can
+        downgrade the tier. path defaults to each endpoint's configured
+        generate URL. When every host fails, the last 5xx response is returned
+        (callers raise_for_status) or the last connection error is raised.
+        """
+        model = body.get("model", "")
+        tried: List[BrainEndpoint] = []
+        last_error: Optional[Exception] = None
+        last_reply: Optional[Tuple[requests.Response, BrainEndpoint]] = None
+        while True:
+            endpoint = self._acquire(model, tried)
+            if endpoint is None:
+                break
+            tried.append(endpoint)
+            started = time.time()
+            try:
+                target = endpoint.url_for(path) if path else endpoint.url
+                resp = requests.post(target, json=body, timeout=timeout)
+                if resp.status_code >= 500:
+                    last_error, last_reply = None, (resp, endpoint)
+                    self._mark_failed(endpoint)
+                    logger.warning(f"Brain host {endpoint.base_url} returned {resp.status_code}, failing over")
+                    continue
+                self._observe(endpoint, (time.time() - started) * 1000.0)
+                with self._lock:
+                    endpoint.healthy = True
+                    endpoint.failures = 0
+                return resp, endpoint
+            except requests.exceptions.ReadTimeout:
+                self._observe(endpoint, (time.time() - started) * 1000.0)
+                raise
+            except requests.exceptions.ConnectionError as e:  # ConnectTimeout is one too
+                last_error, last_reply = e, None
+                self._mark_failed(endpoint)
+                logger.warning(f"Brain host {endpoint.base_url} unreachable ({type(e).__name__}), failing over: {e}")
+            finally:
+                with self._lock:
+                    endpoint.inflight -= 1
+        if last_reply is not None:
+            return last_reply
+        raise last_error or requests.exceptions.ConnectionError("No brain hosts available")
+
+    # ---- fan-out ----
+    def _run_queued(self, queued_at: float, fn: Callable, args, kwargs) -> Any:
+        self._local.queue_ms = (time.time() - queued_at) * 1000.0
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._local.queue_ms = 0.0
+
+    def take_queue_ms(self) -> float:
+        """How long the current submit()/map() task waited for a worker; 0 after the first call.
+
+        The first brain call a task makes reports the wait as local queue time,
+        so a task that falls back to a second tier does not count it twice.
+        """
+        queue_ms = getattr(self._local, "queue_ms", 0.0)
+        self._local.queue_ms = 0.0
+        return queue_ms
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Run a brain-bound callable in the background; routing spreads concurrent calls across hosts."""
+        return self._executor.submit(self._run_queued, time.time(), fn, args, kwargs)
+
+    def map(self, fn: Callable, items: Iterable[Any]) -> List[Any]:
+        """Apply fn to items concurrently (bounded by pool size) and return results in order."""
+        queued_at = time.time()
+        futures = [self._executor.submit(self._run_queued, queued_at, fn, (item,), {}) for item in items]
+        return [f.result() for f in futures]
+
+    def status(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "url": e.base_url,
+                    "healthy": e.healthy,
+                    "ewma_ms": round(e.ewma_ms, 1) if e.ewma_ms is not None else None,
+                    "inflight": e.inflight,
+                    "models": sorted(e.available) if e.available is not None else list(e.models),
+                }
+                for e in self.endpoints
+            ]
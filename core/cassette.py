@@ -0,0 +1,201 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+import requests
+
+# Query/body keys never written to a cassette or used for matching.
+SECRET_KEYS = {"apikey", "api_key", "key", "developerkey", "token", "access_token"}
+
+
+class CassetteMiss(Exception):
+    """Raised in replay mode when no recorded interaction matches a call."""
+
+
+def _strip_secrets(pairs):
+    return [(k, v) for k, v in pairs if k.lower() not in SECRET_KEYS]
+
+
+class Cassette:
+    """Record/replay for the module-level `requests.get`/`requests.post` calls.
+
+    record: perform real calls and store responses (or exceptions) with timing.
+    replay: serve stored responses, sleeping elapsed * latency_scale (0 = instant).
+    auto:   replay what is on file, record anything new.
+
+    Interactions with the same key replay in recorded order (the last one
+    repeats once exhausted). Non-requests dependencies such as Google CSE
+    (googleapiclient) can be captured with patch_callable().
+
+    Usage:
+        with Cassette("benchmarks/cassettes/news.json", mode="replay", latency_scale=0):
+            jarvis.process_conversation("what's the news")
+    """
+    def __init__(self, path: str, mode: str = "replay", latency_scale: float = 1.0, match_host: bool = True):
+        if mode not in ("record", "replay", "auto"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = float(latency_scale)
+        self.match_host = match_host
+        self.interactions: List[Dict[str, Any]] = []
+        self._queues: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._cursor: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._restore: List[Callable[[], None]] = []
+        self.hits = 0
+        self.recorded = 0
+        if mode != "record" and os.path.exists(path):
+            self.load()
+        elif mode == "replay":
+            raise FileNotFoundError(f"Cassette not found: {path}")
+
+    # ---- persistence ----
+    def load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.interactions = list(data.get("interactions", []))
+        for item in self.interactions:
+            self._queues[item["key"]].append(item)
+
+    def save(self) -> None:
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "interactions": self.interactions}, f, indent=2)
+
+    # ---- matching ----
+    def _http_key(self, method: str, url: str, params=None, json_body=None, data=None) -> str:
+        parsed = urlparse(url)
+        query = _strip_secrets(parse_qsl(parsed.query))
+        if isinstance(params, dict):
+            query += _strip_secrets(sorted((str(k), str(v)) for k, v in params.items()))
+        target = (parsed.netloc if self.match_host else "") + parsed.path
+        body = json.dumps(json_body, sort_keys=True) if json_body is not None else (data or "")
+        raw = f"{method.upper()} {target}?{urlencode(sorted(query))}\n{body}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _call_key(name: str, args, kwargs) -> str:
+        raw = json.dumps([name, list(args), kwargs], sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _next(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                return None
+            idx = min(self._cursor[key], len(queue) - 1)
+            self._cursor[key] += 1
+            self.hits += 1
+            return queue[idx]
+
+    def _store(self, item: Dict[str, Any]) -> None:
+        with self._lock:
+            self.interactions.append(item)
+            self._queues[item["key"]].append(item)
+            self._cursor[item["key"]] = len(self._queues[item["key"]])
+            self.recorded += 1
+
+    def _sleep(self, item: Dict[str, Any]) -> None:
+        delay = float(item.get("elapsed_ms", 0)) / 1000.0 * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+
+    # ---- requests ----
+    @staticmethod
+    def _build_response(item: Dict[str, Any]) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = int(item.get("status", 200))
+        resp.url = item.get("url", "")
+        resp.headers.update(item.get("headers", {}))
+        resp.encoding = item.get("encoding") or "utf-8"
+        if "body_b64" in item:
+            resp._content = base64.b64decode(item["body_b64"])
+        else:
+            resp._content = (item.get("body") or "").encode("utf-8")
+        return resp
+
+    @staticmethod
+    def _raise_recorded(item: Dict[str, Any]) -> None:
+        exc_type = getattr(requests.exceptions, item["error"], requests.exceptions.RequestException)
+        raise exc_type(item.get("message", "recorded error"))
+
+    def _wrap_http(self, method: str, real: Callable) -> Callable:
+        def handler(url, params=None, **kwargs):
+            key = self._http_key(method, url, params=params, json_body=kwargs.get("json"), data=kwargs.get("data"))
+            if self.mode != "record":
+                item = self._next(key)
+                if item is not None:
+                    self._sleep(item)
+                    if "error" in item:
+                        self._raise_recorded(item)
+                    return self._build_response(item)
+                if self.mode == "replay":
+                    raise CassetteMiss(f"No recorded {method.upper()} for {url}")
+
+            safe_url = urlparse(url)._replace(query=urlencode(_strip_secrets(parse_qsl(urlparse(url).query)))).geturl()
+            item = {"kind": "http", "key": key, "method": method.upper(), "url": safe_url}
+            started = time.perf_counter()
+            try:
+                resp = real(url, params=params, **kwargs) if params is not None else real(url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                item.update(error=type(e).__name__, message=str(e),
+                            elapsed_ms=round((time.perf_counter() - started) * 1000.0, 2))
+                self._store(item)
+                raise
+            content = resp.content
+            item["elapsed_ms"] = round((time.perf_counter() - started) * 1000.0, 2)
+            item.update(status=resp.status_code, encoding=resp.encoding,
+                        headers={"Content-Type": resp.headers.get("Content-Type", "")})
+            try:
+                item["body"] = content.decode("utf-8")
+            except UnicodeDecodeError:
+                item["body_b64"] = base64.b64encode(content).decode("ascii")
+            self._store(item)
+            return resp
+
+        return handler
+
+    def patch_callable(self, owner: Any, name: str) -> None:
+        """Record/replay return values of owner.name (e.g. jarvis.google_search)."""
+        real = getattr(owner, name)
+
+        def handler(*args, **kwargs):
+            key = self._call_key(name, args, kwargs)
+            if self.mode != "record":
+                item = self._next(key)
+                if item is not None:
+                    self._sleep(item)
+                    return item["result"]
+                if self.mode == "replay":
+                    raise CassetteMiss(f"No recorded call for {name}{args}")
+            started = time.perf_counter()
+            result = real(*args, **kwargs)
+            self._store({"kind": "call", "key": key, "name": name, "result": result,
+                         "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 2)})
+            return result
+
+        had_own = name in getattr(owner, "__dict__", {})
+        setattr(owner, name, handler)
+        self._restore.append(lambda: setattr(owner, name, real) if had_own else delattr(owner, name))
+
+    def __enter__(self) -> "Cassette":
+        for method in ("get", "post"):
+            real = getattr(requests, method)
+            setattr(requests, method, self._wrap_http(method, real))
+            self._restore.append(lambda m=method, r=real: setattr(requests, m, r))
+        return self
+
+    def __exit__(self, *exc) -> None:
+        while self._restore:
+            self._restore.pop()()
+        if self.mode != "replay" and self.recorded:
+            self.save()
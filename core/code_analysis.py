@@ -0,0 +1,255 @@
+import ast
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompts below change so cached reports are not reused.
+PROMPT_VERSION = "1"
+
+# How call_model reports a failed brain call instead of an answer
+FAILURE_PREFIXES = ("Error:", "An unexpected error")
+
+FINAL_FORMAT = """Identify the THREE most important real improvements specific to THIS codebase. For each:
+1. Issue: Describe the actual problem found in this file
+2. Impact: What concrete benefit would this provide?
+3. Suggestion: Show a specific code change (not a generic pattern)
+
+Plain text only - no markdown, no bullet symbols, no code fences."""
+
+
+@dataclass
+class CodeChunk:
+    index: int
+    label: str
+    start_line: int
+    end_line: int
+    text: str
+
+
+def _node_span(node: ast.AST):
+    start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+    return start, node.end_lineno
+
+
+def _label(node: ast.AST) -> str:
+    if isinstance(node, ast.ClassDef):
+        return f"class {node.name}"
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return f"def {node.name}"
+    return "module code"
+
+
+def _python_units(source: str, lines: List[str], max_chars: int):
+    """(label, start, end) units along top-level def/class boundaries; big classes split per method."""
+    tree = ast.parse(source)
+    units = []
+    cursor = 1
+    for node in tree.body:
+        start, end = _node_span(node)
+        if start > cursor:
+            units.append(("module code", cursor, start - 1))
+        size = sum(len(l) for l in lines[start - 1:end])
+        if isinstance(node, ast.ClassDef) and size > max_chars and node.body:
+            body_cursor = start
+            for child in node.body:
+                c_start, c_end = _node_span(child)
+                if c_start > body_cursor:
+                    units.append((f"class {node.name} (body)", body_cursor, c_start - 1))
+                units.append((f"{node.name}.{_label(child).split(' ', 1)[-1]}", c_start, c_end))
+                body_cursor = c_end + 1
+            if body_cursor <= end:
+                units.append((f"class {node.name} (body)", body_cursor, end))
+        else:
+            units.append((_label(node), start, end))
+        cursor = end + 1
+    if cursor <= len(lines):
+        units.append(("module code", cursor, len(lines)))
+    return units
+
+
+def split_into_chunks(source: str, filename: str = "", max_chars: int = 12000) -> List[CodeChunk]:
+    """Split source into chunks of at most ~max_chars along function/class boundaries.
+
+    Python files are split with ast; anything else (or unparsable code) is
+    split on blank lines. A single unit larger than max_chars becomes its own chunk.
+    """
+    lines = source.splitlines(keepends=True)
+    if not lines:
+        return []
+    units = None
+    if filename.endswith(".py") or not filename:
+        try:
+            units = _python_units(source, lines, max_chars)
+        except SyntaxError:
+            units = None
+    if units is None:
+        units, start = [], 1
+        for i, line in enumerate(lines, 1):
+            if not line.strip() or i == len(lines):
+                units.append((f"lines {start}-{i}", start, i))
+                start = i + 1
+
+    chunks: List[CodeChunk] = []
+    group, group_chars = [], 0
+
+    def flush():
+        if not group:
+            return
+        start, end = group[0][1], group[-1][2]
+        names = [u[0] for u in group if u[0] != "module code"]
+        label = names[0] if len(names) == 1 else (f"{names[0]} .. {names[-1]}" if names else "module code")
+        chunks.append(CodeChunk(len(chunks), label, start, end, "".join(lines[start - 1:end])))
+
+    for unit in units:
+        size = sum(len(l) for l in lines[unit[1] - 1:unit[2]])
+        if group and group_chars + size > max_chars:
+            flush()
+            group, group_chars = [], 0
+        group.append(unit)
+        group_chars += size
+    flush()
+    return chunks
+
+
+class ChunkedCodeAnalyzer:
+    """Map-reduce code review over function/class chunks, cached by file content hash.
+
+    call_model(prompt, timeout) performs one brain call and returns the text,
+    or (text, model) naming the model that answered; map_fn(fn, items) runs
+    the map step (e.g. BrainPool.map to spread chunks across hosts).
+    cache_salt is the model reports are expected from: a report produced
+    (even partly) by another model, e.g. after a tier downgrade, is cached
+    under that model's key and so is not served for cache_salt.
+    """
+    def __init__(self, call_model: Callable[[str, float], str],
+                 map_fn: Optional[Callable[[Callable, Iterable], List]] = None,
+                 cache_dir: Optional[str] = None, max_chunk_chars: int = 12000,
+                 chunk_timeout: float = 90, reduce_timeout: float = 120, cache_salt: str = ""):
+        self.call_model = call_model
+        self.map_fn = map_fn or (lambda fn, items: [fn(i) for i in items])
+        self.cache_dir = cache_dir
+        self.max_chunk_chars = int(max_chunk_chars)
+        self.chunk_timeout = float(chunk_timeout)
+        self.reduce_timeout = float(reduce_timeout)
+        self.cache_salt = cache_salt
+
+    def cache_key(self, source: str, model: Optional[str] = None) -> str:
+        model = self.cache_salt if model is None else model
+        raw = f"{PROMPT_VERSION}\n{model}\n{self.max_chunk_chars}\n{source}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _cache_path(self, key: str) -> Optional[str]:
+        return os.path.join(self.cache_dir, f"{key}.json") if self.cache_dir else None
+
+    def cached(self, source: str) -> Optional[str]:
+        path = self._cache_path(self.cache_key(source))
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f).get("report")
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, source: str, filename: str, report: str, chunk_count: int, model: Optional[str]) -> None:
+        path = self._cache_path(self.cache_key(source, model))
+        if not path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"filename": filename, "chunks": chunk_count, "report": report,
+                           "model": model, "created": datetime.now().isoformat()}, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.debug(f"Code analysis cache write failed: {e}")
+
+    def _map_prompt(self, filename: str, chunk: CodeChunk, total: int, context: str) -> str:
+        return (
+            f"You are an expert code reviewer.\n\n{context}\n\n"
+            f"FILE: {filename}\nSECTION {chunk.index + 1} of {total}: {chunk.label} "
+            f"(lines {chunk.start_line}-{chunk.end_line})\n\nCODE:\n{chunk.text}\n\n"
+            "List up to 3 concrete, real problems in THIS section only (performance, correctness, "
+            "maintainability). One per line, formatted as:\n"
+            "Lines <a>-<b> | <issue> | <impact> | <specific change>\n"
+            "If nothing is worth changing, reply NONE. Plain text only."
+        )
+
+    def _reduce_prompt(self, filename: str, findings: Sequence[str], context: str) -> str:
+        return (
+            f"You are an expert code reviewer.\n\n{context}\n\n"
+            f"FILE TO ANALYSE: {filename}\n\n"
+            "Section-by-section findings from a full review of the file:\n"
+            + "\n".join(findings)
+            + "\n\nMerge duplicates and rank by real impact.\n"
+            + FINAL_FORMAT
+        )
+
+    def _call(self, prompt: str, timeout: float, models: set) -> str:
+        """One brain call; failures (raised or reported) come back as an "Error:" string."""
+        try:
+            result = self.call_model(prompt, timeout)
+        except Exception as e:
+            logger.warning(f"Code analysis call failed: {e}")
+            return f"Error: {e}"
+        if isinstance(result, tuple):
+            result, model = result
+            if model:
+                models.add(model)
+        return str(result or "").strip()
+
+    def analyze(self, filename: str, source: str, context: str = "") -> str:
+        """Return the optimization report for source, from cache when the content is unchanged.
+
+        When most sections could not be reviewed the result is an "Error:"
+        string rather than a report. When only some failed, the report says
+        how many and is not cached.
+        """
+        cached = self.cached(source)
+        if cached:
+            logger.info(f"Code analysis cache hit for {filename}")
+            return cached
+
+        models: set = set()
+        failed = 0
+        chunks = split_into_chunks(source, filename, self.max_chunk_chars)
+        if len(chunks) <= 1:
+            prompt = (f"You are an expert code reviewer analysing a specific codebase.\n\n{context}\n\n"
+                      f"FILE TO ANALYSE: {filename}\n\nCODE:\n{source}\n\n{FINAL_FORMAT}")
+            report = self._call(prompt, self.reduce_timeout, models)
+        else:
+            logger.info(f"Analysing {filename} in {len(chunks)} chunks")
+            results = self.map_fn(
+                lambda c: self._call(self._map_prompt(filename, c, len(chunks), context), self.chunk_timeout, models),
+                chunks,
+            )
+            findings = []
+            for chunk, text in zip(chunks, results):
+                if text.startswith(FAILURE_PREFIXES):
+                    failed += 1
+                    continue
+                if not text or text.upper().startswith("NONE"):
+                    continue
+                findings.append(f"[{chunk.label}, lines {chunk.start_line}-{chunk.end_line}]\n{text}")
+            if failed * 2 > len(chunks):
+                logger.warning(f"Code analysis of {filename}: {failed} of {len(chunks)} sections failed")
+                return f"Error: I could not review {failed} of the {len(chunks)} sections of {filename}."
+            if not findings:
+                report = "No significant improvements were found in this file."
+            else:
+                report = self._call(self._reduce_prompt(filename, findings, context), self.reduce_timeout, models)
+
+        if failed:
+            if report and not report.startswith(FAILURE_PREFIXES):
+                logger.warning(f"Code analysis of {filename}: {failed} of {len(chunks)} sections failed")
+                report += f"\n\nNote: {failed} of {len(chunks)} sections could not be reviewed."
+        elif report and not report.startswith(FAILURE_PREFIXES):
+            self._store(source, filename, report, len(chunks), "+".join(sorted(models)) if models else None)
+        return report
@@ -0,0 +1,197 @@
+import ast
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Symbol:
+    name: str
+    qualname: str
+    kind: str  # "class" | "function" | "method"
+    path: str
+    start_line: int
+    end_line: int
+    def_line: int = 0  # the `def`/`class` line itself (start_line includes decorators)
+    docstring: str = ""
+
+
+class _FileEntry:
+    __slots__ = ("path", "mtime", "size", "text", "_lower", "symbols", "by_name", "line_map")
+
+    def __init__(self, path: str, mtime: float, size: int, text: str):
+        self.path = path
+        self.mtime = mtime
+        self.size = size
+        self.text = text
+        self._lower: Optional[str] = None
+        self.symbols: Dict[str, Symbol] = {}
+        self.by_name: Dict[str, List[Symbol]] = {}
+        self.line_map: Dict[str, int] = {}
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def cost(self) -> int:
+        return len(self.text) + (len(self._lower) if self._lower is not None else 0)
+
+
+def _collect_symbols(path: str, text: str) -> Dict[str, Symbol]:
+    """Walk the module AST and return qualname -> Symbol in source order."""
+    tree = ast.parse(text.lstrip("\ufeff"), filename=path)
+    symbols: Dict[str, Symbol] = {}
+
+    def visit(node, prefix: str, in_class: bool):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                qualname = f"{prefix}{child.name}"
+                if isinstance(child, ast.ClassDef):
+                    kind = "class"
+                else:
+                    kind = "method" if in_class else "function"
+                start = min([child.lineno] + [d.lineno for d in child.decorator_list])
+                symbols[qualname] = Symbol(
+                    name=child.name, qualname=qualname, kind=kind, path=path,
+                    start_line=start, end_line=child.end_lineno, def_line=child.lineno,
+                    docstring=ast.get_docstring(child) or "",
+                )
+                visit(child, qualname + ".", isinstance(child, ast.ClassDef))
+            else:
+                visit(child, prefix, in_class)
+
+    visit(tree, "", False)
+    return symbols
+
+
+class CodeIndex:
+    """Shared cache of file text plus an AST symbol table for Python files.
+
+    Each file is read (and parsed, for .py) once and served from memory until
+    its mtime or size changes. Text is kept in an LRU bounded by `max_bytes`.
+
+    Usage:
+        index.line_map(path)["process_conversation"]  -> 4210
+        index.find("handle_task_request")              -> Symbol(...)
+        index.source(path, "JarvisGT2.speak_with_piper")
+    """
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = int(max_bytes)
+        self._files: "OrderedDict[str, _FileEntry]" = OrderedDict()
+        self._names: Dict[str, Dict[str, Symbol]] = {}  # name/qualname -> {path: Symbol}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.hits = 0
+
+    def _entry(self, path: str) -> _FileEntry:
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        with self._lock:
+            entry = self._files.get(path)
+            if entry is not None and entry.mtime == st.st_mtime and entry.size == st.st_size:
+                self._files.move_to_end(path)
+                self.hits += 1
+                return entry
+
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            text = f.read()
+        entry = _FileEntry(path, st.st_mtime, st.st_size, text)
+        if path.endswith(".py"):
+            try:
+                entry.symbols = _collect_symbols(path, text)
+            except (SyntaxError, ValueError) as e:
+                logger.debug(f"Code index: cannot parse {path}: {e}")
+            for sym in entry.symbols.values():
+                entry.by_name.setdefault(sym.name, []).append(sym)
+                if sym.kind != "class":
+                    entry.line_map[sym.name] = sym.def_line
+
+        with self._lock:
+            self.reads += 1
+            self._drop(path)
+            self._files[path] = entry
+            self._bytes += entry.cost
+            for key in list(entry.symbols) + list(entry.by_name):
+                sym = entry.symbols.get(key) or entry.by_name[key][0]
+                self._names.setdefault(key, {})[path] = sym
+            self._evict()
+        return entry
+
+    def _drop(self, path: str) -> None:
+        old = self._files.pop(path, None)
+        if old is None:
+            return
+        self._bytes -= old.cost
+        for key in list(old.symbols) + list(old.by_name):
+            owners = self._names.get(key)
+            if owners is not None:
+                owners.pop(path, None)
+                if not owners:
+                    del self._names[key]
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and len(self._files) > 1:
+            self._drop(next(iter(self._files)))
+
+    # ---- text ----
+    def read(self, path: str) -> str:
+        return self._entry(path).text
+
+    def contains(self, path: str, needle: str) -> bool:
+        """Case-insensitive substring test against the cached lowercased text."""
+        entry = self._entry(path)
+        had_lower = entry._lower is not None
+        found = needle.lower() in entry.lower
+        if not had_lower:
+            with self._lock:
+                if self._files.get(entry.path) is entry:
+                    self._bytes += len(entry.lower)
+                    self._evict()
+        return found
+
+    # ---- symbols ----
+    def symbols(self, path: str) -> Dict[str, Symbol]:
+        return self._entry(path).symbols
+
+    def line_map(self, path: str) -> Dict[str, int]:
+        """name -> `def` line of every function/method in path (later definitions win)."""
+        return dict(self._entry(path).line_map)
+
+    def find(self, name: str, path: Optional[str] = None) -> Optional[Symbol]:
+        """Where is `name` (bare or qualified) defined? Searches path, else every indexed file."""
+        if path is not None:
+            entry = self._entry(path)
+            sym = entry.symbols.get(name)
+            if sym is None and name in entry.by_name:
+                sym = entry.by_name[name][0]
+            return sym
+        with self._lock:
+            owners = self._names.get(name)
+            return next(reversed(list(owners.values()))) if owners else None
+
+    def source(self, path: str, name: str) -> Optional[str]:
+        """Source text of function/class `name` in path, or None if it is not defined there."""
+        entry = self._entry(path)
+        sym = self.find(name, entry.path)
+        if sym is None:
+            return None
+        lines = entry.text.splitlines(keepends=True)
+        return "".join(lines[sym.start_line - 1:sym.end_line])
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._files.clear()
+                self._names.clear()
+                self._bytes = 0
+                return
+            self._drop(os.path.abspath(path))
@@ -1,12 +1,45 @@
-from datetime import date
+import re
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
 from collections import defaultdict
-from typing import List, Dict, Optional, Any
+from typing import Callable, List, Dict, Optional, Any
+
+# Full ledger key, e.g. "20260214-wr3"
+FULL_KEY_PATTERN = re.compile(r"\b(\d{8}-[a-z]+\d+)\b")
+_DATED_ALIAS_PATTERN = re.compile(r"\b(today|yesterday)(?:'s|s)?\s+([a-z]+\d+)\b")
+
+
+def expand_dated_aliases(text: str, today: Optional[date] = None) -> str:
+    """Rewrite "yesterday's c1" / "today's wr2" as full ledger keys ("20260213-c1")."""
+    today = today or date.today()
+
+    def _full_key(match):
+        day = today - timedelta(days=1) if match.group(1) == "yesterday" else today
+        return f"{day.strftime('%Y%m%d')}-{match.group(2)}"
+    return _DATED_ALIAS_PATTERN.sub(_full_key, text)
+
 
 class ShortKeyGenerator:
-    """Generates persistent, date-based short keys for session items."""
-    def __init__(self):
+    """Generates persistent, date-based short keys for session items.
+
+    counter_source(day) returns the highest counter already issued per
+    prefix on day ("YYYYMMDD"), e.g. MemoryIndex.short_key_counters, so
+    keys stay unique across restarts.
+    """
+    def __init__(self, counter_source: Optional[Callable[[str], Dict[str, int]]] = None):
+        self._counter_source = counter_source
         self._today = date.today()
         self._counters = defaultdict(int)
+        self._seed()
+
+    def _seed(self):
+        if self._counter_source is None:
+            return
+        try:
+            self._counters.update(self._counter_source(self._today.strftime('%Y%m%d')))
+        except Exception:
+            pass  # fall back to counting from 1; the ledger is still the source of truth
 
     def _reset_if_new_day(self):
         """Resets counters if the date has changed."""
@@ -14,30 +47,44 @@ class ShortKeyGenerator:
         if today != self._today:
             self._today = today
             self._counters.clear()
+            self._seed()
 
     def generate(self, item_type: str) -> str:
         """Generate a new short key for a given item type."""
         self._reset_if_new_day()
-        self._counters[item_type] += 1
-        date_str = self._today.strftime('%Y%m%d')
         # Ensure 'wr' for web results is handled correctly
         type_prefix = 'wr' if item_type == 'w' else item_type
-        return f"{date_str}-{type_prefix}{self._counters[item_type]}"
+        self._counters[type_prefix] += 1
+        date_str = self._today.strftime('%Y%m%d')
+        return f"{date_str}-{type_prefix}{self._counters[type_prefix]}"
 
 class SessionContext:
-    """Manages volatile 'working memory' for the current user session."""
+    """Manages volatile 'working memory' for the current user session.
+
+    Shared by the main loop and background job threads: writers take the
+    lock and replace the items dict rather than mutating it, so iterating
+    items is always safe. A job can hold its changes back with deferred()
+    and have them applied when its result reaches the user.
+    """
     def __init__(self):
         self.items: Dict[str, Dict[str, Any]] = {} # short_alias -> item_data
+        self._lock = threading.Lock()
+        self._local = threading.local()  # .pending: changes held back by deferred()
 
-    def add_item(self, full_key: str, label: str, item_type: str, metadata: Dict):
-        """Adds an item to the session context."""
+    def add_item(self, full_key: str, label: str, item_type: str, metadata: Dict, defer: bool = True):
+        """Adds an item to the session context (recorded instead inside deferred(), unless defer=False)."""
         short_alias = full_key.split('-')[-1]
-        self.items[short_alias] = {
+        entry = {
             'full_key': full_key,
             'label': label,
             'type': item_type,
             'metadata': metadata
         }
+        pending = getattr(self._local, 'pending', None)
+        if defer and pending is not None:
+            pending.append((short_alias, entry))
+            return
+        self.apply([(short_alias, entry)])
 
     def get_item(self, short_alias: str) -> Optional[Dict]:
         """Retrieves an item by its short alias."""
@@ -51,8 +98,33 @@ class SessionContext:
         ]
 
     def clear(self):
-        """Clears the session context."""
-        self.items.clear()
+        """Clears the session context (recorded instead inside deferred())."""
+        pending = getattr(self._local, 'pending', None)
+        if pending is not None:
+            pending.append(None)
+            return
+        self.apply([None])
+
+    @contextmanager
+    def deferred(self):
+        """Record this thread's add_item/clear calls instead of applying them; yields the record."""
+        pending: List[Optional[tuple]] = []
+        self._local.pending = pending
+        try:
+            yield pending
+        finally:
+            self._local.pending = None
+
+    def apply(self, changes: List[Optional[tuple]]):
+        """Apply changes recorded by deferred(): (alias, item) adds, None for a clear."""
+        with self._lock:
+            items = dict(self.items)
+            for change in changes:
+                if change is None:
+                    items = {}
+                else:
+                    items[change[0]] = change[1]
+            self.items = items
 
 class ConversationalLedger:
     """Manages the persistent, long-term memory ledger using MemoryIndex."""
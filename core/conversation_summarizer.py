@@ -0,0 +1,115 @@
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RollingSummarizer:
+    """Keeps a compact running summary of the session plus the last few turns.
+
+    Messages older than the last `keep_turns` exchanges are folded into the
+    summary by a background worker once the conversation has been idle for
+    `idle_delay` seconds, so prompts carry "summary + recent turns" and stay
+    bounded no matter how long the session runs.
+    """
+    def __init__(self, summarize_fn: Callable[[str], str], keep_turns: int = 2, fold_batch: int = 4,
+                 max_summary_words: int = 120, message_chars: int = 300, idle_delay: float = 2.0,
+                 should_run: Optional[Callable[[], bool]] = None):
+        self.summarize_fn = summarize_fn
+        self.keep_messages = max(1, int(keep_turns)) * 2  # one turn = user + Jarvis
+        self.fold_batch = max(1, int(fold_batch))
+        self.max_summary_words = int(max_summary_words)
+        self.message_chars = int(message_chars)
+        self.idle_delay = float(idle_delay)
+        self.should_run = should_run or (lambda: True)
+        self.summary = ""
+        self._messages: List[Dict[str, str]] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, role: str, message: str) -> None:
+        paused = not self.should_run()
+        with self._lock:
+            self._messages.append({"role": role, "message": " ".join(str(message).split())})
+            if paused:
+                # Nothing folds while paused (gaming mode); keep one batch of backlog, not the whole session.
+                del self._messages[:-(self.keep_messages + self.fold_batch)]
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._worker, daemon=True, name="conversation-summarizer")
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def _worker(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            # Wait for a quiet gap between turns; new messages restart the wait.
+            while not self._stop.is_set() and self._wake.wait(self.idle_delay):
+                self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.fold()
+            except Exception as e:
+                logger.debug(f"Conversation summary skipped: {e}")
+
+    def _pending(self) -> List[Dict[str, str]]:
+        return self._messages[:-self.keep_messages] if len(self._messages) > self.keep_messages else []
+
+    def fold(self, force: bool = False) -> bool:
+        """Fold messages outside the recent window into the summary. Returns True if it ran."""
+        if not self.should_run():
+            return False
+        with self._lock:
+            pending = list(self._pending())
+            summary = self.summary
+        if not pending or (len(pending) < self.fold_batch and not force):
+            return False
+
+        exchanges = "\n".join(f"{m['role']}: {m['message'][:self.message_chars]}" for m in pending)
+        prompt = (
+            "Update the running summary of this conversation between Spencer and Jarvis. "
+            "Keep names, decisions, open questions and anything Spencer asked to remember. "
+            f"Stay under {self.max_summary_words} words. Return only the summary.\n\n"
+            f"Current summary:\n{summary or '(none yet)'}\n\n"
+            f"New exchanges:\n{exchanges}\n\n"
+            "Updated summary:"
+        )
+        updated = " ".join(str(self.summarize_fn(prompt) or "").split())
+        if not updated or updated.startswith("Error:"):
+            return False
+        words = updated.split()
+        if len(words) > self.max_summary_words:
+            updated = " ".join(words[:self.max_summary_words])
+
+        with self._lock:
+            # Messages that arrived meanwhile sit after the folded ones; drop only what was summarized.
+            del self._messages[:len(pending)]
+            self.summary = updated
+        return True
+
+    def render(self) -> str:
+        """Prompt block: rolling summary plus the most recent turns."""
+        with self._lock:
+            summary = self.summary
+            # Unfolded backlog stays out of the prompt until the worker folds it.
+            recent = self._messages[-self.keep_messages:]
+        if not summary and not recent:
+            return ""
+        parts = []
+        if summary:
+            parts.append(f"CONVERSATION SUMMARY:\n  {summary}")
+        if recent:
+            lines = "\n".join(f"  {m['role']}: {m['message'][:self.message_chars]}" for m in recent)
+            parts.append(f"RECENT EXCHANGES:\n{lines}")
+        return "\n".join(parts) + "\n"
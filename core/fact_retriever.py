@@ -0,0 +1,116 @@
+import hashlib
+import math
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 chars per token) used for prompt budgeting."""
+    return max(1, int(math.ceil(len(text or "") / 4.0)))
+
+
+class FactRetriever:
+    """Selects the memory facts most relevant to an utterance under a token budget.
+
+    Facts are embedded once (keyed by content hash) and kept as a normalized
+    float32 matrix, so a lookup costs one query embedding plus a mat-vec.
+    Vectors from different embedders are never scored against each other:
+    when `backend()` reports a new backend, or the query and fact widths
+    disagree (OpenVINO vs hash fallback), every fact is embedded again.
+    """
+    def __init__(self, embed_fn: Callable[[str], Sequence[float]], top_k: int = 6, token_budget: int = 200,
+                 backend: Optional[Callable[[], str]] = None):
+        self.embed_fn = embed_fn
+        self.backend = backend or (lambda: "")
+        self.top_k = max(1, int(top_k))
+        self.token_budget = max(1, int(token_budget))
+        self._lock = threading.Lock()
+        self._vectors: Dict[str, np.ndarray] = {}  # fact digest -> normalized vector
+        self._facts: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._backend: Optional[str] = None  # backend the cached vectors came from
+
+    @staticmethod
+    def _digest(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def _vectorize(self, text: str) -> np.ndarray:
+        vec = np.asarray(self.embed_fn(text) or [], dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm > 0 else vec
+
+    def _reset(self) -> None:
+        self._vectors.clear()
+        self._matrix = None
+
+    def _sync(self, facts: List[str]) -> None:
+        """Rebuild the fact matrix when the fact list or the embedding backend has changed."""
+        backend = self.backend()
+        if backend != self._backend:
+            self._reset()
+            self._backend = backend
+        if self._matrix is not None and facts == self._facts:
+            return
+        rows = self._embed_facts(facts)
+        if len({len(r) for r in rows}) > 1:
+            # Cached vectors from an earlier backend, or one call fell back mid-way: start over once.
+            self._reset()
+            rows = self._embed_facts(facts)
+            if len({len(r) for r in rows}) > 1:
+                raise ValueError("Fact embeddings have mixed widths")
+        self._facts = list(facts)
+        self._matrix = np.vstack(rows) if rows else np.zeros((0, 0), dtype=np.float32)
+
+    def _embed_facts(self, facts: List[str]) -> List[np.ndarray]:
+        rows = []
+        for fact in facts:
+            key = self._digest(fact)
+            vec = self._vectors.get(key)
+            if vec is None:
+                vec = self._vectorize(fact)
+                self._vectors[key] = vec
+            rows.append(vec)
+        # Drop vectors for facts that were removed or corrected.
+        live = {self._digest(f) for f in facts}
+        for key in [k for k in self._vectors if k not in live]:
+            del self._vectors[key]
+        return rows
+
+    def warm(self, facts: Sequence[str]) -> None:
+        """Embed facts ahead of the first prompt (safe to run on a background thread)."""
+        with self._lock:
+            self._sync([f for f in facts if isinstance(f, str) and f.strip()])
+
+    def select(self, query: str, facts: Sequence[str]) -> List[str]:
+        """Return the top-k facts for query that fit the token budget, in memory order."""
+        facts = [f for f in facts if isinstance(f, str) and f.strip()]
+        if not facts:
+            return []
+        # Small memories fit as-is; skip embedding entirely.
+        if len(facts) <= self.top_k and sum(estimate_tokens(f) for f in facts) <= self.token_budget:
+            return facts
+
+        q = self._vectorize(query or "")
+        with self._lock:
+            self._sync(facts)
+            if len(q) != self._matrix.shape[1]:
+                self._reset()  # the backend changed under the cached facts
+                self._sync(facts)
+            matrix = self._matrix
+        if len(q) != matrix.shape[1]:
+            raise ValueError(f"Query embedding width {len(q)} does not match facts ({matrix.shape[1]})")
+        scores = matrix @ q
+
+        chosen = []
+        used = 0
+        for idx in np.argsort(-scores, kind="stable"):
+            cost = estimate_tokens(facts[idx])
+            if used + cost > self.token_budget:
+                continue
+            chosen.append(int(idx))
+            used += cost
+            if len(chosen) >= self.top_k:
+                break
+        return [facts[i] for i in sorted(chosen)]
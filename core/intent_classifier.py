@@ -0,0 +1,86 @@
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingIntentClassifier:
+    """Nearest-exemplar intent classifier over sentence embeddings.
+
+    Each intent contributes a few example utterances; their embeddings are
+    computed once (warm()) and stacked into one normalized matrix, so
+    classifying a new utterance is one embedding plus one matrix-vector product.
+    A match is returned only when the best intent clears `threshold` and beats
+    the runner-up intent by at least `margin`.
+    """
+    def __init__(self, embed_fn: Callable[[str], Sequence[float]], exemplars: Dict[str, Iterable[str]],
+                 threshold: float = 0.78, margin: float = 0.04):
+        self.embed_fn = embed_fn
+        self.exemplars = {name: [t for t in texts if t] for name, texts in exemplars.items()}
+        self.exemplars = {name: texts for name, texts in self.exemplars.items() if texts}
+        self.threshold = float(threshold)
+        self.margin = float(margin)
+        self.intents: List[str] = sorted(self.exemplars)
+        self._matrix: Optional[np.ndarray] = None
+        self._owner: Optional[np.ndarray] = None  # row -> intent index
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._matrix is not None
+
+    def _vector(self, text: str) -> np.ndarray:
+        vec = np.asarray(self.embed_fn(text), dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm > 0 else vec
+
+    def warm(self) -> None:
+        """Embed every exemplar (idempotent)."""
+        with self._lock:
+            if self._matrix is not None:
+                return
+            rows, owner = [], []
+            for idx, name in enumerate(self.intents):
+                for text in self.exemplars[name]:
+                    rows.append(self._vector(text))
+                    owner.append(idx)
+            if not rows:
+                return
+            self._owner = np.asarray(owner, dtype=np.int32)
+            self._matrix = np.vstack(rows)
+        logger.info(f"Intent classifier ready: {len(owner)} exemplars over {len(self.intents)} intents")
+
+    def warm_in_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self._safe_warm, daemon=True, name="intent-classifier-warm")
+        thread.start()
+        return thread
+
+    def _safe_warm(self) -> None:
+        try:
+            self.warm()
+        except Exception as e:
+            logger.warning(f"Intent classifier warm-up failed: {e}")
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Best exemplar similarity per intent (empty until warmed)."""
+        if self._matrix is None or not (text or "").strip():
+            return {}
+        sims = self._matrix @ self._vector(text.lower().strip())
+        best = np.full(len(self.intents), -1.0, dtype=np.float32)
+        np.maximum.at(best, self._owner, sims)
+        return {name: float(best[i]) for i, name in enumerate(self.intents)}
+
+    def classify(self, text: str) -> Tuple[Optional[str], float]:
+        """(intent, similarity) when confident, else (None, best similarity)."""
+        scores = self.scores(text)
+        if not scores:
+            return None, 0.0
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+        top_name, top = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else -1.0
+        if top >= self.threshold and top - runner_up >= self.margin:
+            return top_name, top
+        return None, top
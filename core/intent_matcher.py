@@ -0,0 +1,136 @@
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class AhoCorasick:
+    """Multi-pattern substring automaton: one pass over the text finds every phrase present."""
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        for phrase in phrases:
+            self._add(phrase)
+        self._build()
+
+    def _add(self, phrase: str) -> int:
+        pid = len(self.phrases)
+        self.phrases.append(phrase)
+        node = 0
+        for ch in phrase:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(pid)
+        return pid
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def search(self, text: str) -> Set[int]:
+        """Ids of all phrases occurring in text."""
+        found: Set[int] = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+class IntentMatcher:
+    """The INTENTS table compiled once: one automaton for every keyword, blocker and
+    required phrase, plus precompiled patterns/regexes.
+
+    Scoring is identical to the original per-intent loop in JarvisGT2._match_intent:
+    blockers veto; each pattern/regex hit scores 3 and each keyword hit 1 (the
+    "trigger" score); intents with "required" need a trigger and a required hit,
+    each of which adds 2; everything else needs a trigger.
+    """
+    KEYWORD, BLOCKER, REQUIRED = 0, 1, 2
+
+    def __init__(self, intents: Dict[str, Dict[str, Any]]):
+        self.intents = intents
+        self.names: List[str] = list(intents)
+        phrase_ids: Dict[str, int] = {}
+        # phrase id -> [(intent index, kind)], one entry per occurrence in the table
+        self._postings: List[List[Tuple[int, int]]] = []
+        self._has_required: List[bool] = []
+        self._regexes: List[Tuple[int, "re.Pattern"]] = []
+
+        for idx, name in enumerate(self.names):
+            cfg = intents[name]
+            for kind, key in ((self.KEYWORD, "keywords"), (self.BLOCKER, "blockers"), (self.REQUIRED, "required")):
+                for phrase in cfg.get(key, []):
+                    pid = phrase_ids.get(phrase)
+                    if pid is None:
+                        pid = phrase_ids[phrase] = len(self._postings)
+                        self._postings.append([])
+                    self._postings[pid].append((idx, kind))
+            self._has_required.append(bool(cfg.get("required")))
+            for pat in cfg.get("patterns", []):
+                self._regexes.append((idx, re.compile(pat, re.IGNORECASE)))
+            if cfg.get("regex"):
+                self._regexes.append((idx, re.compile(cfg["regex"], re.IGNORECASE)))
+
+        self.automaton = AhoCorasick(phrase_ids)
+
+    def scores(self, raw_text: str) -> List[Tuple[str, int]]:
+        """(intent_name, score) for every intent that qualifies, in table order."""
+        text = (raw_text or "").lower().strip()
+        n = len(self.names)
+        keyword_hits = [0] * n
+        required_hits = [0] * n
+        blocked = [False] * n
+        for pid in self.automaton.search(text):
+            for idx, kind in self._postings[pid]:
+                if kind == self.KEYWORD:
+                    keyword_hits[idx] += 1
+                elif kind == self.REQUIRED:
+                    required_hits[idx] += 1
+                else:
+                    blocked[idx] = True
+
+        trigger = keyword_hits
+        for idx, rx in self._regexes:
+            if not blocked[idx] and rx.search(text):
+                trigger[idx] += 3
+
+        results = []
+        for idx, name in enumerate(self.names):
+            if blocked[idx] or trigger[idx] == 0:
+                continue
+            score = trigger[idx]
+            if self._has_required[idx]:
+                if required_hits[idx] == 0:
+                    continue
+                score += required_hits[idx] * 2
+            results.append((name, score))
+        return results
+
+    def best(self, raw_text: str, accept=None) -> Tuple[Optional[str], int]:
+        """Highest-scoring intent (first in table order on ties) that `accept(name)` allows."""
+        best_name, best_score = None, 0
+        for name, score in self.scores(raw_text):
+            if score > best_score and (accept is None or accept(name)):
+                best_name, best_score = name, score
+        return best_name, best_score
@@ -0,0 +1,118 @@
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+@dataclass
+class Job:
+    id: int
+    short_key: str
+    label: str
+    status: str = "queued"  # queued | running | done | failed
+    progress: str = ""
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    messages: List[str] = field(default_factory=list)  # speech captured while running
+    context: Dict[str, Any] = field(default_factory=dict)
+    result: Any = None
+    error: Optional[str] = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def outcome(self) -> str:
+        """What the job would have said when it finished."""
+        if self.status == "failed":
+            return f"Job {self.short_key} ({self.label}) failed: {self.error}"
+        return self.messages[-1] if self.messages else f"Job {self.short_key} ({self.label}) is complete."
+
+
+class JobExecutor:
+    """Runs long handlers on a small thread pool so the main loop keeps listening.
+
+    Each job gets an id and a "j{n}" short key. on_event(job, event) is called
+    for "queued", "started", "progress", "done" and "failed". Code running
+    inside a job can find it with JobExecutor.current() (e.g. to report
+    progress or to divert speech into job.messages).
+    """
+    def __init__(self, max_workers: int = 2, on_event: Optional[Callable[[Job, str], None]] = None,
+                 history: int = 50):
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="jarvis-job")
+        self.on_event = on_event
+        self.history = int(history)
+        self._ids = itertools.count(1)
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def current() -> Optional[Job]:
+        return getattr(_local, "job", None)
+
+    def _emit(self, job: Job, event: str) -> None:
+        if self.on_event is None:
+            return
+        try:
+            self.on_event(job, event)
+        except Exception as e:
+            logger.debug(f"Job event handler failed for {job.short_key}: {e}")
+
+    def submit(self, label: str, fn: Callable, *args, context: Optional[Dict[str, Any]] = None, **kwargs) -> Job:
+        job_id = next(self._ids)
+        job = Job(id=job_id, short_key=f"j{job_id}", label=label, context=dict(context or {}))
+        with self._lock:
+            self._jobs[job.short_key] = job
+            finished = [k for k, j in self._jobs.items() if j.status in ("done", "failed")]
+            for key in finished[:max(0, len(self._jobs) - self.history)]:
+                del self._jobs[key]
+        self._emit(job, "queued")
+        self._pool.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job: Job, fn: Callable, args, kwargs) -> None:
+        _local.job = job
+        job.status = "running"
+        job.started_at = time.time()
+        self._emit(job, "started")
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = "done"
+        except Exception as e:
+            logger.error(f"Job {job.short_key} ({job.label}) failed: {e}", exc_info=True)
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            _local.job = None
+        self._emit(job, job.status)
+
+    def progress(self, message: str) -> None:
+        """Report progress for the job running on this thread (no-op elsewhere)."""
+        job = self.current()
+        if job is None:
+            return
+        job.progress = message
+        self._emit(job, "progress")
+
+    def get(self, short_key: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(short_key)
+
+    def active(self) -> List[Job]:
+        with self._lock:
+            return [j for j in self._jobs.values() if j.status in ("queued", "running")]
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait)
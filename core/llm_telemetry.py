@@ -0,0 +1,197 @@
+import json
+import os
+import queue
+import threading
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Upper bucket edges (ms) shared by every latency histogram.
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+METRICS = ("wall_ms", "queue_ms", "load_ms", "prefill_ms", "decode_ms", "prefill_tps", "decode_tps")
+# Latency metrics the dashboard draws histograms for.
+HISTOGRAM_METRICS = ("wall_ms", "queue_ms", "prefill_ms", "decode_ms")
+
+
+def _ns_to_ms(value) -> float:
+    try:
+        return round(float(value) / 1e6, 2)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _rate(tokens: int, ms: float) -> float:
+    return round(tokens / (ms / 1000.0), 2) if tokens and ms > 0 else 0.0
+
+
+class LLMTelemetry:
+    """Per-call brain metrics: prefill vs decode split, tokens/s and queue time.
+
+    Samples are tagged by call site and tier, kept in rolling windows for
+    histograms/percentiles, and appended to a JSONL log for offline analysis.
+    The log is written by a background thread so record() never waits on disk,
+    and rolls over to <log>.1 once it reaches max_log_bytes.
+    """
+    def __init__(self, log_path: Optional[str] = "telemetry/llm_calls.jsonl", window: int = 200,
+                 max_log_bytes: int = 5 * 1024 * 1024):
+        self.log_path = log_path
+        self.window = max(1, int(window))
+        self.max_log_bytes = int(max_log_bytes)
+        self._log_bytes: Optional[int] = None  # current log size, read on first write (writer thread only)
+        self._log_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._all: Deque[Dict[str, Any]] = deque(maxlen=self.window)
+        self._by_key: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = defaultdict(lambda: deque(maxlen=self.window))
+        self.total_calls = 0
+
+    def record(self, call_site: str, tier: str, model: str, payload: Dict[str, Any],
+               wall_ms: float, local_queue_ms: float = 0.0, host: Optional[str] = None) -> Dict[str, Any]:
+        """Build a sample from an Ollama response payload and store it.
+
+        local_queue_ms is time the call waited in this process before it was
+        sent (e.g. for a brain pool worker); the rest of queue_ms is whatever
+        wall time Ollama's own durations do not account for.
+        """
+        payload = payload or {}
+        prompt_tokens = int(payload.get("prompt_eval_count") or 0)
+        output_tokens = int(payload.get("eval_count") or 0)
+        prefill_ms = _ns_to_ms(payload.get("prompt_eval_duration"))
+        decode_ms = _ns_to_ms(payload.get("eval_duration"))
+        server_ms = _ns_to_ms(payload.get("total_duration"))
+        # Anything Ollama did not account for is network + server-side queueing.
+        remote_queue_ms = max(0.0, float(wall_ms) - server_ms) if server_ms else 0.0
+        sample = {
+            "timestamp": datetime.now().isoformat(),
+            "call_site": call_site or "unknown",
+            "tier": tier or "unknown",
+            "model": model,
+            "host": host,
+            "prompt_tokens": prompt_tokens,
+            "output_tokens": output_tokens,
+            "wall_ms": round(float(wall_ms), 2),
+            "queue_ms": round(float(local_queue_ms) + remote_queue_ms, 2),
+            "load_ms": _ns_to_ms(payload.get("load_duration")),
+            "prefill_ms": prefill_ms,
+            "decode_ms": decode_ms,
+            "prefill_tps": _rate(prompt_tokens, prefill_ms),
+            "decode_tps": _rate(output_tokens, decode_ms),
+        }
+        with self._lock:
+            self.total_calls += 1
+            self._all.append(sample)
+            self._by_key[(sample["call_site"], sample["tier"])].append(sample)
+            if self.log_path:
+                self._log_queue.put(sample)
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._log_worker, daemon=True, name="llm-telemetry-log")
+                    self._writer.start()
+        return sample
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until recorded samples are in the log (tests and shutdown)."""
+        if self._writer is None:
+            return True
+        done = threading.Event()
+        threading.Thread(target=lambda: (self._log_queue.join(), done.set()), daemon=True).start()
+        return done.wait(timeout)
+
+    def _log_worker(self) -> None:
+        while True:
+            batch = [self._log_queue.get()]
+            while True:
+                try:
+                    batch.append(self._log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._append_log(batch)
+            except Exception:
+                # Telemetry must never break a brain call.
+                pass
+            finally:
+                for _ in batch:
+                    self._log_queue.task_done()
+
+    def _append_log(self, samples: List[Dict[str, Any]]) -> None:
+        """Append samples as JSON lines, rolling over at max_log_bytes (writer thread only)."""
+        if self._log_bytes is None:
+            folder = os.path.dirname(self.log_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self._log_bytes = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        f = open(self.log_path, "ab")
+        try:
+            for sample in samples:
+                line = (json.dumps(sample) + "\n").encode("utf-8")
+                if self.max_log_bytes and self._log_bytes + len(line) > self.max_log_bytes:
+                    f.close()
+                    os.replace(self.log_path, self.log_path + ".1")  # keep one previous file
+                    f = open(self.log_path, "ab")
+                    self._log_bytes = 0
+                f.write(line)
+                self._log_bytes += len(line)
+        finally:
+            f.close()
+
+    def _samples(self, call_site: Optional[str] = None, tier: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            if call_site is None and tier is None:
+                return list(self._all)
+            return [
+                s for (site, t), rows in list(self._by_key.items())
+                if (call_site is None or site == call_site) and (tier is None or t == tier)
+                for s in rows
+            ]
+
+    def histogram(self, metric: str = "wall_ms", call_site: Optional[str] = None,
+                  tier: Optional[str] = None) -> Dict[str, int]:
+        """Rolling-window bucket counts for a latency metric."""
+        counts = {f"le_{edge}": 0 for edge in LATENCY_BUCKETS_MS}
+        counts["inf"] = 0
+        for sample in self._samples(call_site, tier):
+            value = sample.get(metric, 0)
+            for edge in LATENCY_BUCKETS_MS:
+                if value <= edge:
+                    counts[f"le_{edge}"] += 1
+                    break
+            else:
+                counts["inf"] += 1
+        return counts
+
+    @staticmethod
+    def _percentile(values: List[float], pct: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+        return ordered[idx]
+
+    def summary(self, call_site: Optional[str] = None, tier: Optional[str] = None) -> Dict[str, Any]:
+        """p50/p95 for each metric over the rolling window."""
+        samples = self._samples(call_site, tier)
+        out: Dict[str, Any] = {"count": len(samples)}
+        for metric in METRICS:
+            values = [float(s.get(metric, 0)) for s in samples]
+            out[metric] = {"p50": self._percentile(values, 50), "p95": self._percentile(values, 95)}
+        return out
+
+    def breakdown(self) -> Dict[str, Dict[str, Any]]:
+        """Summaries keyed by 'call_site/tier'."""
+        with self._lock:
+            keys = list(self._by_key.keys())
+        return {f"{site}/{tier}": self.summary(site, tier) for site, tier in keys}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Everything the dashboard shows: per site/tier percentiles and rolling histograms."""
+        return {
+            "total_calls": self.total_calls,
+            "window": self.window,
+            "buckets_ms": list(LATENCY_BUCKETS_MS),
+            "breakdown": self.breakdown(),
+            "histograms": {metric: self.histogram(metric) for metric in HISTOGRAM_METRICS},
+        }
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._all[-1] if self._all else None
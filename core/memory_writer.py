@@ -0,0 +1,99 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CoalescingWriter:
+    """Background thread that turns bursts of save requests into one write.
+
+    mark_dirty() is cheap and never blocks on disk. The first mark opens a
+    window of `delay` seconds; every mark inside it rides on the same
+    write_fn() call. A write that raises or returns False is retried after
+    another window. flush() writes anything pending now and waits for it.
+    """
+    def __init__(self, write_fn: Callable[[], Optional[bool]], delay: float = 0.5, name: str = "memory-writer"):
+        self.write_fn = write_fn
+        self.delay = delay
+        self.requests = 0  # mark_dirty() calls
+        self.writes = 0  # successful write_fn() calls
+        self.failures = 0
+        self._cond = threading.Condition()
+        self._generation = 0  # bumped by every mark_dirty()
+        self._written = 0  # newest generation a successful write covered
+        self._dirty_since: Optional[float] = None
+        self._flush_requested = False
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> bool:
+        with self._cond:
+            return self._written < self._generation
+
+    def mark_dirty(self) -> None:
+        with self._cond:
+            self.requests += 1
+            self._generation += 1
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+            self._cond.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Write pending changes now; True once everything marked so far is on disk."""
+        with self._cond:
+            target = self._generation
+            if self._written >= target:
+                return True
+            if not self._thread.is_alive():
+                return False
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._written >= target, timeout)
+
+    def stop(self, timeout: float = 5.0) -> bool:
+        """Flush, then end the writer thread."""
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        return flushed
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._dirty_since is None and not self._stopping:
+                    self._cond.wait()
+                if self._dirty_since is None:
+                    return
+                deadline = self._dirty_since + self.delay
+                while not (self._stopping or self._flush_requested):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._stopping:
+                    return
+                target = self._generation
+                self._dirty_since = None
+                self._flush_requested = False
+
+            try:
+                ok = self.write_fn() is not False
+            except Exception as e:
+                logger.error(f"Memory write failed: {e}")
+                ok = False
+
+            with self._cond:
+                if ok:
+                    self.writes += 1
+                    self._written = max(self._written, target)
+                else:
+                    self.failures += 1
+                    if self._dirty_since is None:
+                        self._dirty_since = time.monotonic()
+                self._cond.notify_all()
@@ -0,0 +1,154 @@
+import logging
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+KeepAlive = Union[str, int]
+
+# Re-ping at this fraction of keep_alive so the model never quite expires
+PING_FRACTION = 0.8
+DEFAULT_PING_INTERVAL = 240.0  # when keep_alive cannot be parsed
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ns|us|ms|s|m|h)")
+_UNIT_SECONDS = {"ns": 1e-9, "us": 1e-6, "ms": 1e-3, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def keep_alive_seconds(keep_alive: KeepAlive) -> Optional[float]:
+    """Seconds an Ollama keep_alive keeps a model loaded ("10m", "1h30m", 300, "-1").
+
+    Bare numbers are seconds, as Ollama reads them. Negative means forever
+    (float("inf")); None when the value cannot be parsed.
+    """
+    if isinstance(keep_alive, (int, float)):
+        return float("inf") if keep_alive < 0 else float(keep_alive)
+    text = str(keep_alive or "").strip().lower()
+    if not text:
+        return None
+    try:
+        value = float(text)
+        return float("inf") if value < 0 else value
+    except ValueError:
+        pass
+    if text.startswith("-"):
+        return float("inf")
+    parts = _DURATION_PART.findall(text)
+    if not parts or "".join(n + u for n, u in parts) != text:
+        return None
+    return sum(float(n) * _UNIT_SECONDS[u] for n, u in parts)
+
+
+class ModelWarmer:
+    """Keeps brain models resident so the first call after a quiet spell skips the load.
+
+    - preload(): fire-and-forget load of a model (e.g. the moment the wake word fires),
+      debounced so repeated wakes do not spam the brain.
+    - Idle keep-warm: while there was activity in the last `keep_warm_minutes`, the
+      models actually called since the last wake (note_wake()) are re-pinged before
+      Ollama's keep_alive expires (by default every PING_FRACTION of keep_alive); a
+      configured model the session is not using is left to unload.
+    - unload(): keep_alive=0 to free GPU memory (gaming mode).
+    `is_blocked` suppresses preloads and keep-warm entirely while it returns True.
+    """
+    def __init__(self, send_fn: Callable[[str, KeepAlive], None], models: Iterable[str] = (),
+                 keep_alive: KeepAlive = "10m", keep_warm_minutes: float = 30.0,
+                 ping_interval: Optional[float] = None, min_preload_interval: float = 30.0,
+                 is_blocked: Optional[Callable[[], bool]] = None, clock: Callable[[], float] = time.time):
+        self.send_fn = send_fn
+        self.models = [m for m in dict.fromkeys(models) if m]
+        self.keep_alive = keep_alive
+        self.keep_warm_minutes = float(keep_warm_minutes)
+        if ping_interval is None:
+            seconds = keep_alive_seconds(keep_alive)
+            ping_interval = DEFAULT_PING_INTERVAL if seconds is None else seconds * PING_FRACTION
+        self.ping_interval = float(ping_interval)
+        self.min_preload_interval = float(min_preload_interval)
+        self.is_blocked = is_blocked or (lambda: False)
+        self.clock = clock
+        self.last_activity = 0.0
+        self._last_sent: Dict[str, float] = {}
+        self._used: Dict[str, None] = {}  # models called since the last wake, in first-use order
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def note_activity(self, model: Optional[str] = None) -> None:
+        """Record a real brain call; it also refreshes that model's keep_alive on the server."""
+        now = self.clock()
+        with self._lock:
+            self.last_activity = now
+            if model:
+                self._last_sent[model] = now
+                self._used[model] = None
+
+    def note_wake(self) -> None:
+        """Start a new interaction: keep-warm follows only the models called from here on."""
+        with self._lock:
+            self._used.clear()
+
+    def _send(self, model: str, keep_alive: KeepAlive) -> None:
+        try:
+            self.send_fn(model, keep_alive)
+        except Exception as e:
+            logger.debug(f"Keep-alive for {model} failed: {e}")
+
+    def preload(self, model: str, background: bool = True) -> bool:
+        """Ask the brain to load model now. Returns False if skipped (blocked or recently sent)."""
+        if not model or self.is_blocked():
+            return False
+        now = self.clock()
+        with self._lock:
+            if now - self._last_sent.get(model, 0.0) < self.min_preload_interval:
+                return False
+            self._last_sent[model] = now
+        if background:
+            threading.Thread(target=self._send, args=(model, self.keep_alive), daemon=True).start()
+        else:
+            self._send(model, self.keep_alive)
+        return True
+
+    def unload(self, models: Optional[Iterable[str]] = None) -> None:
+        """Release models from GPU memory (keep_alive=0)."""
+        for model in dict.fromkeys(models or self.models):
+            with self._lock:
+                self._last_sent.pop(model, None)
+                self._used.pop(model, None)
+            threading.Thread(target=self._send, args=(model, 0), daemon=True).start()
+
+    def keep_warm_tick(self) -> int:
+        """Re-ping models that are due, if the session was active recently. Returns pings sent."""
+        if self.keep_warm_minutes <= 0 or self.ping_interval <= 0 or self.is_blocked():
+            return 0
+        now = self.clock()
+        if now - self.last_activity > self.keep_warm_minutes * 60:
+            return 0
+        with self._lock:
+            used = list(self._used)
+        sent = 0
+        for model in used:
+            with self._lock:
+                due = now - self._last_sent.get(model, 0.0) >= self.ping_interval
+                if due:
+                    self._last_sent[model] = now
+            if due:
+                self._send(model, self.keep_alive)
+                sent += 1
+        return sent
+
+    def start(self, check_interval: Optional[float] = None) -> None:
+        """Run keep_warm_tick() every check_interval seconds (default: often enough to hit ping_interval)."""
+        if self._thread and self._thread.is_alive():
+            return
+        if check_interval is None:
+            check_interval = max(1.0, min(60.0, self.ping_interval / 4))
+
+        def loop():
+            while not self._stop.wait(check_interval):
+                self.keep_warm_tick()
+
+        self._thread = threading.Thread(target=loop, daemon=True, name="model-keep-warm")
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
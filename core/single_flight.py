@@ -0,0 +1,97 @@
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def brain_request_key(model: str, prompt: str, system: Optional[str] = None,
+                      options: Optional[Dict[str, Any]] = None) -> str:
+    """Stable key for a generation request; identical keys produce identical work."""
+    raw = json.dumps([model, prompt, system or "", options or {}], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class FlightTimeout(TimeoutError):
+    """A follower gave up waiting on the in-flight leader."""
+
+
+class _Flight:
+    __slots__ = ("event", "result", "error", "attached")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.attached = 0
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one execution.
+
+    The first caller (leader) runs the function; callers arriving while it is
+    in flight wait (up to their own timeout) and share its result or
+    exception. Nothing is cached once the flight lands, so later calls always
+    run fresh.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self.calls = 0       # every do() call
+        self.executed = 0    # calls that actually ran fn (leaders)
+        self.hits = 0        # calls that attached to an in-flight leader
+        self.max_attached = 0
+        self.timeouts = 0    # followers that gave up waiting
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """Run fn, or share the result of an identical call already running.
+
+        A follower waits at most timeout seconds for the leader, then raises
+        FlightTimeout; the leader's own call is bounded by fn itself.
+        """
+        with self._lock:
+            self.calls += 1
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+                self.executed += 1
+            else:
+                flight.attached += 1
+                self.hits += 1
+                self.max_attached = max(self.max_attached, flight.attached)
+
+        if not leader:
+            if not flight.event.wait(timeout):
+                with self._lock:
+                    self.timeouts += 1
+                raise FlightTimeout(f"Identical request still running after {timeout}s")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executed": self.executed,
+                "hits": self.hits,
+                "max_attached": self.max_attached,
+                "timeouts": self.timeouts,
+                "hit_rate": round(self.hits / self.calls, 3) if self.calls else 0.0,
+            }
@@ -53,6 +53,8 @@ class DashboardBridge:
         self.last_ollama_response_time = 0
         self.last_ollama_display_time = 0.0
         self.last_ollama_display_value = 0
+        self.last_llm_sample = None
+        self.last_llm_sample_time = 0.0
 
         # State tracking
         self.current_state = {
@@ -172,6 +174,11 @@ class DashboardBridge:
         self.last_ollama_display_time = time.time()
         self.last_ollama_display_value = ms
 
+    def set_llm_telemetry(self, sample: Dict[str, Any]):
+        """Set by Jarvis after an LLM call with its prefill/decode breakdown."""
+        self.last_llm_sample = dict(sample or {})
+        self.last_llm_sample_time = time.time()
+
     def _on_error(self, ws, error):
         """WebSocket error handler."""
         logger.debug(f"WebSocket error: {error}")
@@ -244,13 +251,22 @@ class DashboardBridge:
             else:
                 ollama_ms = 0
 
+            # Last LLM call breakdown (same 10s retention as the response-time gauge)
+            llm = self.last_llm_sample or {}
+            if (time.time() - self.last_llm_sample_time) > 10:
+                llm = {}
+
             return {
                 "cpu": round(cpu_percent, 1),
                 "memory": round(memory_percent, 1),
                 "cpuTemp": round(cpu_temp, 1),
                 "gpuTemp": round(gpu_temp, 1),
                 "npu": npu_usage,
-                "ollama": ollama_ms
+                "ollama": ollama_ms,
+                "llmTokensPerSec": llm.get("decode_tps", 0),
+                "llmPrefillMs": llm.get("prefill_ms", 0),
+                "llmDecodeMs": llm.get("decode_ms", 0),
+                "llmQueueMs": llm.get("queue_ms", 0)
             }
         except Exception as e:
             logger.error(f"Error collecting metrics: {e}")
@@ -346,6 +362,16 @@ class DashboardBridge:
         short_keys = [item['short_key'] for item in items]
         logger.debug(f"Pushed to ticker: {short_keys}")
 
+    def push_llm_telemetry(self, snapshot: Dict[str, Any]):
+        """Push the rolling LLM call breakdown (per call site/tier percentiles and histograms)."""
+        if not self.connected:
+            return
+
+        self._send({
+            "type": "llm_telemetry",
+            "data": snapshot
+        })
+
     def push_news_ticker(self, headlines: List[Dict[str, Any]]):
         """Push formatted News short-keys to ticker, e.g. 'News 1', 'News 2'."""
         items = []
@@ -27,6 +27,7 @@ except ImportError:
     OPENVINO_STT_AVAILABLE = False
 
 import requests
+import copy
 import functools
 import platform
 from googleapiclient.discovery import build
@@ -65,8 +66,23 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 from vault_reference import VaultReference
 from memory_index import MemoryIndex
+from memory_index_sqlite import SQLiteMemoryIndex
 from dashboard_bridge import DashboardBridge
-from core.context_manager import ShortKeyGenerator, SessionContext as NewSessionContext, ConversationalLedger
+from core.context_manager import ShortKeyGenerator, SessionContext as NewSessionContext, ConversationalLedger, \
+    FULL_KEY_PATTERN, expand_dated_aliases
+from core.fact_retriever import FactRetriever
+from core.llm_telemetry import LLMTelemetry
+from core.brain_pool import BrainPool
+from core.single_flight import FlightTimeout, SingleFlight, brain_request_key
+from core.conversation_summarizer import RollingSummarizer
+from core.model_warmer import ModelWarmer
+from core.code_analysis import ChunkedCodeAnalyzer
+from core.code_index import CodeIndex
+from core.intent_matcher import IntentMatcher
+from core.intent_classifier import EmbeddingIntentClassifier
+from core.action_recall import ActionRecallIndex
+from core.job_executor import JobExecutor
+from core.memory_writer import CoalescingWriter
 
 # Load environment variables from .env file
 try:
@@ -172,7 +188,33 @@ def load_config():
     smart_llm_timeout = float(os.getenv("SMART_LLM_TIMEOUT", config.get("smart_llm_timeout", 5)))
     piper_exe = os.getenv("PIPER_EXE") or config.get("piper_exe")
     perplexity_api_key = os.getenv("PERPLEXITY_API_KEY") or config.get("perplexity_api_key")
-    news_api_key = os.getenv("NEWS_API_KEY") or config.get("news_api_key")
+    news_api_key = os.getenv("NEWS_API_KEY") or config.get("news_api_key")
+    fact_top_k = int(os.getenv("FACT_TOP_K", config.get("fact_top_k", 6)))
+    fact_token_budget = int(os.getenv("FACT_TOKEN_BUDGET", config.get("fact_token_budget", 200)))
+    # Optional multi-host brain pool: BRAIN_POOL_URLS="http://gpu1:11434,http://gpu2:11434"
+    # or config "brain_pool": [{"url": "...", "models": ["llama3.1:8b"]}, ...]
+    pool_env = os.getenv("BRAIN_POOL_URLS")
+    brain_pool = [u.strip() for u in pool_env.split(",") if u.strip()] if pool_env else config.get("brain_pool", [])
+    brain_pool_probe_interval = float(os.getenv("BRAIN_POOL_PROBE_INTERVAL", config.get("brain_pool_probe_interval", 30)))
+    # How long Ollama keeps a model resident after a call, and how long after the last
+    # activity Jarvis keeps re-pinging it (0 disables idle keep-warm).
+    brain_keep_alive = os.getenv("BRAIN_KEEP_ALIVE") or config.get("brain_keep_alive", "10m")
+    brain_keep_warm_minutes = float(os.getenv("BRAIN_KEEP_WARM_MINUTES", config.get("brain_keep_warm_minutes", 30)))
+    # Embedding intent classifier before the LLM fallback: "auto" (OpenVINO embeddings only), "on" or "off"
+    intent_classifier = (os.getenv("INTENT_CLASSIFIER") or config.get("intent_classifier", "auto")).lower()
+    intent_classifier_threshold = float(os.getenv("INTENT_CLASSIFIER_THRESHOLD", config.get("intent_classifier_threshold", 0.78)))
+    # Worker threads for long handlers (web search, deep dig, code analysis, comparison); 0 runs them inline
+    background_job_workers = int(os.getenv("BACKGROUND_JOB_WORKERS", config.get("background_job_workers", 2)))
+    # Action journal: fsync policy ("always", "interval", "never") and actions between index checkpoints
+    memory_journal_fsync = (os.getenv("MEMORY_JOURNAL_FSYNC") or config.get("memory_journal_fsync", "interval")).lower()
+    memory_checkpoint_every = int(os.getenv("MEMORY_CHECKPOINT_EVERY", config.get("memory_checkpoint_every", 1000)))
+    # Action history store: "json" (memory file + journal) or "sqlite" (jarvis_memory.db, FTS5 keyword search)
+    memory_backend = (os.getenv("MEMORY_BACKEND") or config.get("memory_backend", "json")).lower()
+    # Days of actions kept hot in the JSON index; older ones move to monthly archive segments (0 = never)
+    memory_hot_days = int(os.getenv("MEMORY_HOT_DAYS", config.get("memory_hot_days", 90)))
+    # Embedding recall over the action history: "auto" (OpenVINO embeddings only), "on" or "off"
+    semantic_recall = (os.getenv("SEMANTIC_RECALL") or config.get("semantic_recall", "auto")).lower()
+    recall_min_similarity = float(os.getenv("RECALL_MIN_SIMILARITY", config.get("recall_min_similarity", 0.5)))
     
     # VAD Settings for barge-in and adaptive listening
     # Environment variables take priority over config.json
@@ -205,6 +247,21 @@ def load_config():
         "piper_exe": piper_exe,
         "perplexity_api_key": perplexity_api_key,
         "news_api_key": news_api_key,
+        "fact_top_k": fact_top_k,
+        "fact_token_budget": fact_token_budget,
+        "brain_pool": brain_pool,
+        "brain_pool_probe_interval": brain_pool_probe_interval,
+        "brain_keep_alive": brain_keep_alive,
+        "brain_keep_warm_minutes": brain_keep_warm_minutes,
+        "intent_classifier": intent_classifier,
+        "intent_classifier_threshold": intent_classifier_threshold,
+        "background_job_workers": background_job_workers,
+        "memory_journal_fsync": memory_journal_fsync,
+        "memory_checkpoint_every": memory_checkpoint_every,
+        "memory_backend": memory_backend,
+        "memory_hot_days": memory_hot_days,
+        "semantic_recall": semantic_recall,
+        "recall_min_similarity": recall_min_similarity,
         "vad_settings": vad_settings
     }
 
@@ -226,6 +283,35 @@ LLM_MODEL = config_dict["llm_model"]
 FAST_LLM_MODEL = config_dict.get("fast_llm_model", LLM_MODEL)
 SMART_LLM_MODEL = config_dict.get("smart_llm_model", LLM_MODEL)
 SMART_LLM_TIMEOUT = float(config_dict.get("smart_llm_timeout", 5))
+FACT_TOP_K = int(config_dict.get("fact_top_k", 6))
+FACT_TOKEN_BUDGET = int(config_dict.get("fact_token_budget", 200))
+BRAIN_POOL = config_dict.get("brain_pool", [])
+BRAIN_POOL_PROBE_INTERVAL = float(config_dict.get("brain_pool_probe_interval", 30))
+BRAIN_KEEP_ALIVE = config_dict.get("brain_keep_alive", "10m")
+BRAIN_KEEP_WARM_MINUTES = float(config_dict.get("brain_keep_warm_minutes", 30))
+INTENT_CLASSIFIER = config_dict.get("intent_classifier", "auto")
+INTENT_CLASSIFIER_THRESHOLD = float(config_dict.get("intent_classifier_threshold", 0.78))
+BACKGROUND_JOB_WORKERS = int(config_dict.get("background_job_workers", 2))
+MEMORY_JOURNAL_FSYNC = config_dict.get("memory_journal_fsync", "interval")
+MEMORY_CHECKPOINT_EVERY = int(config_dict.get("memory_checkpoint_every", 1000))
+MEMORY_BACKEND = config_dict.get("memory_backend", "json")
+MEMORY_HOT_DAYS = int(config_dict.get("memory_hot_days", 90))
+MEMORY_DB_FILE = "jarvis_memory.db"
+SEMANTIC_RECALL = config_dict.get("semantic_recall", "auto")
+RECALL_MIN_SIMILARITY = float(config_dict.get("recall_min_similarity", 0.5))
+ACTION_RECALL_FILE = "jarvis_memory_vectors"  # .npy matrix + .json row labels
+# save_memory() calls within this many seconds are coalesced into one background write.
+MEMORY_WRITE_DELAY = 0.5
+# Intents whose handlers take long enough (30-120s) to run as background jobs.
+BACKGROUND_INTENTS = {"WEB_SEARCH", "CODE_OPTIMIZATION", "FILE_COMPARISON"}
+# Optimization requests: files are analysed in chunks of this size; reports cached by content hash.
+CODE_ANALYSIS_CHUNK_CHARS = 12000
+CODE_ANALYSIS_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "code_analysis")
+# Concise mode (severe pain): shape spoken LLM replies at generation time.
+CONCISE_MAX_WORDS = 15
+CONCISE_MAX_SENTENCES = 2
+CONCISE_NUM_PREDICT = 40
+CONCISE_REWRITE_CACHE_SIZE = 64
 VAD_SETTINGS = config_dict["vad_settings"]
 
 # Configure logging â€” console at INFO, rotating file at DEBUG
@@ -406,6 +492,62 @@ INTENTS = {
     },
     "WEB_SEARCH": {"keywords": ["search", "who is", "what is", "find", "google"], "handler": "handle_web_search", "name": "search the web"}
 }
+
+# Compiled once: a single pass over the utterance scores every intent.
+INTENT_MATCHER = IntentMatcher(INTENTS)
+
+# Paraphrases for the embedding classifier, which only sees what INTENTS missed.
+# Intents that need exact wording (memory edits, short keys, vault admin) are left out.
+INTENT_EXAMPLES = {
+    "TASK": [
+        "put milk on my to do list",
+        "I need to pick up the parcel tomorrow, don't let me forget",
+        "what have I still got to do",
+        "jot down that I have to ring the garage",
+        "tick off the shopping one",
+    ],
+    "CALENDAR_READ": [
+        "am I free on thursday afternoon",
+        "when is my next meeting",
+        "what does tomorrow look like",
+        "have I got anything on this weekend",
+        "is there anything in the diary for monday",
+    ],
+    "CALENDAR_ACTION": [
+        "set up a call with Sam on friday at ten",
+        "put a dentist appointment in for next tuesday",
+        "push my two o'clock back an hour",
+        "pencil in lunch with Mark on wednesday",
+    ],
+    "EMAIL_SUMMARY": [
+        "anything new in my inbox",
+        "have I had any messages today",
+        "go through my inbox",
+        "who has written to me",
+    ],
+    "EMAIL_SEARCH": [
+        "did Alice send me anything about the invoice",
+        "look through my inbox for the delivery confirmation",
+    ],
+    "NEWS": [
+        "what's happening in the world",
+        "catch me up on current events",
+        "anything big going on today",
+    ],
+    "WEATHER": [
+        "do I need an umbrella today",
+        "is it going to rain later",
+        "how cold is it outside",
+    ],
+    "SYSTEM_SPECS": [
+        "how much memory is this machine using",
+        "how hard is the cpu working",
+    ],
+    "WEB_SEARCH": [
+        "look up how tall the eiffel tower is",
+        "can you check online when the new iphone comes out",
+    ],
+}
 
 class JarvisGT2:
     def __init__(self):
@@ -439,16 +581,34 @@ class JarvisGT2:
         
         # Short-term context buffer (last 5 exchanges)
         self.context_buffer = collections.deque(maxlen=5)
+
+        # Rolling session summary, folded in the idle time between turns
+        self.conversation_summarizer = RollingSummarizer(
+            lambda prompt: self.call_smart_model(prompt, timeout=30, tier="fast", call_site="conversation_summary"),
+            should_run=lambda: not getattr(self, "gaming_mode", False),
+        )
+        self.conversation_summarizer.start()
         
         # Long-term persistent memory
         self.memory_file = "jarvis_memory.json"
+        # Held while mutating self.memory and while the writer copies it
+        self.memory_lock = threading.RLock()
         self.memory = self.load_memory()
         
         # Indexed memory system for unlimited action history
-        self.memory_index = MemoryIndex(memory_file=self.memory_file)
+        if MEMORY_BACKEND == "sqlite":
+            self.memory_index = SQLiteMemoryIndex(db_file=MEMORY_DB_FILE, memory_file=self.memory_file)
+        else:
+            self.memory_index = MemoryIndex(memory_file=self.memory_file, fsync=MEMORY_JOURNAL_FSYNC,
+                                            checkpoint_every=MEMORY_CHECKPOINT_EVERY, hot_days=MEMORY_HOT_DAYS)
+        self.memory_writer = CoalescingWriter(self._write_memory, delay=MEMORY_WRITE_DELAY)
+        self.memory_index.on_checkpoint_due = self.memory_writer.mark_dirty
+        if hasattr(self.memory_index, "warm_in_background"):
+            self.memory_index.warm_in_background()  # substring recall without a cold first query
         
         # --- NEW: Visual Addressing & Context System ---
-        self.short_key_generator = ShortKeyGenerator()
+        # Seeded from the ledger so keys stay unique per day across restarts
+        self.short_key_generator = ShortKeyGenerator(getattr(self.memory_index, "short_key_counters", None))
         self.session_context = NewSessionContext()
         self.conversational_ledger = ConversationalLedger(self.memory_index, self.short_key_generator)
         
@@ -521,6 +681,64 @@ class JarvisGT2:
         else:
             logger.warning("âš  Vault index not available - file searches may be limited")
             self.log("âš  Vault index not loaded - generate with: python create_vault_index.py")
+
+        # Relevance-ranked memory facts (shares the vault embedding runtime)
+        self.fact_retriever = FactRetriever(
+            self.vault._embed_text, top_k=FACT_TOP_K, token_budget=FACT_TOKEN_BUDGET,
+            backend=lambda: getattr(self.vault, "embedding_backend", ""),
+        )
+        threading.Thread(
+            target=self.fact_retriever.warm, args=(self.memory.get("facts", []),), daemon=True
+        ).start()
+
+        # Embedding intent classifier for paraphrases the keyword table misses.
+        # "auto" only enables it on OpenVINO embeddings; the hash fallback is too coarse.
+        self.intent_classifier = None
+        embed_backend = getattr(self.vault, "embedding_backend", "hash")
+        if INTENT_CLASSIFIER == "on" or (INTENT_CLASSIFIER == "auto" and embed_backend == "openvino"):
+            self.intent_classifier = EmbeddingIntentClassifier(
+                self.vault._embed_text, INTENT_EXAMPLES, threshold=INTENT_CLASSIFIER_THRESHOLD
+            )
+            self.intent_classifier.warm_in_background()
+
+        # Semantic recall over the action history; new actions are embedded as they are logged
+        self.action_recall = None
+        if SEMANTIC_RECALL == "on" or (SEMANTIC_RECALL == "auto" and embed_backend == "openvino"):
+            self.action_recall = ActionRecallIndex(self.vault._embed_text, path=ACTION_RECALL_FILE,
+                                                   backend=embed_backend, window_days=MEMORY_HOT_DAYS)
+            # Sync first: the worker then embeds hooked actions after the history catch-up
+            self.action_recall.sync_in_background(self.memory_index)
+            self.memory_index.on_actions_added = self.action_recall.add_actions
+
+        # Per-call brain telemetry (prefill/decode split, tokens/s, queue time)
+        self.llm_telemetry = LLMTelemetry(
+            os.path.join(os.path.dirname(__file__), "telemetry", "llm_calls.jsonl")
+        )
+
+        # Collapse concurrent identical brain requests into one generation
+        self.brain_single_flight = SingleFlight()
+
+        # Multi-host brain pool (only when configured; otherwise BRAIN_URL is used directly)
+        self.brain_pool = None
+        if BRAIN_POOL:
+            self.brain_pool = BrainPool.from_config(BRAIN_URL, BRAIN_POOL, probe_interval=BRAIN_POOL_PROBE_INTERVAL)
+            self.brain_pool.start_health_checks()
+            logger.info(f"Brain pool active with {len(self.brain_pool.endpoints)} host(s)")
+
+        # Model keep-warm: preload on wake word, idle re-pings, unload for gaming mode
+        self.model_warmer = ModelWarmer(
+            self._send_brain_keep_alive,
+            models=[FAST_LLM_MODEL, SMART_LLM_MODEL],
+            keep_alive=BRAIN_KEEP_ALIVE,
+            keep_warm_minutes=BRAIN_KEEP_WARM_MINUTES,
+            is_blocked=lambda: self.gaming_mode,
+        )
+        self.model_warmer.start()
+
+        # Background jobs: long handlers run off the main loop so Jarvis keeps listening
+        self.job_executor = None
+        if BACKGROUND_JOB_WORKERS > 0:
+            self.job_executor = JobExecutor(max_workers=BACKGROUND_JOB_WORKERS, on_event=self._on_job_event)
         
         # Initialize Dashboard Bridge
         self.dashboard = DashboardBridge()
@@ -673,6 +891,16 @@ class JarvisGT2:
         
         # Clean up resources
         self.cleanup_audio_resources()
+        if getattr(self, "job_executor", None):
+            self.job_executor.shutdown(wait=False)
+        if getattr(self, "memory_writer", None):
+            self.memory_writer.stop()
+        if getattr(self, "action_recall", None):
+            self.action_recall.close()
+        if getattr(self, "memory_index", None):
+            self.memory_index.close()
+        if getattr(self, "llm_telemetry", None):
+            self.llm_telemetry.flush(timeout=2)
         
         # Give threads time to finish
         time.sleep(0.5)
@@ -763,15 +991,41 @@ class JarvisGT2:
             return default_memory
     
     def save_memory(self, memory=None):
-        """Save persistent memory to jarvis_memory.json using indexed system."""
+        """Save persistent memory to jarvis_memory.json using indexed system.
+
+        Saves of self.memory are handed to the background writer, which
+        coalesces bursts into one atomic write; memory_writer.flush() forces
+        it out.
+        """
+        if memory is None:
+            memory = self.memory
+        writer = getattr(self, "memory_writer", None)
+        if writer is not None and memory is getattr(self, "memory", None):
+            writer.mark_dirty()
+            return
+        self._write_memory(memory)
+
+    def _write_memory(self, memory=None):
+        """Write memory to disk now (runs on the memory writer thread).
+
+        self.memory is deep-copied under memory_lock, so the write sees a
+        consistent state however other threads change it meanwhile.
+        """
         if memory is None:
             memory = self.memory
         try:
-            # Save through memory index (handles vault_actions automatically)
-            self.memory_index.save(memory)
+            lock = getattr(self, "memory_lock", None)
+            if lock is not None and memory is getattr(self, "memory", None):
+                with lock:
+                    memory = copy.deepcopy({k: v for k, v in memory.items() if k != "vault_actions"})
+            # Save through memory index (actions already live in its journal)
+            if self.memory_index.save(memory) is False:
+                return False
             logger.info("âœ“ Memory saved to disk")
+            return True
         except Exception as e:
             logger.error(f"Failed to save memory: {e}")
+            return False
     
     def _read_recent_health_logs(self, hours: int = 24, limit: int = 200):
         """Read recent health logs from disk for trend-aware responses."""
@@ -883,9 +1137,8 @@ class JarvisGT2:
                 json.dump(snapshot, snapshot_file, indent=2)
         except Exception as e:
             logger.error(f"Failed to write health log: {e}")        # Store in memory
-        if "health_logs" not in self.memory:
-            self.memory["health_logs"] = []
-        self.memory["health_logs"].append(health_record)
+        with self.memory_lock:
+            self.memory.setdefault("health_logs", []).append(health_record)
         self.save_memory()
         self.next_health_break_reminder_ts = time.time() + self.health_break_interval_secs
         
@@ -927,6 +1180,7 @@ class JarvisGT2:
                 self.log("   â†’ Mic disabled, resources freed")
                 logger.info("Gaming mode activated - stopping all listening and freeing resources")
                 self.is_listening = False
+                self._release_brain_models()
                 # Update dashboard
                 self.dashboard.push_state(mode="idle")
             else:
@@ -986,9 +1240,8 @@ class JarvisGT2:
                 logger.warning(f"File not found for reference: {reference_name}")
                 return None
             
-            # Read the file content
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            # Read the file content (served from the code index until the file changes)
+            content = self._code_index().read(file_path)
             
             logger.info(f"âœ“ Read file: {file_path} ({len(content)} bytes)")
             
@@ -1209,16 +1462,14 @@ class JarvisGT2:
                 logger.debug("Skipping vault action log: memory_index unavailable")
                 return
 
-            # Add to indexed memory system (no limits)
+            # Add to indexed memory system (no limits); appended to the
+            # action journal, so no full memory rewrite per action
             self.memory_index.add_action(
                 action_type=action_type,
                 description=description,
                 metadata=metadata
             )
             
-            # Save to disk
-            self.save_memory()
-            
             logger.info(f"Vault action logged: {action_type} - {description}")
             
         except Exception as e:
@@ -1290,18 +1541,10 @@ Format your response as:
 
 Keep it brief and actionable."""
             
-            response = requests.post(
-                BRAIN_URL,
-                json={
-                    "model": LLM_MODEL,
-                    "prompt": summary_prompt,
-                    "stream": False
-                },
-                timeout=60
+            summary = self._call_brain_model(
+                summary_prompt, LLM_MODEL, 60, call_site="handle_report_retrieval", tier="default"
             )
             
-            summary = response.json().get('response', 'Could not generate summary.')
-            
             # Display and speak the summary
             self.log("\nðŸ“Š SUMMARY:")
             self.log(summary)
@@ -1414,18 +1657,10 @@ Focus on important senders and key topics.
 
 Summary (concise, action-item focused):"""
             
-            response = requests.post(
-                BRAIN_URL,
-                json={
-                    "model": LLM_MODEL,
-                    "prompt": summary_prompt,
-                    "stream": False
-                },
-                timeout=60
+            summary = self._call_brain_model(
+                summary_prompt, LLM_MODEL, 60, call_site="handle_email_summary_request", tier="default"
             )
             
-            summary = response.json().get('response', 'Could not generate summary.')
-            
             # Display and speak the summary
             self.log("\nðŸ“§ EMAIL SUMMARY:")
             self.log(summary)
@@ -1463,52 +1698,165 @@ Summary (concise, action-item focused):"""
             self.log(f"âŒ Error summarizing emails: {e}")
             self.speak_with_piper("I encountered an error summarizing your emails.")
     
-    def _call_brain_model(self, prompt: str, model_name: str, timeout: float):
-        """Call a specific model on the configured brain endpoint."""
+    def _call_brain_model(self, prompt: str, model_name: str, timeout: float,
+                          call_site: str = None, tier: str = None,
+                          system: str = None, options: dict = None):
+        """Call a specific model on the configured brain endpoint.
+
+        Concurrent identical requests (same model, prompt and generation
+        options) share one in-flight generation.
+        """
+        body = {"model": model_name, "prompt": prompt, "stream": False}
+        if BRAIN_KEEP_ALIVE:
+            body["keep_alive"] = BRAIN_KEEP_ALIVE
+        if system:
+            body["system"] = system
+        if options:
+            body["options"] = options
+
+        def generate():
+            return self._post_brain_request(body, timeout, call_site, tier)
+
+        flights = getattr(self, "brain_single_flight", None)
+        if flights is None:
+            return generate()
+        try:
+            return flights.do(brain_request_key(model_name, prompt, system, options), generate, timeout=timeout)
+        except FlightTimeout as e:
+            # Same budget and same fallback as waiting on the brain directly
+            raise requests.exceptions.ReadTimeout(str(e)) from e
+
+    def _post_brain_request(self, body: dict, timeout: float, call_site: str = None, tier: str = None):
+        """Send one generate request (pool-routed when configured) and record its timing."""
         started_at = time.time()
-        resp = requests.post(
-            BRAIN_URL,
-            json={"model": model_name, "prompt": prompt, "stream": False},
-            timeout=timeout
-        )
+        model_name = body["model"]
+        pool = getattr(self, "brain_pool", None)
+        # Time this call's fan-out task sat waiting for a pool worker before we got here
+        local_queue_ms = pool.take_queue_ms() if pool is not None else 0.0
+        if pool is not None:
+            resp, endpoint = pool.post(body, timeout)
+            host = endpoint.base_url
+        else:
+            resp = requests.post(BRAIN_URL, json=body, timeout=timeout)
+            host = None
         resp.raise_for_status()
         elapsed_ms = int((time.time() - started_at) * 1000)
+        payload = resp.json()
         if hasattr(self, "dashboard") and self.dashboard:
             self.dashboard.set_last_ollama_response_time(elapsed_ms)
-        return resp.json().get("response", "Analysis could not be completed.")
+        warmer = getattr(self, "model_warmer", None)
+        if warmer is not None:
+            warmer.note_activity(model_name)
+        self._record_llm_telemetry(call_site, tier, model_name, payload, elapsed_ms, host, local_queue_ms)
+        return payload.get("response", "Analysis could not be completed.")
+
+    def _send_brain_keep_alive(self, model_name: str, keep_alive):
+        """Load (keep_alive > 0) or unload (keep_alive == 0) a model without generating."""
+        body = {"model": model_name, "keep_alive": keep_alive, "stream": False}
+        pool = getattr(self, "brain_pool", None)
+        if pool is None:
+            urls = [BRAIN_URL]
+        elif keep_alive == 0:
+            urls = [e.url for e in pool.candidates(model_name)]  # release it everywhere
+        else:
+            urls = [e.url for e in pool.candidates(model_name)[:1]]  # warm the host routing will pick
+        for url in urls:
+            requests.post(url, json=body, timeout=60).raise_for_status()
+        logger.debug(f"Brain keep_alive={keep_alive} sent for {model_name} to {len(urls)} host(s)")
+
+    def _preload_brain_for_wake(self):
+        """Start loading the model the next command will most likely need while the user speaks."""
+        warmer = getattr(self, "model_warmer", None)
+        if warmer is None:
+            return
+        warmer.note_wake()
+        smart_intents = {"search", "news", "optimization"}
+        model = SMART_LLM_MODEL if getattr(self, "last_intent", None) in smart_intents else FAST_LLM_MODEL
+        if warmer.preload(model):
+            logger.debug(f"Wake word: preloading {model}")
+
+    def _release_brain_models(self):
+        """Free brain GPU memory (gaming mode)."""
+        warmer = getattr(self, "model_warmer", None)
+        if warmer is not None:
+            warmer.unload()
+
+    def _record_llm_telemetry(self, call_site, tier, model_name, payload, elapsed_ms, host=None, local_queue_ms=0.0):
+        """Capture Ollama's prefill/decode counters for this call and surface them."""
+        telemetry = getattr(self, "llm_telemetry", None)
+        if telemetry is None or not isinstance(payload, dict):
+            return
+        try:
+            sample = telemetry.record(call_site, tier, model_name, payload, elapsed_ms,
+                                      local_queue_ms=local_queue_ms, host=host)
+            logger.debug(
+                f"LLM {sample['call_site']}/{sample['tier']} {model_name}: "
+                f"prefill {sample['prompt_tokens']} tok in {sample['prefill_ms']}ms, "
+                f"decode {sample['output_tokens']} tok @ {sample['decode_tps']} tok/s, "
+                f"queue {sample['queue_ms']}ms"
+            )
+            if hasattr(self, "dashboard") and self.dashboard:
+                self.dashboard.set_llm_telemetry(sample)
+                snapshot = telemetry.snapshot()
+                flights = getattr(self, "brain_single_flight", None)
+                if flights is not None:
+                    snapshot["single_flight"] = flights.stats()
+                self.dashboard.push_llm_telemetry(snapshot)
+        except Exception as e:
+            logger.debug(f"LLM telemetry skipped: {e}")
 
-    def call_smart_model(self, prompt, timeout=120, tier=None):
+    def call_smart_model(self, prompt, timeout=120, tier=None, call_site=None, for_speech=False,
+                         return_model=False):
         """
         Tiered brain call:
         - fast tier: FAST_LLM_MODEL
         - smart tier: SMART_LLM_MODEL with timeout-based downgrade to FAST_LLM_MODEL
+        call_site tags telemetry; defaults to the calling method's name.
+        for_speech marks replies that are spoken, so concise mode can shape them at generation time.
+        return_model returns (answer, model that answered) instead; the model is None on errors.
         """
-        selected_tier = (tier or getattr(self, "current_llm_tier", "smart") or "smart").lower()
+        job = JobExecutor.current()
+        job_tier = job.context.get("tier") if job is not None else None
+        selected_tier = (tier or job_tier or getattr(self, "current_llm_tier", "smart") or "smart").lower()
+        call_site = call_site or sys._getframe(1).f_code.co_name
         smart_timeout = min(float(timeout), float(SMART_LLM_TIMEOUT))
         smart_like = {"smart", "web_search", "news_search", "code_optimize"}
         fast_like = {"fast", "general_chat", "task_add"}
+        generation = self._concise_generation_params() if for_speech else {}
 
+        model = None
         try:
             if selected_tier in fast_like:
                 logger.info(f"Calling fast-tier model ({FAST_LLM_MODEL})...")
-                return self._call_brain_model(prompt, FAST_LLM_MODEL, timeout)
-
-            # Default to smart path.
-            logger.info(f"Calling smart-tier model ({SMART_LLM_MODEL})...")
-            try:
-                return self._call_brain_model(prompt, SMART_LLM_MODEL, smart_timeout)
-            except requests.exceptions.Timeout:
-                logger.warning("Note: Using fast-tier fallback for speed.")
-                self.log("Note: Using fast-tier fallback for speed.")
-                fallback_timeout = max(3.0, float(timeout) - float(smart_timeout))
-                logger.info(f"Downgrading to fast-tier model ({FAST_LLM_MODEL})...")
-                return self._call_brain_model(prompt, FAST_LLM_MODEL, fallback_timeout)
+                answer = self._call_brain_model(prompt, FAST_LLM_MODEL, timeout, call_site, "fast", **generation)
+                model = FAST_LLM_MODEL
+            else:
+                # Default to smart path.
+                logger.info(f"Calling smart-tier model ({SMART_LLM_MODEL})...")
+                try:
+                    answer = self._call_brain_model(prompt, SMART_LLM_MODEL, smart_timeout, call_site, "smart", **generation)
+                    model = SMART_LLM_MODEL
+                except requests.exceptions.Timeout:
+                    logger.warning("Note: Using fast-tier fallback for speed.")
+                    self.log("Note: Using fast-tier fallback for speed.")
+                    fallback_timeout = max(3.0, float(timeout) - float(smart_timeout))
+                    logger.info(f"Downgrading to fast-tier model ({FAST_LLM_MODEL})...")
+                    answer = self._call_brain_model(
+                        prompt, FAST_LLM_MODEL, fallback_timeout, call_site, "fast_fallback", **generation
+                    )
+                    model = FAST_LLM_MODEL
         except requests.exceptions.RequestException as e:
             logger.error(f"call_smart_model failed to connect to BRAIN_URL: {e}")
-            return f"Error: I was unable to connect to my AI brain at {BRAIN_URL}."
+            answer = f"Error: I was unable to connect to my AI brain at {BRAIN_URL}."
+            return (answer, None) if return_model else answer
         except Exception as e:
             logger.error(f"call_smart_model encountered an unexpected error: {e}", exc_info=True)
-            return "An unexpected error occurred while I was thinking."
+            answer = "An unexpected error occurred while I was thinking."
+            return (answer, None) if return_model else answer
+
+        if generation:
+            answer = self._remember_concise_output(answer)
+        return (answer, model) if return_model else answer
 
     def handle_email_search_request(self, user_request):
         """
@@ -1720,6 +2068,22 @@ Summary (concise, action-item focused):"""
             self.log(f"âŒ Reply failed: {e}")
             self.speak_with_piper("I encountered an error sending your reply.")
     
+    def _lookup_short_key(self, alias: str):
+        """Session item for a short alias ("wr3"), or a ledger entry for a full key ("20260214-wr3")."""
+        item = self.session_context.get_item(alias)
+        if item or not FULL_KEY_PATTERN.fullmatch(alias):
+            return item
+        lookup = getattr(getattr(self, "memory_index", None), "get_by_short_key", None)
+        action = lookup(alias) if lookup else None
+        if not action:
+            return None
+        return {
+            'full_key': alias,
+            'label': action.get('metadata', {}).get('title') or action.get('description', alias),
+            'type': action.get('action_type'),
+            'metadata': action.get('metadata', {})
+        }
+
     def _handle_contextual_command(self, raw_text: str) -> bool:
         """
         Contextual Resolver: Handles commands targeting a short-key (e.g., "open wr1").
@@ -1727,12 +2091,13 @@ Summary (concise, action-item focused):"""
         """
         text = raw_text.lower().strip()
         text = re.sub(r'[.!?]+$', '', text)
-        text = re.sub(r'\be[\s-]?mail\b', 'email', text)
-        if not hasattr(self, "session_context") or self.session_context is None:
-            return False
+        text = re.sub(r'\be[\s-]?mail\b', 'email', text)
+        text = expand_dated_aliases(text)  # "yesterday's c1" -> "20260213-c1"
+        if not hasattr(self, "session_context") or self.session_context is None:
+            return False
 
-        def _get_item(alias: str):
-            return self.session_context.get_item(alias.lower()) if alias else None
+        def _get_item(alias: str):
+            return self._lookup_short_key(alias.lower()) if alias else None
 
         def _present_item(alias: str, open_web: bool = False) -> bool:
             item = _get_item(alias)
@@ -1798,6 +2163,21 @@ Summary (concise, action-item focused):"""
                     self.speak_with_piper(f"Showing {alias}.")
                 return True
 
+            if item_type == 'j':
+                job = self.job_executor.get(alias) if getattr(self, "job_executor", None) else None
+                status = job.status if job else meta.get('status', 'unknown')
+                lines = [f"Job: {label}", f"Status: {status}"]
+                if job and job.progress:
+                    lines.append(f"Progress: {job.progress}")
+                if job and job.status in ("done", "failed"):
+                    lines.append(f"\n{job.outcome}")
+                self.dashboard.push_focus("docs", f"[{alias}] {label}", "\n".join(lines))
+                if job and job.status in ("queued", "running"):
+                    self.speak_with_piper(f"{alias} is still running, {int(job.elapsed)} seconds so far.")
+                else:
+                    self.speak_with_piper(f"{alias} is {status}.")
+                return True
+
             self.speak_with_piper(f"I couldn't display {alias}.")
             return True
 
@@ -1841,6 +2221,11 @@ Summary (concise, action-item focused):"""
             phrase = re.sub(r'[.!?]+$', '', phrase)
             phrase = re.sub(r'\be[\s-]?mail\b', 'email', phrase)
 
+            # Full ledger keys ("20260214-wr3") resolve through the memory index.
+            full = FULL_KEY_PATTERN.search(phrase)
+            if full:
+                return full.group(1)
+
             # Direct short-key support remains first-class.
             direct = re.search(r"\b([a-z]+\d+)\b", phrase)
             if direct:
@@ -1989,8 +2374,8 @@ Summary (concise, action-item focused):"""
             alias = _resolve_alias_from_phrase(m.group(1)) or m.group(1).lower()
             return _present_item(alias, open_web=False)
 
-        # Direct alias utterance: "c1" / "wr2" / "e1" / "n1"
-        m = re.fullmatch(r'\s*([a-z]+\d+)\s*', text)
+        # Direct alias utterance: "c1" / "wr2" / "e1" / "n1" / "20260214-wr3"
+        m = re.fullmatch(r'\s*((?:\d{8}-)?[a-z]+\d+)\s*', text)
         if m:
             alias = m.group(1).lower()
             item = _get_item(alias)
@@ -2123,6 +2508,28 @@ Summary (concise, action-item focused):"""
                 f"{idx}. {title}\nSource: {source}\nSnippet: {summary_snippet}\nURL: {url or 'N/A'}"
             )
 
+        self._job_progress(f"summarising {len(card_items)} results")
+        summary_prompt = (
+            "You are assisting Spencer (the Master). "
+            "Do NOT read each headline one-by-one. "
+            "Synthesize patterns across results and surface decision-useful insight. "
+            "Provide exactly 3 bullets with this structure:\n"
+            "- Trend: the strongest cross-source trend\n"
+            "- What changed: notable shift/new development\n"
+            "- What to watch next: practical next step or risk\n\n"
+            f"Search query: {query}\n\n"
+            "Results:\n"
+            f"{chr(10).join(summary_seed)}\n\n"
+            "Return only the 3 bullets. Keep each bullet under 24 words."
+        )
+        # With several brain hosts, the spoken summary runs on one while cards are enriched on another.
+        summary_future = None
+        pool = getattr(self, "brain_pool", None)
+        if pool is not None and pool.parallelism() > 1:
+            summary_future = pool.submit(
+                self.call_smart_model, summary_prompt, timeout=90, call_site="handle_web_search", for_speech=True
+            )
+
         # Enrich cards with a compact, non-generic "why it matters" line per result.
         why_map = {}
         try:
@@ -2165,20 +2572,10 @@ Summary (concise, action-item focused):"""
         self.dashboard.update_ticker(self.session_context.get_all_items_for_ticker())
         count = len(cards)
 
-        summary_prompt = (
-            "You are assisting Spencer (the Master). "
-            "Do NOT read each headline one-by-one. "
-            "Synthesize patterns across results and surface decision-useful insight. "
-            "Provide exactly 3 bullets with this structure:\n"
-            "- Trend: the strongest cross-source trend\n"
-            "- What changed: notable shift/new development\n"
-            "- What to watch next: practical next step or risk\n\n"
-            f"Search query: {query}\n\n"
-            "Results:\n"
-            f"{chr(10).join(summary_seed)}\n\n"
-            "Return only the 3 bullets. Keep each bullet under 24 words."
-        )
-        spoken_summary = self.call_smart_model(summary_prompt, timeout=90)
+        if summary_future is not None:
+            spoken_summary = summary_future.result()
+        else:
+            spoken_summary = self.call_smart_model(summary_prompt, timeout=90, for_speech=True)
         self.speak(spoken_summary)
         self.last_intent = "search"
 
@@ -2250,7 +2647,7 @@ Summary (concise, action-item focused):"""
                 "Then: list the top 3 headlines by name as bullets.\n\n"
                 f"Headlines:\n{chr(10).join(summary_seed)}"
             )
-            briefing = self.call_smart_model(briefing_prompt, timeout=90)
+            briefing = self.call_smart_model(briefing_prompt, timeout=90, for_speech=True)
             self.speak(briefing)
             self.last_intent = "news"
 
@@ -2317,7 +2714,9 @@ Summary (concise, action-item focused):"""
 
     def handle_deep_dig(self, alias: str) -> bool:
         """Analyze a web result referenced by short key (wr*), then store as d*."""
-        item = self.session_context.get_item(alias)
+        if self._run_as_job(f"dig deeper into {alias}", self.handle_deep_dig, alias):
+            return True
+        item = self._lookup_short_key(alias)
         if not item or item.get('type') != 'w':
             self.speak_with_piper(f"I couldn't find {alias} in this session.")
             return True
@@ -2339,6 +2738,7 @@ Summary (concise, action-item focused):"""
                 soup = BeautifulSoup(resp.text, "html.parser")
                 extracted = " ".join(soup.stripped_strings)[:8000]
 
+            self._job_progress("summarising page")
             prompt = (
                 "Summarize the following page content in concise action-oriented bullet points:\n\n"
                 f"Title: {title}\nURL: {url}\n\n{extracted}"
@@ -2372,18 +2772,20 @@ Summary (concise, action-item focused):"""
             self.speak_with_piper("I had trouble analyzing that result.")
             return True
 
+    def _code_index(self):
+        """Shared AST/text cache for source files (built on first use)."""
+        index = getattr(self, "code_index", None)
+        if index is None:
+            index = CodeIndex()
+            self.code_index = index
+        return index
+
     def _method_line_map(self):
         """Return a map of method name -> line number in jarvis_main.py."""
-        line_map = {}
         try:
-            with open(__file__, "r", encoding="utf-8", errors="ignore") as f:
-                for i, line in enumerate(f, 1):
-                    m = re.match(r"^\s*def\s+([a-zA-Z_]\w*)\s*\(", line)
-                    if m:
-                        line_map[m.group(1)] = i
+            return self._code_index().line_map(__file__)
         except Exception:
-            pass
-        return line_map
+            return {}
 
     @staticmethod
     def _line_numbered_excerpt(content: str, max_lines: int = 350):
@@ -2493,12 +2895,12 @@ Summary (concise, action-item focused):"""
                 self.speak_with_piper("I couldn't resolve both files for comparison.")
                 return
 
-            with open(main_path, "r", encoding="utf-8", errors="ignore") as f:
-                main_content = f.read()
-            with open(spec_path, "r", encoding="utf-8", errors="ignore") as f:
-                spec_content = f.read()
+            index = self._code_index()
+            main_content = index.read(main_path)
+            spec_content = index.read(spec_path)
 
             report = self._build_capability_gap_report(main_path, spec_path, main_content, spec_content)
+            self._job_progress("writing comparison documents")
 
             docs_dir = os.path.join(base_dir, "docs")
             os.makedirs(docs_dir, exist_ok=True)
@@ -2552,6 +2954,23 @@ Summary (concise, action-item focused):"""
             logger.error(f"Comparison request failed: {e}", exc_info=True)
             self.speak_with_piper("I had trouble creating the comparison report.")
 
+    def _get_code_analyzer(self):
+        """Chunked map-reduce analyzer for optimization requests (built on first use)."""
+        analyzer = getattr(self, "code_analyzer", None)
+        if analyzer is None:
+            pool = getattr(self, "brain_pool", None)
+            analyzer = ChunkedCodeAnalyzer(
+                lambda prompt, timeout: self.call_smart_model(
+                    prompt, timeout=timeout, call_site="handle_optimization_request", return_model=True
+                ),
+                map_fn=pool.map if pool is not None else None,
+                cache_dir=CODE_ANALYSIS_CACHE_DIR,
+                max_chunk_chars=CODE_ANALYSIS_CHUNK_CHARS,
+                cache_salt=SMART_LLM_MODEL,
+            )
+            self.code_analyzer = analyzer
+        return analyzer
+
     def handle_optimization_request(self, user_request):
         """
         Multi-step intent handler for code analysis and documentation workflow.
@@ -2619,9 +3038,7 @@ Summary (concise, action-item focused):"""
             self.log("ðŸ§  Sending to AI brain for analysis...")
             self.speak_with_piper("Analyzing the code for optimization opportunities.")
             
-            optimization_prompt = f"""You are an expert code reviewer analysing a specific codebase.
-
-ARCHITECTURE (read carefully before analysing):
+            analysis_context = """ARCHITECTURE (read carefully before analysing):
 - This is a headless Python voice assistant â€” no GUI, no web framework serving users.
 - NO SQL database, no SQLAlchemy, no db_session, no User/Conversation ORM models.
 - Conversation state is held in self.context_buffer (a Python list already in RAM).
@@ -2629,28 +3046,22 @@ ARCHITECTURE (read carefully before analysing):
 - Flask runs in a single daemon background thread solely to receive n8n webhooks on port 5001.
 - Background tasks use threading.Thread(daemon=True) â€” no thread pool is needed or appropriate.
 - There is nothing to cache â€” all runtime state is already in memory.
-DO NOT suggest: databases, SQLAlchemy, ThreadPoolExecutor for Flask.run(), or caching layers.
-
-FILE TO ANALYSE: {filename}
+DO NOT suggest: databases, SQLAlchemy, ThreadPoolExecutor for Flask.run(), or caching layers."""
 
-CODE:
-{file_content}
-
-Identify the THREE most important real improvements specific to THIS codebase. For each:
-1. Issue: Describe the actual problem found in this file
-2. Impact: What concrete benefit would this provide?
-3. Suggestion: Show a specific code change (not a generic pattern)
-
-Plain text only â€” no markdown, no bullet symbols, no code fences."""
-            
-            # Send to brain (Ollama)
+            # Send to brain (Ollama): chunked map-reduce for large files, cached by content hash
+            self._job_progress(f"analysing {filename}")
             self.status_var.set("Status: ðŸ§  AI Analysis in Progress...")
-            optimization_analysis = self.call_smart_model(optimization_prompt, timeout=120)
+            optimization_analysis = self._get_code_analyzer().analyze(filename, file_content, context=analysis_context)
+            if optimization_analysis.startswith(("Error:", "An unexpected error")):
+                self.log(f"âŒ Analysis failed: {optimization_analysis}")
+                self.speak_with_piper(optimization_analysis)
+                return
             self.log("âœ“ Analysis complete")
             
             # Step 4: Create Google Doc with the analysis (Scribe Workflow)
             self.log("ðŸ“ Creating Google Doc...")
             self.speak_with_piper("Creating your optimization report document.")
+            self._job_progress("creating report document")
             
             # Use write_optimization_to_doc() for clean Scribe workflow
             doc_result = self.write_optimization_to_doc(
@@ -2768,55 +3179,137 @@ Plain text only â€” no markdown, no bullet symbols, no code fences."""
         Returns:
             (intent_name, intent_cfg, handler_callable) or (None, None, None)
         """
-        text = raw_text.lower().strip()
         best = (None, None, None)
         best_score = 0
 
-        for intent_name, cfg in INTENTS.items():
-            handler_name = cfg.get("handler")
-            handler = getattr(self, handler_name, None)
+        # Handlers are looked up only for intents that would beat the current best,
+        # so instance-level overrides (tests, harnesses) are still honoured.
+        for intent_name, score in INTENT_MATCHER.scores(raw_text):
+            if score <= best_score:
+                continue
+            cfg = INTENTS[intent_name]
+            handler = getattr(self, cfg.get("handler"), None)
             if not callable(handler):
                 continue
+            best_score = score
+            best = (intent_name, cfg, handler)
 
-            blockers = cfg.get("blockers", [])
-            if any(b in text for b in blockers):
-                continue
+        return best
 
-            score = 0
-            trigger_score = 0
-
-            for pat in cfg.get("patterns", []):
-                if re.search(pat, text, re.IGNORECASE):
-                    score += 3
-                    trigger_score += 3
-
-            regex = cfg.get("regex")
-            if regex and re.search(regex, text, re.IGNORECASE):
-                score += 3
-                trigger_score += 3
-
-            keyword_hits = sum(1 for kw in cfg.get("keywords", []) if kw in text)
-            score += keyword_hits
-            trigger_score += keyword_hits
-
-            required = cfg.get("required", [])
-            if required:
-                req_hits = sum(1 for req in required if req in text)
-                # "required" is a qualifier and must not match by itself.
-                # The intent must first match a real trigger (keyword/pattern/regex).
-                if trigger_score == 0 or req_hits == 0:
-                    continue
-                score += req_hits * 2
+    def _classify_intent(self, raw_text):
+        """Second-stage match by embedding similarity to INTENT_EXAMPLES.
 
-            # Intents without "required" still need at least one trigger to avoid weak matches.
-            if trigger_score == 0:
-                continue
+        Returns:
+            (intent_name, intent_cfg, handler_callable) or (None, None, None)
+        """
+        classifier = getattr(self, "intent_classifier", None)
+        if classifier is None or not classifier.ready:
+            return (None, None, None)
+        try:
+            intent_name, similarity = classifier.classify(raw_text)
+        except Exception as e:
+            logger.debug(f"Intent classifier failed: {e}")
+            return (None, None, None)
+        if not intent_name:
+            return (None, None, None)
+        cfg = INTENTS.get(intent_name, {})
+        handler = getattr(self, cfg.get("handler", ""), None)
+        if not callable(handler):
+            return (None, None, None)
+        logger.debug(f"Embedding intent match: {intent_name} ({similarity:.2f})")
+        return (intent_name, cfg, handler)
+
+    def _run_as_job(self, label, fn, *args):
+        """Run fn(*args) on the background job executor.
+
+        Returns False when the caller should run it inline: no executor (tests,
+        harnesses, background_job_workers=0) or already inside a job.
+        """
+        executor = getattr(self, "job_executor", None)
+        if executor is None or JobExecutor.current() is not None:
+            return False
+        job = executor.submit(label, self._run_job_handler, fn, *args,
+                              context={"tier": getattr(self, "current_llm_tier", "smart")})
+        self.speak_with_piper(f"On it. I'll {label} in the background as {job.short_key}.")
+        return True
 
-            if score > best_score:
-                best_score = score
-                best = (intent_name, cfg, handler)
+    def _run_job_handler(self, fn, *args):
+        """Job body: fn's SessionContext changes are held back until its outcome is spoken."""
+        job = JobExecutor.current()
+        session_context = getattr(self, "session_context", None)
+        if session_context is None:
+            return fn(*args)
+        with session_context.deferred() as changes:
+            try:
+                return fn(*args)
+            finally:
+                job.context["session_changes"] = changes
+
+    @property
+    def last_intent(self):
+        return getattr(self, "_last_intent", None)
+
+    @last_intent.setter
+    def last_intent(self, value):
+        # A background job's intent only takes over once its result is heard
+        job = JobExecutor.current()
+        if job is not None:
+            job.context["last_intent"] = value
+            return
+        self._last_intent = value
+
+    def _apply_job_results(self, job):
+        """Make a finished job's aliases and intent live (called as its first message is spoken)."""
+        changes = job.context.pop("session_changes", None)
+        session_context = getattr(self, "session_context", None)
+        if changes and session_context is not None:
+            status_item = session_context.get_item(job.short_key)
+            if status_item is not None:
+                changes = changes + [(job.short_key, status_item)]  # keep the job itself on the ticker
+            session_context.apply(changes)
+            if getattr(self, "dashboard", None):
+                self.dashboard.update_ticker(session_context.get_all_items_for_ticker())
+        if "last_intent" in job.context:
+            self.last_intent = job.context.pop("last_intent")
+
+    def _job_progress(self, message):
+        """Report progress for the background job running this code (no-op inline)."""
+        executor = getattr(self, "job_executor", None)
+        if executor is not None:
+            executor.progress(message)
+
+    def _on_job_event(self, job, event):
+        """Mirror job state into SessionContext and the dashboard; queue the outcome when finished."""
+        finished = event in ("done", "failed")
+        if getattr(self, "session_context", None) is not None:
+            self.session_context.add_item(
+                full_key=f"{datetime.now().strftime('%Y%m%d')}-{job.short_key}",
+                label=job.label[:1].upper() + job.label[1:],
+                item_type="j",
+                metadata={"status": job.status, "progress": job.progress, "outcome": job.outcome if finished else ""},
+                defer=False,
+            )
+            if event != "progress" and getattr(self, "dashboard", None):
+                self.dashboard.update_ticker(self.session_context.get_all_items_for_ticker())
 
-        return best
+        detail = f" - {job.progress}" if event == "progress" else ""
+        if finished:
+            detail = f" after {job.elapsed:.0f}s"
+        self.log(f"[{job.short_key}] {job.label}: {event}{detail}")
+
+        if finished:
+            # One notification: the queue speaks an item per tick, so separate items would
+            # leave "Searching for..." on its own and the result a tick or more behind it
+            messages = list(job.messages) if job.status == "done" else job.messages + [job.outcome]
+            with self.queue_lock:
+                self.notification_queue.append({
+                    "source": "Job",
+                    "message": " ".join(messages or [job.outcome]),
+                    "timestamp": datetime.now().isoformat(),
+                    "metadata": {"job": job.short_key, "status": job.status},
+                    "priority": "ROUTINE",
+                    "on_spoken": lambda: self._apply_job_results(job),
+                })
 
     def _dispatch_intent(self, intent_name, intent_cfg, handler, raw_text):
         """Dispatch the matched intent handler with tier-aware model routing."""
@@ -2832,6 +3325,12 @@ Plain text only â€” no markdown, no bullet symbols, no code fences."""
         ):
             self.current_llm_tier = "task_add"
 
+        if intent_upper in BACKGROUND_INTENTS:
+            label = INTENTS.get(intent_upper, {}).get("name", intent_upper.lower())
+            if self._run_as_job(label, handler, raw_text):
+                self.current_llm_tier = previous_tier
+                return
+
         # Handlers with no user_request parameter.
         noarg_handlers = {"handle_email_summary_request"}
         try:
@@ -2848,9 +3347,15 @@ Plain text only â€” no markdown, no bullet symbols, no code fences."""
             self.context_buffer = []
         self.context_buffer.append({"role": role, "message": message})
         logger.debug(f"Context buffer size: {len(self.context_buffer)}")
+        summarizer = getattr(self, "conversation_summarizer", None)
+        if summarizer is not None:
+            summarizer.add(role, message)
     
     def get_context_history(self):
-        """Get formatted context history for LLM."""
+        """Get formatted context history for LLM (rolling summary + last 2 turns when available)."""
+        summarizer = getattr(self, "conversation_summarizer", None)
+        if summarizer is not None:
+            return summarizer.render()
         context_buffer = getattr(self, "context_buffer", [])
         if not context_buffer:
             return ""
@@ -2859,6 +3364,18 @@ Plain text only â€” no markdown, no bullet symbols, no code fences."""
             history += f"  {exchange['role']}: {exchange['message'][:100]}...\n"
         return history
     
+    def _select_memory_facts(self, raw_text):
+        """Return only the facts relevant to this utterance, bounded by FACT_TOKEN_BUDGET."""
+        facts = [f for f in self.memory.get("facts", []) if isinstance(f, str) and f.strip()]
+        retriever = getattr(self, "fact_retriever", None)
+        if retriever is None:
+            return facts
+        try:
+            return retriever.select(raw_text, facts)
+        except Exception as e:
+            logger.debug(f"Fact retrieval fallback used: {e}")
+            return facts[:FACT_TOP_K]
+
     def fallback_to_llm(self, raw_text, context=""):
         """Fallback to the general-purpose LLM brain for unhandled queries."""
         if self.gaming_mode:
@@ -2867,7 +3384,7 @@ Plain text only â€” no markdown, no bullet symbols, no code fences."""
             return
 
         context_history = self.get_context_history()
-        memory_facts = "\n".join(self.memory.get("facts", []))
+        memory_facts = "\n".join(self._select_memory_facts(raw_text))
 
         # Extract profile data for tone/context.
         master_profile = self.memory.get("master_profile", {})
@@ -2944,7 +3461,7 @@ RESPONSE GUIDELINES:
         self.status_var.set("Status: Thinking...")
         try:
             logger.debug(f"Sending general chat request to fast-tier LLM via {BRAIN_URL}")
-            answer = self.call_smart_model(prompt, timeout=45, tier="general_chat")
+            answer = self.call_smart_model(prompt, timeout=45, tier="general_chat", for_speech=True)
             self.log(f"Jarvis: {answer}")
             self.speak_with_piper(answer)
 
@@ -3086,6 +3603,7 @@ RESPONSE GUIDELINES:
             query_lower = query.lower()
             results = {}
             files_searched = 0
+            index = self._code_index()
             
             for project in self.available_projects:
                 project_path = os.path.join(self.vault_root, project)
@@ -3103,14 +3621,11 @@ RESPONSE GUIDELINES:
                         file_path = os.path.join(root, file)
                         
                         try:
-                            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read()
-                                if query_lower in content.lower():
-                                    # Store match with line number
-                                    rel_file = os.path.relpath(file_path, project_path)
-                                    if project not in results:
-                                        results[project] = []
-                                    results[project].append(rel_file)
+                            if index.contains(file_path, query_lower):
+                                rel_file = os.path.relpath(file_path, project_path)
+                                if project not in results:
+                                    results[project] = []
+                                results[project].append(rel_file)
                         except:
                             pass
             
@@ -3500,6 +4015,9 @@ RESPONSE GUIDELINES:
                 return
             item = self.notification_queue.pop(0)
 
+        on_spoken = item.get("on_spoken")
+        if on_spoken is not None:
+            on_spoken()  # e.g. a background job's result aliases, live as the user hears it
         message = item.get("message", "")
         if not message:
             return
@@ -3528,6 +4046,7 @@ RESPONSE GUIDELINES:
             # Stop listening and clean up resources
             self.is_listening = False
             self.cleanup_audio_resources()
+            self._release_brain_models()
             
             # Update dashboard: idle when gaming mode enabled
             if hasattr(self, 'dashboard'):
@@ -4409,29 +4928,72 @@ RESPONSE GUIDELINES:
             return " ".join(words)
         return " ".join(words[:max_words]).rstrip(".,;:!?") + "."
 
+    @staticmethod
+    def _limit_sentences(text: str, max_sentences: int) -> str:
+        parts = [p.strip() for p in re.split(r"(?<=[.!?])\s+|\n+", str(text)) if p.strip()]
+        return " ".join(parts[:max_sentences])
+
+    def _concise_generation_params(self) -> dict:
+        """Brain call overrides that make a spoken reply concise at source."""
+        if getattr(self, "ui_mode", "normal") != "concise":
+            return {}
+        return {
+            "system": (
+                f"You are speaking to someone in severe pain. Reply in at most {CONCISE_MAX_SENTENCES} short "
+                f"sentences and {CONCISE_MAX_WORDS} words. No markdown, no lists, no preamble."
+            ),
+            "options": {"num_predict": CONCISE_NUM_PREDICT},
+        }
+
+    def _remember_concise_output(self, answer: str) -> str:
+        """Trim a concise-mode reply to the sentence limit and mark it as already concise."""
+        shaped = " ".join(self._limit_sentences(answer, CONCISE_MAX_SENTENCES).split()) or str(answer)
+        if not hasattr(self, "_concise_llm_outputs"):
+            self._concise_llm_outputs = collections.deque(maxlen=16)
+        self._concise_llm_outputs.append(shaped)
+        return shaped
+
     def _apply_concise_mode_text(self, text: str) -> str:
-        """When concise mode is active, rewrite speech to <=15 words via fast-tier LLM."""
+        """When concise mode is active, rewrite speech to <=15 words via fast-tier LLM.
+
+        LLM replies generated in concise mode pass through untouched; rewrites of
+        other text are cached so repeated phrases cost one brain call.
+        """
         if getattr(self, "ui_mode", "normal") != "concise":
             return text
         if not text:
             return text
 
         normalized = " ".join(str(text).split())
-        if len(normalized.split()) <= 15:
+        if len(normalized.split()) <= CONCISE_MAX_WORDS:
             return normalized
+        if normalized in getattr(self, "_concise_llm_outputs", ()):
+            return normalized
+
+        if not hasattr(self, "_concise_rewrite_cache"):
+            self._concise_rewrite_cache = collections.OrderedDict()
+        cached = self._concise_rewrite_cache.get(normalized)
+        if cached is not None:
+            self._concise_rewrite_cache.move_to_end(normalized)
+            return cached
 
         prompt = (
-            "Rewrite this for voice output in 15 words or fewer. "
+            f"Rewrite this for voice output in {CONCISE_MAX_WORDS} words or fewer. "
             "Keep core meaning, no markdown, no preamble.\n\n"
             f"Text: {normalized}\n\n"
             "Result:"
         )
         try:
             concise = self.call_smart_model(prompt, timeout=8, tier="fast")
-            concise = " ".join(str(concise).split())
-            return self._truncate_to_words(concise, 15)
+            concise = self._truncate_to_words(" ".join(str(concise).split()), CONCISE_MAX_WORDS)
         except Exception:
-            return self._truncate_to_words(normalized, 15)
+            return self._truncate_to_words(normalized, CONCISE_MAX_WORDS)
+        if concise.startswith("Error:"):
+            return concise
+        self._concise_rewrite_cache[normalized] = concise
+        if len(self._concise_rewrite_cache) > CONCISE_REWRITE_CACHE_SIZE:
+            self._concise_rewrite_cache.popitem(last=False)
+        return concise
 
     def speak(self, text):
         """Canonical speech entrypoint for assistant voice output."""
@@ -4442,6 +5004,12 @@ RESPONSE GUIDELINES:
         """Use Piper TTS to speak longer responses (with barge-in support).
         Uses a lock to prevent concurrent audio playback (speaking over self).
         """
+        job = JobExecutor.current()
+        if job is not None:
+            # Background jobs do not talk over the user; the outcome is queued on completion.
+            job.messages.append(text)
+            return
+
         with self.speak_lock:  # Serialize all speech generation
             # Log happens in process_conversation to avoid duplicate entries
             
@@ -4591,7 +5159,13 @@ RESPONSE GUIDELINES:
             self._dispatch_intent(intent_name, intent_cfg, handler, raw_text)
             return
 
-        # 5) Fallback to general LLM conversation.
+        # 5) Embedding classifier: confident paraphrases skip the LLM detour.
+        intent_name, intent_cfg, handler = self._classify_intent(raw_text)
+        if intent_name and handler:
+            self._dispatch_intent(intent_name, intent_cfg, handler, raw_text)
+            return
+
+        # 6) Fallback to general LLM conversation.
         self.fallback_to_llm(raw_text)
 
     def cleanup_audio_resources(self):
@@ -4748,6 +5322,7 @@ RESPONSE GUIDELINES:
                         logger.info(f"Wake word detected (index: {keyword_index}) after {detection_attempts} frames")
                         detection_attempts = 0
                         self._start_command_capture()
+                        self._preload_brain_for_wake()
                         if self.is_speaking:
                             self.interrupt_requested = True
                             logger.info("Wake word: interrupting active speech to prioritize command capture")
@@ -5050,8 +5625,9 @@ RESPONSE GUIDELINES:
             'done': False,
             'reminded': False
         }
-        self.tasks.append(task)
-        self.memory['tasks'] = self.tasks
+        with self.memory_lock:
+            self.tasks.append(task)
+            self.memory['tasks'] = self.tasks
         self.save_memory()
         self.log_vault_action(
             'task_created',
@@ -5089,8 +5665,9 @@ RESPONSE GUIDELINES:
         if m:
             idx = int(m.group(1)) - 1
             if 0 <= idx < len(active):
-                active[idx]['done'] = True
-                self.memory['tasks'] = self.tasks
+                with self.memory_lock:
+                    active[idx]['done'] = True
+                    self.memory['tasks'] = self.tasks
                 self.save_memory()
                 self.log_vault_action(
                     'task_completed',
@@ -5101,8 +5678,9 @@ RESPONSE GUIDELINES:
         for task in active:
             words = [w for w in q_lower.split() if len(w) > 3]
             if words and any(w in task['description'].lower() for w in words):
-                task['done'] = True
-                self.memory['tasks'] = self.tasks
+                with self.memory_lock:
+                    task['done'] = True
+                    self.memory['tasks'] = self.tasks
                 self.save_memory()
                 self.log_vault_action(
                     'task_completed', f"Completed: {task['description']}")
@@ -5115,16 +5693,17 @@ RESPONSE GUIDELINES:
         while True:
             try:
                 now = datetime.now()
-                for task in self.tasks:
+                for task in list(self.tasks):
                     if task.get('done') or task.get('reminded') or not task.get('remind_at'):
                         continue
                     try:
                         remind_dt = datetime.fromisoformat(task['remind_at'])
                         seconds_until = (remind_dt - now).total_seconds()
                         if 0 <= seconds_until < 60:
-                            task['reminded'] = True
-                            task['remind_at'] = None
-                            self.memory['tasks'] = self.tasks
+                            with self.memory_lock:
+                                task['reminded'] = True
+                                task['remind_at'] = None
+                                self.memory['tasks'] = self.tasks
                             self.save_memory()
                             msg = f"Sir, reminder: {task['description']}"
                             self.log(f"Reminder fired: {msg}")
@@ -5250,7 +5829,12 @@ RESPONSE GUIDELINES:
         keyword = recall_match.group(1).strip()
         done_tasks = [t for t in self.tasks
                       if t.get('done') and keyword in t['description'].lower()]
-        action_hits = self.memory_index.search_by_keyword(keyword, limit=3)
+        # Paraphrases ("email the landlord" vs "Replied to john@lettings.co.uk") need the embedding index
+        action_hits = []
+        if getattr(self, "action_recall", None) is not None:
+            action_hits = self.action_recall.search(keyword, limit=3, min_similarity=RECALL_MIN_SIMILARITY)
+        if not action_hits:
+            action_hits = self.memory_index.search_by_keyword(keyword, limit=3)
         if done_tasks:
             msg = f"Yes - '{done_tasks[0]['description']}' was marked done."
         elif action_hits:
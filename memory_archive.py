@@ -0,0 +1,249 @@
+"""
+Jarvis Memory Archive
+Monthly segments for actions that have aged out of the hot MemoryIndex.
+
+Each month is a gzip JSONL file (2025-01.jsonl.gz) plus a small index file
+(2025-01.index.json) holding its time bounds and type/keyword postings.
+Segments are listed at startup but only read when a query reaches into
+them; the most recently read ones are kept in a small cache.
+"""
+import gzip
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+SEGMENT_VERSION = 1
+_MONTH = re.compile(r"^(\d{4}-\d{2})\.index\.json$")
+_EPOCH = datetime(1970, 1, 1)
+
+
+def month_of(micros: int) -> str:
+    """'YYYY-MM' for an epoch-microsecond timestamp."""
+    return (_EPOCH + timedelta(microseconds=micros)).strftime("%Y-%m")
+
+
+def atomic_write_bytes(path: str, payload: bytes):
+    """Write payload to a temp file beside path, fsync it, then rename over path."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ArchiveSegment:
+    """One archived month: records in a gzip JSONL file, postings in its index file."""
+
+    def __init__(self, directory: str, month: str):
+        self.month = month
+        self.data_file = os.path.join(directory, month + ".jsonl.gz")
+        self.index_file = os.path.join(directory, month + ".index.json")
+        self._index: Optional[Dict] = None
+
+    @property
+    def index(self) -> Dict:
+        if self._index is None:
+            with open(self.index_file, 'r') as f:
+                self._index = json.load(f)
+        return self._index
+
+    def read_records(self) -> List[bytes]:
+        if not os.path.exists(self.data_file):
+            return []
+        with gzip.open(self.data_file, 'rb') as f:
+            return [line.rstrip(b"\n") for line in f if line.strip()]
+
+    def write(self, records: List[bytes], actions: List[Dict], keywords_of: Callable[[Dict], Iterable[str]],
+              times: List[int]):
+        """Replace the segment with records (and their parsed actions / timestamps)."""
+        by_type: Dict[str, List[int]] = {}
+        by_keyword: Dict[str, List[int]] = {}
+        by_short_key: Dict[str, int] = {}
+        for idx, action in enumerate(actions):
+            by_type.setdefault(action.get('action_type', 'unknown'), []).append(idx)
+            short_key = (action.get('metadata') or {}).get('short_key')
+            if isinstance(short_key, str) and short_key:
+                by_short_key[short_key.lower()] = idx
+            for keyword in keywords_of(action):
+                by_keyword.setdefault(keyword, []).append(idx)
+        payload = gzip.compress(b"".join(record + b"\n" for record in records))
+        index = {
+            'version': SEGMENT_VERSION,
+            'month': self.month,
+            'count': len(records),
+            'first': min(times),
+            'last': max(times),
+            'oldest_timestamp': actions[0].get('timestamp') if actions else None,
+            'by_type': by_type,
+            'by_keyword': by_keyword,
+            'by_short_key': by_short_key
+        }
+        # Data first: an index never points at records that are not there yet
+        atomic_write_bytes(self.data_file, payload)
+        atomic_write_bytes(self.index_file, json.dumps(index, separators=(',', ':')).encode('utf-8'))
+        self._index = index
+
+
+class MemoryArchive:
+    """
+    Read and append monthly archive segments.
+
+    Queries walk segments newest month first and stop once they have enough
+    results, so recent lookups never touch old months.
+    """
+
+    def __init__(self, directory: str, cache_segments: int = 2):
+        self.directory = directory
+        self.cache_segments = cache_segments
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, List[Dict]]" = OrderedDict()  # month -> actions
+        self.segments: Dict[str, ArchiveSegment] = {}
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                match = _MONTH.match(name)
+                if match:
+                    self.segments[match.group(1)] = ArchiveSegment(directory, match.group(1))
+
+    def months(self, newest_first: bool = False) -> List[str]:
+        return sorted(self.segments, reverse=newest_first)
+
+    def actions(self, month: str) -> List[Dict]:
+        """All actions of one month (read from disk, then cached)."""
+        with self._lock:
+            actions = self._cache.get(month)
+            if actions is not None:
+                self._cache.move_to_end(month)
+                return actions
+        actions = [json.loads(record) for record in self.segments[month].read_records()]
+        with self._lock:
+            self._cache[month] = actions
+            while len(self._cache) > self.cache_segments:
+                self._cache.popitem(last=False)
+        return actions
+
+    def add(self, records_by_month: Dict[str, List[bytes]], keywords_of: Callable[[Dict], Iterable[str]],
+            time_of: Callable[[Dict], int]) -> int:
+        """Merge records into their monthly segments; returns how many were new.
+
+        Records already in a segment are skipped (as many copies as it
+        holds), so re-running an archive pass interrupted before the hot log
+        was rewritten adds nothing twice, while identical records from one
+        batch are all kept.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        added = 0
+        for month, new_records in sorted(records_by_month.items()):
+            segment = self.segments.get(month) or ArchiveSegment(self.directory, month)
+            records = segment.read_records()
+            archived = Counter(records)
+            fresh = []
+            for record in new_records:
+                if archived[record]:
+                    archived[record] -= 1
+                else:
+                    fresh.append(record)
+            if not fresh:
+                self.segments[month] = segment
+                continue
+            records.extend(fresh)
+            actions = [json.loads(record) for record in records]
+            times = [time_of(action) for action in actions]
+            order = sorted(range(len(records)), key=times.__getitem__)
+            segment.write([records[i] for i in order], [actions[i] for i in order], keywords_of,
+                          [times[i] for i in order])
+            self.segments[month] = segment
+            with self._lock:
+                self._cache.pop(month, None)
+            added += len(fresh)
+        return added
+
+    def search_by_type(self, action_type: str, limit: int) -> List[Dict]:
+        results = []
+        for month in self.months(newest_first=True):
+            if len(results) >= limit:
+                break
+            ids = self.segments[month].index['by_type'].get(action_type)
+            if ids:
+                actions = self.actions(month)
+                results.extend(actions[i] for i in reversed(ids[-(limit - len(results)):]))
+        return results
+
+    def search_by_keyword(self, keyword: str, limit: int) -> List[Dict]:
+        """Exact keyword match, else substring match over each segment's vocabulary."""
+        results = []
+        for month in self.months(newest_first=True):
+            if len(results) >= limit:
+                break
+            by_keyword = self.segments[month].index['by_keyword']
+            ids = by_keyword.get(keyword)
+            if ids is None:
+                ids = sorted({i for kw, kw_ids in by_keyword.items() if keyword in kw for i in kw_ids})
+            if ids:
+                actions = self.actions(month)
+                results.extend(actions[i] for i in reversed(ids[-(limit - len(results)):]))
+        return results
+
+    def search_by_date_range(self, start: int, end: int, time_of: Callable[[Dict], int]) -> List[Dict]:
+        """Actions with start <= timestamp <= end (epoch microseconds), oldest first."""
+        results = []
+        for month in self.months():
+            index = self.segments[month].index
+            if index['last'] < start or index['first'] > end:
+                continue
+            results.extend(a for a in self.actions(month) if start <= time_of(a) <= end)
+        return results
+
+    def get_by_short_key(self, short_key: str) -> Optional[Dict]:
+        """Look a ledger key up in the segment for its date (or the month after, for keys issued at midnight)."""
+        try:
+            day = datetime.strptime(short_key[:8], "%Y%m%d")
+        except ValueError:
+            return None
+        for month in (day.strftime("%Y-%m"), (day.replace(day=1) + timedelta(days=32)).strftime("%Y-%m")):
+            segment = self.segments.get(month)
+            if segment is None:
+                continue
+            idx = segment.index.get('by_short_key', {}).get(short_key)
+            if idx is not None:
+                return self.actions(month)[idx]
+        return None
+
+    def get_last_n(self, n: int) -> List[Dict]:
+        results = []
+        for month in self.months(newest_first=True):
+            if len(results) >= n:
+                break
+            results.extend(reversed(self.actions(month)[-(n - len(results)):]))
+        return results
+
+    def count(self) -> int:
+        return sum(segment.index['count'] for segment in self.segments.values())
+
+    def type_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for segment in self.segments.values():
+            for action_type, ids in segment.index['by_type'].items():
+                counts[action_type] = counts.get(action_type, 0) + len(ids)
+        return counts
+
+    def oldest_timestamp(self) -> Optional[str]:
+        months = self.months()
+        return self.segments[months[0]].index.get('oldest_timestamp') if months else None
+
+    def size_bytes(self) -> int:
+        return sum(os.path.getsize(path) for segment in self.segments.values()
+                   for path in (segment.data_file, segment.index_file) if os.path.exists(path))
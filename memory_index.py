@@ -2,87 +2,761 @@
 Jarvis Memory Index System
 Efficient indexed storage and retrieval for unlimited action history.
 """
+import base64
+import hashlib
+import heapq
 import json
 import os
+import re
+import sys
+import threading
+import time
 from datetime import datetime, timedelta
-from collections import defaultdict
-from typing import List, Dict, Optional, Any
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
 import bisect
+from array import array
+
+from memory_archive import MemoryArchive, atomic_write_bytes, month_of
+
+
+INDEX_VERSION = 4
+KEYWORD_SEPARATOR = "\x00"
+SHORT_KEY = re.compile(r"^(\d{8})-([a-z]+)(\d+)$")  # ledger keys issued by ShortKeyGenerator
+UNWRITTEN = 2 ** 64 - 1  # offsets value for records the journal could not take
+NO_TIME = -2 ** 63  # times value for actions without a usable timestamp
+_EPOCH = datetime(1970, 1, 1)
+
+
+def atomic_write_json(path: str, data: Any, **dump_kwargs) -> str:
+    """Write JSON to a temp file beside path, fsync it, then rename over path.
+
+    Readers (and a crash) only ever see the old file or the complete new one.
+    Returns the sha256 of the bytes written.
+    """
+    payload = json.dumps(data, **dump_kwargs).encode('utf-8')
+    atomic_write_bytes(path, payload)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def timestamp_to_micros(timestamp) -> int:
+    """ISO timestamp string or datetime -> int64 microseconds since 1970 (naive wall clock).
+
+    add_action writes naive local timestamps, so they are compared as-is;
+    aware values are converted to local time first.
+    """
+    dt = datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else timestamp
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return (dt - _EPOCH) // timedelta(microseconds=1)
+
+
+def _pack(values: array) -> str:
+    return base64.b64encode(values.tobytes()).decode('ascii')
+
+
+def _unpack(typecode: str, encoded: str) -> array:
+    values = array(typecode)
+    values.frombytes(base64.b64decode(encoded))
+    return values
+
+
+class ActionJournal:
+    """
+    Append-only JSONL log holding every action, one compact JSON object per line.
+
+    Appending costs one small write regardless of history size; the fsync
+    policy trades durability for speed:
+    - "always": fsync after every append
+    - "interval": fsync at most every fsync_interval seconds (and on close)
+    - "never": leave flushing to the OS
+
+    Records are read back by (offset, length), so the index only needs to
+    keep their positions in RAM. Reads use their own handle and lock, so
+    they never wait on an append (or its fsync).
+    """
+
+    FSYNC_POLICIES = ("always", "interval", "never")
+
+    def __init__(self, path: str, fsync: str = "interval", fsync_interval: float = 1.0):
+        if fsync not in self.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync}' (expected one of {self.FSYNC_POLICIES})")
+        self.path = path
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._file = None  # append handle
+        self._reader = None  # random-access read handle
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()  # append handle
+        self._read_lock = threading.Lock()  # reader handle
+
+    def size(self) -> int:
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def scan(self, start: int = 0) -> List[Tuple[int, bytes, Dict]]:
+        """Return (offset, record, action) for every complete record from byte start on.
+
+        A torn final line (crash mid-append, no newline) is dropped and cut
+        from the file so later appends start on a clean line. A bad line
+        anywhere else is moved to <path>.corrupt and blanked in place (same
+        length, so later offsets hold); the records after it are kept.
+        """
+        entries = []
+        if not os.path.exists(self.path):
+            return entries
+        offset = start
+        torn_at = None
+        corrupt = []
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    torn_at = offset  # only the last line can lack its newline
+                    break
+                record = raw[:-1]
+                if not record.strip():
+                    offset += len(raw)  # a corrupt entry blanked by an earlier scan
+                    continue
+                try:
+                    action = json.loads(record)
+                    if not isinstance(action, dict):
+                        raise ValueError("not an action")
+                except ValueError:
+                    print(f"Memory journal: skipping corrupt entry at byte {offset} of {self.path}")
+                    corrupt.append((offset, raw))
+                else:
+                    entries.append((offset, record, action))
+                offset += len(raw)
+        if corrupt:
+            with open(self.path + ".corrupt", 'ab') as f:
+                f.write(b"".join(raw for _, raw in corrupt))
+                f.flush()
+                os.fsync(f.fileno())
+            with self._lock, open(self.path, 'r+b') as f:
+                for bad_offset, raw in corrupt:
+                    f.seek(bad_offset)
+                    f.write(b" " * (len(raw) - 1))
+        if torn_at is not None:
+            print(f"Memory journal: dropping torn entry at byte {torn_at} of {self.path}")
+            with self._lock, self._read_lock:
+                self._close_handles()
+                with open(self.path, 'r+b') as f:
+                    f.truncate(torn_at)
+        return entries
+
+    def append(self, records: List[bytes]) -> List[int]:
+        """Append records (one write); returns their byte offsets.
+
+        If the write fails, whatever part of it reached the file is cut off
+        again, so a retry does not land after a half-written line.
+        """
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'ab')
+            start = offset = self._file.tell()
+            offsets = []
+            for record in records:
+                offsets.append(offset)
+                offset += len(record) + 1
+            try:
+                self._file.write(b"".join(record + b"\n" for record in records))
+                self._file.flush()
+                now = time.monotonic()
+                if self.fsync == "always" or (self.fsync == "interval" and now - self._last_sync >= self.fsync_interval):
+                    os.fsync(self._file.fileno())
+                    self._last_sync = now
+            except Exception:
+                self._roll_back(start)
+                raise
+            return offsets
+
+    def _roll_back(self, size: int):
+        """Drop the append handle and cut the file back to size (call with _lock held)."""
+        try:
+            self._file.close()
+        except Exception:
+            pass
+        self._file = None
+        try:
+            with open(self.path, 'r+b') as f:
+                f.truncate(size)
+        except OSError:
+            pass
+
+    def retire(self, retired_path: str):
+        """Move the file to retired_path and keep reading from there.
+
+        Used when archiving replaces the journal: views published before the
+        swap still hold this object and read their records from the old file.
+        """
+        with self._lock, self._read_lock:
+            self._close_handles()
+            os.replace(self.path, retired_path)
+            self.path = retired_path
+
+    def read(self, offset: int, length: int) -> bytes:
+        with self._read_lock:
+            if self._reader is None:
+                self._reader = open(self.path, 'rb')
+            self._reader.seek(offset)
+            return self._reader.read(length)
+
+    def _close_handles(self):
+        if self._file is not None:
+            self._file.flush()
+            if self.fsync != "never":
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def close(self):
+        with self._lock, self._read_lock:
+            self._close_handles()
+
+
+class ActionStore:
+    """
+    Columnar action history.
+
+    Per action only an interned type code (uint16), an int64 timestamp
+    (microseconds since 1970) and the record's position in the journal are
+    held in RAM. store[i], slices and iteration materialise the full action
+    dict (with metadata) from the journal on demand.
+
+    Columns are only ever appended to, so a reader that remembers the length
+    it saw has a stable prefix to read however many appends follow.
+    """
+
+    def __init__(self, journal: ActionJournal):
+        self.journal = journal
+        self.type_names: List[str] = []
+        self._type_codes: Dict[str, int] = {}
+        self.types = array('H')
+        self.times = array('q')
+        self.offsets = array('Q')
+        self.lengths = array('I')
+        self._unwritten: Dict[int, bytes] = {}  # records the journal could not take
+
+    def type_code(self, action_type: str) -> int:
+        code = self._type_codes.get(action_type)
+        if code is None:
+            code = self._type_codes[action_type] = len(self.type_names)
+            self.type_names.append(action_type)
+        return code
+
+    def append(self, action_type: str, micros: int, record: bytes, offset: Optional[int]) -> int:
+        idx = len(self.types)
+        self.types.append(self.type_code(action_type))
+        self.times.append(micros)
+        if offset is None:
+            self._unwritten[idx] = record
+            offset = UNWRITTEN
+        self.offsets.append(offset)
+        self.lengths.append(len(record))
+        return idx
+
+    def mark_written(self, indices: List[int], offsets: List[int]):
+        """Record where a retry put unwritten records in the journal."""
+        for idx, offset in zip(indices, offsets):
+            self.offsets[idx] = offset
+        written = set(indices)
+        # Replace rather than mutate: readers look records up without a lock
+        self._unwritten = {idx: record for idx, record in self._unwritten.items() if idx not in written}
+
+    def load_columns(self, type_names: List[str], types: array, times: array, offsets: array, lengths: array):
+        self.type_names = list(type_names)
+        self._type_codes = {name: code for code, name in enumerate(self.type_names)}
+        self.types, self.times, self.offsets, self.lengths = types, times, offsets, lengths
+        self._unwritten = {}
+
+    def raw(self, idx: int) -> bytes:
+        offset = self.offsets[idx]
+        if offset == UNWRITTEN:
+            record = self._unwritten.get(idx % len(self))
+            if record is not None:
+                return record
+            offset = self.offsets[idx]  # a retry has just written it
+        return self.journal.read(offset, self.lengths[idx])
+
+    def action_type(self, idx: int) -> str:
+        return self.type_names[self.types[idx]]
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        return json.loads(self.raw(idx))
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+
+class IndexView(NamedTuple):
+    """What readers see: the index structures plus how much of them was complete when published."""
+    actions: ActionStore
+    index: Dict[str, Any]
+    count: int  # actions 0..count-1 are fully indexed
+    dated: int  # valid prefix of by_time / by_time_ids
+
+
+def _visible(postings: array, count: int) -> int:
+    """End of the part of a sorted posting list that a view with count actions may see."""
+    if not postings or postings[-1] < count:
+        return len(postings)
+    return bisect.bisect_left(postings, count)
 
 
 class MemoryIndex:
     """
     Indexed memory system for fast searching across unlimited actions.
-    
+
     Features:
     - Unlimited action storage (no artificial limits)
     - Fast lookup by action_type, date range, keywords
     - Automatic indexing on load/save
     - Efficient search without loading entire history
+    - Every action is appended to an action journal (JSONL); the memory file
+      no longer carries vault_actions
+    - Compact in-memory layout: type/timestamp/position columns and sorted
+      uint32 posting lists; full actions are read back from the journal
+    - Tiered retention: with hot_days set, older actions move to monthly
+      archive segments that queries only open when they reach back that far
+    - Single writer, lock-free readers: writers hold _lock and only append,
+      then publish an IndexView; searches read the view they started with
     """
-    
-    def __init__(self, memory_file="jarvis_memory.json", index_file="jarvis_memory_index.json"):
+
+    def __init__(self, memory_file="jarvis_memory.json", index_file="jarvis_memory_index.json",
+                 journal_file=None, fsync="interval", checkpoint_every=1000, hot_days=0, archive_dir=None):
         self.memory_file = memory_file
         self.index_file = index_file
-        self.actions = []  # Full action history
-        self.index = {
-            "by_type": defaultdict(list),      # action_type -> [indices]
-            "by_date": [],                      # sorted list of (date, index) tuples
-            "by_keyword": defaultdict(set),     # keyword -> {indices}
+        base = os.path.splitext(memory_file)[0]
+        self.journal = ActionJournal(journal_file or base + "_actions.jsonl", fsync=fsync)
+        self._retired_journal: Optional[ActionJournal] = None  # pre-archive journal, still read by older views
+        self.legacy_journal_file = base + "_journal.jsonl"  # pre-action-log layout
+        self.checkpoint_every = checkpoint_every
+        self.hot_days = hot_days  # 0 keeps every action hot
+        self.archive = MemoryArchive(archive_dir or base + "_archive")
+        self._indexed_count = 0  # actions covered by the index file on disk
+        self._checkpoint_requested_at = 0  # len(actions) when on_checkpoint_due last fired
+        self._lock = threading.Lock()  # the single-writer lock; readers never take it
+        self._save_lock = threading.Lock()  # one checkpoint at a time
+        # Called instead of checkpoint() when the index file is due a refresh, so
+        # an owner with a background writer can write it off the caller's thread.
+        self.on_checkpoint_due: Optional[Callable[[], None]] = None
+        # Called with each batch of new actions once they are visible (e.g. to embed them)
+        self.on_actions_added: Optional[Callable[[List[Dict]], None]] = None
+        self.actions = ActionStore(self.journal)  # Full action history
+        # trigram -> keywords containing it; built by warm_in_background(), until
+        # then substring queries scan the vocabulary
+        self._trigram_index: Optional[Dict[str, set]] = None
+        self._warm = False  # rebuild the trigram index after a reload / archive pass
+        self.index = self._empty_index()
+        self._view = IndexView(self.actions, self.index, 0, 0)
+        self.load()
+
+    @staticmethod
+    def _empty_index() -> Dict[str, Any]:
+        return {
+            "by_type": {},                      # action_type -> array('I') of indices
+            "by_time": array('q'),              # sorted timestamps (microseconds)
+            "by_time_ids": array('I'),          # action index for each by_time entry
+            "by_keyword": {},                   # keyword -> sorted array('I') of indices
+            "by_short_key": {},                 # ledger short key ("20260214-wr3") -> index
             "total_count": 0
         }
-        self.load()
-    
+
+    @property
+    def unindexed(self) -> int:
+        """Actions appended since the index file was last written."""
+        return len(self.actions) - self._indexed_count
+
     def load(self):
-        """Load actions and rebuild index from memory file."""
-        if not os.path.exists(self.memory_file):
-            return
-        
-        try:
-            with open(self.memory_file, 'r') as f:
-                memory = json.load(f)
-            
-            self.actions = memory.get('vault_actions', [])
+        """Load the persisted index and apply the journal tail (or rebuild from the journal)."""
+        self._finish_journal_swap()
+        if self.journal.size() == 0:
+            self._migrate_legacy()
+
+        log_size = self._load_persisted_index()
+        if log_size is None:
             self._rebuild_index()
-            
+        else:
+            try:
+                for offset, record, action in self.journal.scan(log_size):
+                    self._index_new(action, record, offset)
+            except Exception as e:
+                print(f"Error replaying memory journal: {e}")
+
+        self._publish()
+
+        if self._archive_due():
+            self.archive_old_actions()
+
+    def _publish(self):
+        """Make everything indexed so far visible to readers (call as the writer)."""
+        self._view = IndexView(self.actions, self.index, len(self.actions), len(self.index['by_time']))
+
+    def _finish_journal_swap(self):
+        """Complete or discard a journal swap interrupted by a crash, and drop the retired file."""
+        path = self.journal.path
+        if os.path.exists(path + ".next"):
+            if os.path.exists(path):
+                os.remove(path + ".next")  # crashed before the swap; the live journal is intact
+            else:
+                os.replace(path + ".next", path)  # crashed between the two renames
+        if os.path.exists(path + ".prev"):
+            try:
+                os.remove(path + ".prev")
+            except OSError:
+                pass
+
+    def _migrate_legacy(self):
+        """Move vault_actions (and an old checkpoint journal) from the memory file into the action journal."""
+        actions, seq = [], 0
+        if os.path.exists(self.memory_file):
+            try:
+                with open(self.memory_file, 'rb') as f:
+                    memory = json.loads(f.read())
+                actions = list(memory.get('vault_actions') or [])
+                seq = int(memory.get('journal_seq', 0))
+            except Exception as e:
+                print(f"Error loading memory index: {e}")
+        for path in (self.legacy_journal_file + ".ckpt", self.legacy_journal_file):
+            if not os.path.exists(path):
+                continue
+            with open(path, 'rb') as f:
+                for raw in f:
+                    try:
+                        entry = json.loads(raw)
+                        if int(entry['seq']) > seq:
+                            actions.append(entry['action'])
+                            seq = int(entry['seq'])
+                    except (ValueError, KeyError, TypeError):
+                        break
+        if actions:
+            self.journal.append([json.dumps(a, separators=(',', ':')).encode('utf-8') for a in actions])
+            self.journal.close()
+            print(f"Memory index: moved {len(actions)} actions into {self.journal.path}")
+        for path in (self.legacy_journal_file + ".ckpt", self.legacy_journal_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _load_persisted_index(self) -> Optional[int]:
+        """Adopt the saved columns and postings if they match the journal.
+
+        Valid means same format version and byte order, and the journal still
+        holds the saved last record at the saved position (so it was neither
+        rewritten nor truncated). Returns the journal offset the index covers,
+        or None to rebuild. The type and date indexes are one cheap pass over
+        the columns.
+        """
+        if not os.path.exists(self.index_file):
+            return None
+        try:
+            with open(self.index_file, 'r') as f:
+                saved = json.load(f)
+            if saved.get('version') != INDEX_VERSION or saved.get('byteorder') != sys.byteorder:
+                return None
+            columns = saved['columns']
+            types = _unpack('H', columns['types'])
+            times = _unpack('q', columns['times'])
+            offsets = _unpack('Q', columns['offsets'])
+            lengths = _unpack('I', columns['lengths'])
+            count = saved['count']
+            if not (len(types) == len(times) == len(offsets) == len(lengths) == count):
+                return None
+            log_size = offsets[-1] + lengths[-1] + 1 if count else 0
+            if log_size > self.journal.size():
+                return None
+            if count:
+                last = self.journal.read(offsets[-1], lengths[-1])
+                if hashlib.sha256(last).hexdigest() != saved.get('last_record_sha'):
+                    return None
+            by_keyword = self._decode_postings(saved['postings'])
+            by_short_key = self._decode_short_keys(saved['short_keys'], count)
         except Exception as e:
-            print(f"Error loading memory index: {e}")
-    
-    def _rebuild_index(self):
-        """Rebuild all indexes from current actions."""
-        self.index = {
-            "by_type": defaultdict(list),
-            "by_date": [],
-            "by_keyword": defaultdict(set),
-            "total_count": len(self.actions)
+            print(f"Ignoring persisted memory index: {e}")
+            return None
+
+        store = ActionStore(self.journal)
+        store.load_columns(saved['type_names'], types, times, offsets, lengths)
+        self.actions = store
+        self._index_columns(by_keyword, by_short_key)
+        self._indexed_count = count
+        return log_size
+
+    def _index_columns(self, by_keyword: Dict[str, array], by_short_key: Dict[str, int]):
+        """Type and date indexes from the loaded columns."""
+        self._trigram_index = None
+        index = self._empty_index()
+        store = self.actions
+        by_code: Dict[int, array] = {}
+        for idx, code in enumerate(store.types):
+            postings = by_code.get(code)
+            if postings is None:
+                postings = by_code[code] = array('I')
+            postings.append(idx)
+        index['by_type'] = {store.type_names[code]: ids for code, ids in by_code.items()}
+
+        dated = [(t, idx) for idx, t in enumerate(store.times) if t != NO_TIME]
+        if any(dated[i][0] > dated[i + 1][0] for i in range(len(dated) - 1)):
+            dated.sort()
+        index['by_time'] = array('q', (t for t, _ in dated))
+        index['by_time_ids'] = array('I', (idx for _, idx in dated))
+        index['by_keyword'] = by_keyword
+        index['by_short_key'] = by_short_key
+        index['total_count'] = len(store)
+        self.index = index
+
+    @staticmethod
+    def _encode_postings(postings: Dict[str, array]) -> Dict[str, str]:
+        """Keyword postings as one joined keyword string plus packed id/offset arrays."""
+        ids, offsets = array('I'), array('I')
+        for ids_for_keyword in postings.values():
+            ids.extend(ids_for_keyword)
+            offsets.append(len(ids))
+        return {
+            'keywords': KEYWORD_SEPARATOR.join(postings),
+            'offsets': _pack(offsets),
+            'ids': _pack(ids)
         }
-        
-        for idx, action in enumerate(self.actions):
-            # Index by action type
-            action_type = action.get('action_type', 'unknown')
-            self.index['by_type'][action_type].append(idx)
-            
-            # Index by date (for fast date range queries)
-            timestamp = action.get('timestamp')
-            if timestamp:
-                self.index['by_date'].append((timestamp, idx))
-            
-            # Index by keywords (from description and metadata)
-            keywords = self._extract_keywords(action)
-            for keyword in keywords:
-                self.index['by_keyword'][keyword].add(idx)
-        
-        # Sort date index for binary search
-        self.index['by_date'].sort()
-    
+
+    @staticmethod
+    def _decode_postings(encoded: Dict[str, str]) -> Dict[str, array]:
+        keywords = encoded['keywords'].split(KEYWORD_SEPARATOR) if encoded['keywords'] else []
+        offsets = _unpack('I', encoded['offsets'])
+        ids = _unpack('I', encoded['ids'])
+        if len(keywords) != len(offsets) or (offsets and offsets[-1] != len(ids)):
+            raise ValueError("postings do not line up")
+        by_keyword = {}
+        start = 0
+        for keyword, end in zip(keywords, offsets):
+            by_keyword[keyword] = ids[start:end]
+            start = end
+        return by_keyword
+
+    @staticmethod
+    def _encode_short_keys(by_short_key: Dict[str, int]) -> Dict[str, str]:
+        return {
+            'keys': KEYWORD_SEPARATOR.join(by_short_key),
+            'ids': _pack(array('I', by_short_key.values()))
+        }
+
+    @staticmethod
+    def _decode_short_keys(encoded: Dict[str, str], count: int) -> Dict[str, int]:
+        keys = encoded['keys'].split(KEYWORD_SEPARATOR) if encoded['keys'] else []
+        ids = _unpack('I', encoded['ids'])
+        if len(keys) != len(ids) or any(idx >= count for idx in ids):
+            raise ValueError("short keys do not line up")
+        return dict(zip(keys, ids))
+
+    def _rebuild_index(self):
+        """Rebuild all indexes by reading every action from the journal."""
+        self.actions = ActionStore(self.journal)
+        self.index = self._empty_index()
+        self._trigram_index = None
+        self._indexed_count = 0
+        try:
+            for offset, record, action in self.journal.scan(0):
+                self._index_new(action, record, offset)
+        except Exception as e:
+            print(f"Error loading memory index: {e}")
+        self._publish()
+        if self._warm:
+            self.warm_in_background()
+
+    def _index_new(self, action: Dict, record: bytes, offset: Optional[int]) -> int:
+        """Append one action to the columns and indexes; returns its index."""
+        action_type = action.get('action_type', 'unknown')
+        micros = self._action_micros(action)
+        idx = self.actions.append(action_type, micros, record, offset)
+
+        # Index by action type
+        postings = self.index['by_type'].get(action_type)
+        if postings is None:
+            postings = self.index['by_type'][action_type] = array('I')
+        postings.append(idx)
+        self.index['total_count'] += 1
+
+        # Index by date (timestamps arrive in order, so this is a plain append)
+        if micros != NO_TIME:
+            by_time = self.index['by_time']
+            if not by_time or micros >= by_time[-1]:
+                by_time.append(micros)
+                self.index['by_time_ids'].append(idx)
+            else:
+                # Clock stepped back: insert into copies so published views keep the arrays they hold
+                pos = bisect.bisect_right(by_time, micros)
+                by_time, by_time_ids = by_time[:], self.index['by_time_ids'][:]
+                by_time.insert(pos, micros)
+                by_time_ids.insert(pos, idx)
+                self.index = dict(self.index, by_time=by_time, by_time_ids=by_time_ids)
+
+        # Index by ledger short key (one action per key; the latest wins)
+        short_key = (action.get('metadata') or {}).get('short_key')
+        if isinstance(short_key, str) and short_key:
+            self.index['by_short_key'][short_key.lower()] = idx
+
+        # Index by keywords (from description and metadata)
+        by_keyword = self.index['by_keyword']
+        for keyword in self._extract_keywords(action):
+            postings = by_keyword.get(keyword)
+            if postings is None:
+                postings = by_keyword[keyword] = array('I')
+                if self._trigram_index is not None:
+                    for gram in self._trigrams(keyword):
+                        self._trigram_index.setdefault(gram, set()).add(keyword)
+            postings.append(idx)
+        return idx
+
+    @staticmethod
+    def _action_micros(action: Dict) -> int:
+        try:
+            return timestamp_to_micros(action['timestamp'])
+        except (KeyError, TypeError, ValueError):
+            return NO_TIME
+
+    def _archive_cutoff(self) -> int:
+        """Start of the month holding now - hot_days.
+
+        Only months wholly outside the hot window are archived, so a pass
+        runs about once a month rather than on every save.
+        """
+        edge = datetime.now() - timedelta(days=self.hot_days)
+        return timestamp_to_micros(edge.replace(day=1, hour=0, minute=0, second=0, microsecond=0))
+
+    def _archive_due(self) -> bool:
+        by_time = self.index['by_time']
+        return bool(self.hot_days and by_time and by_time[0] < self._archive_cutoff())
+
+    def archive_old_actions(self) -> int:
+        """Move the months that ended before the hot_days window into archive segments.
+
+        Segments are written first. The remaining actions then go to a new
+        journal file that replaces the live one, and the hot index is rebuilt
+        against it before it is published; readers holding the old view keep
+        reading the old file until they finish. Returns the number of actions
+        archived.
+        """
+        if not self.hot_days:
+            return 0
+        with self._save_lock:
+            with self._lock:
+                store = self.actions
+                if store._unwritten:
+                    return 0  # the journal must hold every record before it is rewritten
+                by_time = self.index['by_time']
+                old_count = bisect.bisect_left(by_time, self._archive_cutoff())
+                if not old_count:
+                    return 0
+                old = set(self.index['by_time_ids'][:old_count])
+                records_by_month: Dict[str, List[bytes]] = {}
+                keep = []
+                for idx in range(len(store)):
+                    record = store.raw(idx)
+                    if idx in old:
+                        records_by_month.setdefault(month_of(store.times[idx]), []).append(record)
+                    else:
+                        keep.append(record)
+                try:
+                    self.archive.add(records_by_month, self._extract_keywords, self._action_micros)
+                    self._swap_journal(keep)
+                except Exception as e:
+                    print(f"Error archiving memory actions: {e}")
+                    return 0
+                self._rebuild_index()
+            snapshot = self._index_snapshot()
+            try:
+                self._write_index(snapshot)
+            except Exception as e:
+                print(f"Error saving memory index: {e}")
+        print(f"Memory index: archived {len(old)} actions older than {self.hot_days} days")
+        return len(old)
+
+    def _swap_journal(self, records: List[bytes]):
+        """Replace the live journal with a fresh one holding records (call as the writer).
+
+        The new file is written beside the journal, the old file is renamed
+        to .prev (the old journal object follows it) and the new one takes
+        its path. load() finishes a swap cut short by a crash.
+        """
+        old = self.journal
+        path = old.path
+        if self._retired_journal is not None:
+            self._retired_journal.close()  # retired a whole archive pass ago; nothing reads it now
+            self._retired_journal = None
+        if os.path.exists(path + ".prev"):
+            os.remove(path + ".prev")
+        atomic_write_bytes(path + ".next", b"".join(record + b"\n" for record in records))
+        old.retire(path + ".prev")
+        os.replace(path + ".next", path)
+        self.journal = ActionJournal(path, fsync=old.fsync, fsync_interval=old.fsync_interval)
+        self._retired_journal = old
+
+    @staticmethod
+    def _trigrams(text: str) -> set:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def build_trigram_index(self):
+        """Build the trigram index over the keyword vocabulary.
+
+        Built outside the lock (the vocabulary only grows), then topped up
+        with keywords added meanwhile before add_action starts maintaining it.
+        """
+        if self._trigram_index is not None:
+            return
+        by_keyword = self.index['by_keyword']
+        vocabulary = list(by_keyword)
+        trigram_index: Dict[str, set] = {}
+        for keyword in vocabulary:
+            for gram in self._trigrams(keyword):
+                trigram_index.setdefault(gram, set()).add(keyword)
+        with self._lock:
+            if self._trigram_index is not None or by_keyword is not self.index['by_keyword']:
+                return
+            for keyword in list(by_keyword)[len(vocabulary):]:
+                for gram in self._trigrams(keyword):
+                    trigram_index.setdefault(gram, set()).add(keyword)
+            self._trigram_index = trigram_index
+
+    def warm_in_background(self) -> threading.Thread:
+        """Build the trigram index off-thread (and again whenever the index is rebuilt).
+
+        Readers never build it: it takes the writer lock to catch up, so they
+        scan the vocabulary until it is published.
+        """
+        self._warm = True
+        thread = threading.Thread(target=self.build_trigram_index, name="memory-trigrams", daemon=True)
+        thread.start()
+        return thread
+
+    def _matching_keywords(self, fragment: str, by_keyword: Dict[str, array]) -> List[str]:
+        """Keywords containing fragment, via trigram posting intersection once it is built."""
+        trigram_index = self._trigram_index
+        if trigram_index is None or len(fragment) < 3:
+            return [kw for kw in list(by_keyword) if fragment in kw]
+        postings = sorted((trigram_index.get(gram, ()) for gram in self._trigrams(fragment)), key=len)
+        if not postings[0]:
+            return []
+        candidates = set(postings[0]).intersection(*postings[1:])
+        # Trigrams can match out of order ("abcab" has every trigram of "cabc")
+        return [kw for kw in candidates if fragment in kw]
+
     def _extract_keywords(self, action: Dict) -> List[str]:
         """Extract searchable keywords from action."""
         keywords = []
-        
+
         # From description
         description = action.get('description', '').lower()
         keywords.extend(description.split())
-        
+
         # From metadata
         metadata = action.get('metadata', {})
         for key, value in metadata.items():
@@ -90,100 +764,280 @@ class MemoryIndex:
                 keywords.append(value.lower())
             elif key == 'filename':
                 keywords.append(value.lower().replace('.', ' ').replace('_', ' '))
-        
+
         # Clean and deduplicate
         return list(set(k for k in keywords if len(k) > 2))
-    
+
     def add_action(self, action_type: str, description: str, metadata: Optional[Dict] = None):
         """Add new action and update indexes."""
-        action = {
-            'timestamp': datetime.now().isoformat(),
+        return self.add_actions([(action_type, description, metadata)])[0]
+
+    def add_actions(self, entries: Iterable[Tuple[str, str, Optional[Dict]]]) -> List[Dict]:
+        """Add (action_type, description, metadata) entries in one journal write and one index update."""
+        now = datetime.now().isoformat()
+        actions = [{
+            'timestamp': now,
             'action_type': action_type,
             'description': description,
             'metadata': metadata or {}
-        }
-        
-        idx = len(self.actions)
-        self.actions.append(action)
-        
-        # Update indexes incrementally
-        self.index['by_type'][action_type].append(idx)
-        self.index['total_count'] += 1
-        
-        timestamp = action['timestamp']
-        bisect.insort(self.index['by_date'], (timestamp, idx))
-        
-        keywords = self._extract_keywords(action)
-        for keyword in keywords:
-            self.index['by_keyword'][keyword].add(idx)
-        
-        return action
-    
+        } for action_type, description, metadata in entries]
+        if not actions:
+            return actions
+        records = [json.dumps(action, separators=(',', ':')).encode('utf-8') for action in actions]
+
+        with self._lock:
+            # Records an earlier append could not write go first, keeping journal order
+            store = self.actions
+            pending = sorted(store._unwritten)
+            try:
+                offsets = self.journal.append([store._unwritten[idx] for idx in pending] + records)
+                store.mark_written(pending, offsets[:len(pending)])
+                offsets = offsets[len(pending):]
+            except Exception as e:
+                print(f"Error journaling memory action: {e}")
+                offsets = [None] * len(records)
+
+            # Update indexes incrementally, then let readers see the whole batch at once
+            for action, record, offset in zip(actions, records, offsets):
+                self._index_new(action, record, offset)
+            self._publish()
+
+        if self.on_actions_added is not None:
+            self.on_actions_added(actions)
+
+        # At most one request per checkpoint_every actions, even while checkpoints fail
+        if (self.checkpoint_every and self.unindexed >= self.checkpoint_every
+                and len(self.actions) - self._checkpoint_requested_at >= self.checkpoint_every):
+            self._checkpoint_requested_at = len(self.actions)
+            if self.on_checkpoint_due is not None:
+                self.on_checkpoint_due()
+            else:
+                self.checkpoint()
+
+        return actions
+
+    @staticmethod
+    def _materialize(view: IndexView, indices) -> List[Dict]:
+        return [view.actions[i] for i in indices]
+
     def search_by_type(self, action_type: str, limit: int = 50) -> List[Dict]:
         """Get recent actions of a specific type."""
-        indices = self.index['by_type'].get(action_type, [])
+        view = self._view
+        indices = view.index['by_type'].get(action_type, array('I'))
+        end = _visible(indices, view.count)
         # Return most recent first
-        return [self.actions[i] for i in reversed(indices[-limit:])]
-    
+        results = self._materialize(view, reversed(indices[max(end - limit, 0):end]))
+        if len(results) < limit:
+            results.extend(self.archive.search_by_type(action_type, limit - len(results)))
+        return results
+
     def search_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Dict]:
         """Get all actions within a date range."""
-        start_iso = start_date.isoformat()
-        end_iso = end_date.isoformat()
-        
-        # Binary search for start position
-        start_idx = bisect.bisect_left(self.index['by_date'], (start_iso, 0))
-        end_idx = bisect.bisect_right(self.index['by_date'], (end_iso, float('inf')))
-        
-        indices = [idx for _, idx in self.index['by_date'][start_idx:end_idx]]
-        return [self.actions[i] for i in indices]
-    
+        view = self._view
+        by_time = view.index['by_time']
+        start, end = timestamp_to_micros(start_date), timestamp_to_micros(end_date)
+
+        # Archive segments are only opened when the range reaches before the hot window
+        results = []
+        if self.archive.segments and not (view.dated and start >= by_time[0]):
+            results = self.archive.search_by_date_range(start, end, self._action_micros)
+
+        # Binary search on the sorted int64 timestamp column
+        start_idx = bisect.bisect_left(by_time, start, 0, view.dated)
+        end_idx = bisect.bisect_right(by_time, end, 0, view.dated)
+
+        return results + self._materialize(view, view.index['by_time_ids'][start_idx:end_idx])
+
     def search_by_keyword(self, keyword: str, limit: int = 50) -> List[Dict]:
-        """Search actions by keyword (filename, description, metadata)."""
+        """Search actions by keyword (filename, description, metadata), most recent first."""
         keyword = keyword.lower()
-        
-        # Exact match
-        if keyword in self.index['by_keyword']:
-            indices = list(self.index['by_keyword'][keyword])[-limit:]
-            return [self.actions[i] for i in reversed(indices)]
-        
-        # Partial match
-        matching_indices = set()
-        for kw, idx_set in self.index['by_keyword'].items():
-            if keyword in kw:
-                matching_indices.update(idx_set)
-        
-        indices = sorted(matching_indices)[-limit:]
-        return [self.actions[i] for i in reversed(indices)]
-    
+        view = self._view
+        by_keyword = view.index['by_keyword']
+
+        # Exact match (postings are sorted, so the tail is the most recent)
+        exact = by_keyword.get(keyword)
+        end = _visible(exact, view.count) if exact else 0
+        if end:
+            results = self._materialize(view, reversed(exact[max(end - limit, 0):end]))
+            return self._with_archive_hits(results, keyword, limit)
+
+        # Partial (substring or prefix) match: merge postings newest first
+        matches = []
+        for kw in self._matching_keywords(keyword, by_keyword):
+            postings = by_keyword.get(kw)  # the trigram index may be from a newer or older view
+            if postings is None:
+                continue
+            matches.append(reversed(postings[:_visible(postings, view.count)]))
+        indices = []
+        for idx in heapq.merge(*matches, reverse=True):
+            if len(indices) >= limit:
+                break
+            if not indices or indices[-1] != idx:
+                indices.append(idx)
+        return self._with_archive_hits(self._materialize(view, indices), keyword, limit)
+
+    def _with_archive_hits(self, results: List[Dict], keyword: str, limit: int) -> List[Dict]:
+        """Top up hot keyword results from the archive, newest month first."""
+        if len(results) < limit and keyword:
+            results.extend(self.archive.search_by_keyword(keyword, limit - len(results)))
+        return results
+
     def get_last_n(self, n: int = 50) -> List[Dict]:
         """Get last N actions (most recent first)."""
-        return list(reversed(self.actions[-n:]))
-    
+        view = self._view
+        total = view.count
+        results = self._materialize(view, range(total - 1, max(total - n, 0) - 1, -1))
+        if len(results) < n:
+            results.extend(self.archive.get_last_n(n - len(results)))
+        return results
+
+    def get_by_short_key(self, short_key: str) -> Optional[Dict]:
+        """The ledger action stored under a full short key ("20260214-wr3"), or None."""
+        short_key = short_key.strip().lower()
+        view = self._view
+        idx = view.index['by_short_key'].get(short_key)
+        if idx is not None and idx < view.count:
+            return view.actions[idx]
+        return self.archive.get_by_short_key(short_key)
+
+    def short_key_counters(self, day: str) -> Dict[str, int]:
+        """Highest counter per prefix among the short keys issued on day ("YYYYMMDD")."""
+        counters: Dict[str, int] = {}
+        for key in list(self._view.index['by_short_key']):
+            match = SHORT_KEY.match(key)
+            if match and match.group(1) == day:
+                prefix, number = match.group(2), int(match.group(3))
+                counters[prefix] = max(counters.get(prefix, 0), number)
+        return counters
+
     def get_stats(self) -> Dict[str, Any]:
         """Get memory statistics."""
+        view = self._view
+        action_types = self.archive.type_counts()
+        for action_type, ids in list(view.index['by_type'].items()):
+            visible = _visible(ids, view.count)
+            if visible:
+                action_types[action_type] = action_types.get(action_type, 0) + visible
+        archived = self.archive.count()
+        hot_oldest = view.actions[0]['timestamp'] if view.count else None
+        newest = view.actions[view.count - 1]['timestamp'] if view.count else None
         return {
-            "total_actions": self.index['total_count'],
-            "action_types": {k: len(v) for k, v in self.index['by_type'].items()},
-            "oldest_action": self.actions[0]['timestamp'] if self.actions else None,
-            "newest_action": self.actions[-1]['timestamp'] if self.actions else None,
-            "unique_keywords": len(self.index['by_keyword']),
-            "memory_size_kb": os.path.getsize(self.memory_file) / 1024 if os.path.exists(self.memory_file) else 0
+            "total_actions": view.count + archived,
+            "action_types": action_types,
+            "oldest_action": self.archive.oldest_timestamp() or hot_oldest,
+            "newest_action": newest or (self.archive.get_last_n(1) or [{}])[0].get('timestamp'),
+            "unique_keywords": len(view.index['by_keyword']),
+            "unindexed_actions": self.unindexed,
+            "archived_actions": archived,
+            "archive_segments": len(self.archive.segments),
+            "memory_size_kb": self.journal.size() / 1024,
+            "archive_size_kb": self.archive.size_bytes() / 1024
         }
-    
-    def save(self, full_memory: Dict):
-        """Save actions back to memory file (called by main save_memory)."""
-        full_memory['vault_actions'] = self.actions
-        
-        try:
-            with open(self.memory_file, 'w') as f:
-                json.dump(full_memory, f, indent=2)
-            
-            # Save separate index file for fast startup (optional optimization)
-            with open(self.index_file, 'w') as f:
-                json.dump({
-                    'by_type': {k: list(v) for k, v in self.index['by_type'].items()},
-                    'by_date': self.index['by_date'],
-                    'total_count': self.index['total_count']
-                }, f)
-        except Exception as e:
-            print(f"Error saving memory index: {e}")
+
+    def _write_unwritten(self) -> bool:
+        """Retry journal appends that failed; True once the journal holds every record."""
+        with self._lock:
+            store = self.actions
+            pending = sorted(store._unwritten)
+            if not pending:
+                return True
+            try:
+                offsets = self.journal.append([store._unwritten[idx] for idx in pending])
+            except Exception as e:
+                print(f"Error journaling memory action: {e}")
+                return False
+            store.mark_written(pending, offsets)
+            return True
+
+    def _index_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Copy of the columns and postings in the current view (no lock needed)."""
+        view = self._view
+        store, count = view.actions, view.count
+        if store._unwritten:
+            return None  # positions are only meaningful once every record is in the journal
+        postings = {}
+        for keyword, ids in list(view.index['by_keyword'].items()):
+            end = _visible(ids, count)
+            if end:
+                postings[keyword] = ids[:end]
+        short_keys = {key: idx for key, idx in list(view.index['by_short_key'].items()) if idx < count}
+        return {
+            'count': count,
+            'type_names': list(store.type_names),
+            'columns': {name: column[:count] for name, column in (
+                ('types', store.types), ('times', store.times),
+                ('offsets', store.offsets), ('lengths', store.lengths))},
+            'postings': postings,
+            'short_keys': short_keys
+        }
+
+    def _write_index(self, snapshot: Dict[str, Any]):
+        count = snapshot['count']
+        offsets, lengths = snapshot['columns']['offsets'], snapshot['columns']['lengths']
+        last = self.journal.read(offsets[-1], lengths[-1]) if count else b""
+        atomic_write_json(self.index_file, {
+            'version': INDEX_VERSION,
+            'byteorder': sys.byteorder,
+            'count': count,
+            'last_record_sha': hashlib.sha256(last).hexdigest() if count else None,
+            'type_names': snapshot['type_names'],
+            'columns': {name: _pack(column) for name, column in snapshot['columns'].items()},
+            'postings': self._encode_postings(snapshot['postings']),
+            'short_keys': self._encode_short_keys(snapshot['short_keys'])
+        })
+        self._indexed_count = max(self._indexed_count, count)
+
+    def checkpoint(self, full_memory: Optional[Dict] = None) -> bool:
+        """Refresh the index file (and the memory file when full_memory is given).
+
+        Actions are already durable in the journal; this only shortens the
+        tail the next load() has to re-index.
+        """
+        if full_memory is not None:
+            return self.save(full_memory)
+        self._write_unwritten()
+        if self._archive_due():
+            self.archive_old_actions()
+        with self._save_lock:
+            snapshot = self._index_snapshot()
+            if snapshot is None:
+                return False
+            try:
+                self._write_index(snapshot)
+                return True
+            except Exception as e:
+                print(f"Error saving memory index: {e}")
+                return False
+
+    def close(self):
+        """Flush and fsync the journal (no full rewrite needed)."""
+        self.journal.close()
+        if self._retired_journal is not None:
+            self._retired_journal.close()
+
+    def save(self, full_memory: Dict) -> bool:
+        """Save the memory file (called by main save_memory) and refresh the index file.
+
+        Actions live in the journal, so vault_actions is dropped from the
+        memory file. Both files are replaced atomically. Returns False if
+        either write failed or some actions are still not in the journal.
+        """
+        full_memory.pop('vault_actions', None)
+        full_memory.pop('journal_seq', None)
+        self._write_unwritten()
+        if self._archive_due():
+            self.archive_old_actions()
+        with self._save_lock:
+            snapshot = self._index_snapshot()
+
+            try:
+                atomic_write_json(self.memory_file, dict(full_memory), indent=2)
+
+                # Index file for fast startup; load() trusts it only if the journal still matches
+                if snapshot is None:
+                    return False
+                self._write_index(snapshot)
+                return True
+            except Exception as e:
+                print(f"Error saving memory index: {e}")
+                return False
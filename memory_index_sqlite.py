@@ -0,0 +1,277 @@
+"""
+Jarvis Memory Index - SQLite backend
+Same interface as MemoryIndex, but actions live on disk in SQLite:
+B-tree indexes on action type and timestamp, and an FTS5 table over the
+description and metadata text. RAM use stays flat however long the history.
+"""
+import json
+import os
+import shutil
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from memory_index import SHORT_KEY, MemoryIndex, atomic_write_json
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS actions (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    action_type TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    metadata TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_actions_type ON actions(action_type, id);
+CREATE INDEX IF NOT EXISTS idx_actions_timestamp ON actions(timestamp);
+"""
+# Ledger short keys ("20260214-wr3") live in the metadata JSON; an expression index makes lookups O(log n)
+SHORT_KEY_EXPR = "lower(json_extract(metadata, '$.short_key'))"
+
+
+def _metadata_text(metadata: Dict) -> str:
+    """Searchable text from metadata values (what MemoryIndex indexes as keywords)."""
+    parts = []
+    for key, value in (metadata or {}).items():
+        if isinstance(value, str):
+            parts.append(value)
+        elif key == 'filename':
+            parts.append(str(value).replace('.', ' ').replace('_', ' '))
+    return " ".join(parts)
+
+
+def load_json_actions(memory_file: str) -> List[Dict]:
+    """Every action in the JSON store, oldest first: archive segments, then the action journal
+    (or vault_actions not yet moved into it)."""
+    index = MemoryIndex(memory_file=memory_file, index_file=os.devnull, checkpoint_every=0)
+    try:
+        archived = [action for month in index.archive.months() for action in index.archive.actions(month)]
+        return archived + list(index.actions)
+    finally:
+        index.close()
+
+
+class SQLiteMemoryIndex:
+    """
+    Drop-in replacement for MemoryIndex backed by SQLite.
+
+    - add_action / search_by_type / search_by_date_range / search_by_keyword /
+      get_last_n / get_stats behave like MemoryIndex
+    - keyword search uses FTS5 (trigram tokenizer when available, so
+      substring matches are indexed too); falls back to LIKE scans when the
+      SQLite build has no FTS5
+    - save() writes the rest of the memory JSON without vault_actions
+    - on first use, actions from an existing JSON memory file are imported
+    """
+
+    def __init__(self, db_file="jarvis_memory.db", memory_file="jarvis_memory.json", import_json=True):
+        self.db_file = db_file
+        self.memory_file = memory_file
+        self.on_checkpoint_due: Optional[Callable[[], None]] = None  # MemoryIndex interface; unused
+        self.on_actions_added: Optional[Callable[[List[Dict]], None]] = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_actions_short_key ON actions({SHORT_KEY_EXPR})")
+        self.fts_tokenizer = self._create_fts()
+        if import_json and self.count() == 0:
+            self._import_json()
+
+    def _create_fts(self) -> Optional[str]:
+        """Create the full-text table; returns the tokenizer in use, or None without FTS5."""
+        row = self._conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'actions_fts'").fetchone()
+        if row:
+            return "trigram" if "trigram" in row['sql'] else "unicode61"
+        for tokenizer in ("trigram", "unicode61"):
+            try:
+                self._conn.execute(
+                    "CREATE VIRTUAL TABLE actions_fts USING fts5("
+                    f"description, metadata, content='', tokenize='{tokenizer}')")
+                return tokenizer
+            except sqlite3.OperationalError:
+                continue
+        print("SQLite memory index: FTS5 unavailable, keyword search will scan")
+        return None
+
+    def _import_json(self):
+        actions = load_json_actions(self.memory_file)
+        if not actions:
+            return
+        backup = self.memory_file + ".pre-sqlite"
+        if os.path.exists(self.memory_file) and not os.path.exists(backup):
+            shutil.copy2(self.memory_file, backup)
+        self.import_actions(actions)
+        print(f"SQLite memory index: imported {len(actions)} actions from {self.memory_file}")
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def import_actions(self, actions: Iterable[Dict]) -> int:
+        """Insert existing action dicts (timestamps kept) in one transaction."""
+        count = 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for action in actions:
+                    self._insert(action)
+                    count += 1
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return count
+
+    def _insert(self, action: Dict) -> int:
+        metadata = action.get('metadata') or {}
+        cursor = self._conn.execute(
+            "INSERT INTO actions (timestamp, action_type, description, metadata) VALUES (?, ?, ?, ?)",
+            (action.get('timestamp') or datetime.now().isoformat(), action.get('action_type', 'unknown'),
+             action.get('description', ''), json.dumps(metadata)))
+        if self.fts_tokenizer:
+            self._conn.execute(
+                "INSERT INTO actions_fts (rowid, description, metadata) VALUES (?, ?, ?)",
+                (cursor.lastrowid, action.get('description', ''), _metadata_text(metadata)))
+        return cursor.lastrowid
+
+    def add_action(self, action_type: str, description: str, metadata: Optional[Dict] = None):
+        """Add new action (committed immediately)."""
+        return self.add_actions([(action_type, description, metadata)])[0]
+
+    def add_actions(self, entries: Iterable[Tuple[str, str, Optional[Dict]]]) -> List[Dict]:
+        """Add (action_type, description, metadata) entries in one transaction."""
+        now = datetime.now().isoformat()
+        actions = [{
+            'timestamp': now,
+            'action_type': action_type,
+            'description': description,
+            'metadata': metadata or {}
+        } for action_type, description, metadata in entries]
+        self.import_actions(actions)
+        if actions and self.on_actions_added is not None:
+            self.on_actions_added(actions)
+        return actions
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [{
+            'timestamp': row['timestamp'],
+            'action_type': row['action_type'],
+            'description': row['description'],
+            'metadata': json.loads(row['metadata'])
+        } for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM actions").fetchone()[0]
+
+    def search_by_type(self, action_type: str, limit: int = 50) -> List[Dict]:
+        """Get recent actions of a specific type."""
+        return self._query(
+            "SELECT * FROM actions WHERE action_type = ? ORDER BY id DESC LIMIT ?", (action_type, limit))
+
+    def search_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Dict]:
+        """Get all actions within a date range (oldest first)."""
+        return self._query(
+            "SELECT * FROM actions WHERE timestamp >= ? AND timestamp <= ? ORDER BY timestamp, id",
+            (start_date.isoformat(), end_date.isoformat()))
+
+    def search_by_keyword(self, keyword: str, limit: int = 50) -> List[Dict]:
+        """Search actions by keyword (filename, description, metadata), most recent first."""
+        keyword = keyword.lower().strip()
+        if not keyword:
+            return []
+        # The trigram tokenizer needs 3+ characters; unicode61 matches whole tokens or prefixes.
+        if self.fts_tokenizer == "trigram" and len(keyword) >= 3:
+            match = '"' + keyword.replace('"', '""') + '"'
+        elif self.fts_tokenizer == "unicode61":
+            match = '"' + keyword.replace('"', '""') + '"*'
+        else:
+            match = None
+        if match:
+            return self._query(
+                "SELECT a.* FROM actions a JOIN (SELECT rowid FROM actions_fts WHERE actions_fts MATCH ? "
+                "ORDER BY rowid DESC LIMIT ?) f ON a.id = f.rowid ORDER BY a.id DESC", (match, limit))
+        pattern = "%" + keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return self._query(
+            "SELECT * FROM actions WHERE lower(description) LIKE ? ESCAPE '\\' "
+            "OR lower(metadata) LIKE ? ESCAPE '\\' ORDER BY id DESC LIMIT ?", (pattern, pattern, limit))
+
+    def get_by_short_key(self, short_key: str) -> Optional[Dict]:
+        """The ledger action stored under a full short key ("20260214-wr3"), or None."""
+        rows = self._query(f"SELECT * FROM actions WHERE {SHORT_KEY_EXPR} = ? ORDER BY id DESC LIMIT 1",
+                           (short_key.strip().lower(),))
+        return rows[0] if rows else None
+
+    def short_key_counters(self, day: str) -> Dict[str, int]:
+        """Highest counter per prefix among the short keys issued on day ("YYYYMMDD")."""
+        with self._lock:
+            keys = [row[0] for row in self._conn.execute(
+                f"SELECT {SHORT_KEY_EXPR} FROM actions WHERE {SHORT_KEY_EXPR} >= ? AND {SHORT_KEY_EXPR} < ?",
+                (day + "-", day + "."))]
+        counters: Dict[str, int] = {}
+        for key in keys:
+            match = SHORT_KEY.match(key or "")
+            if match:
+                counters[match.group(2)] = max(counters.get(match.group(2), 0), int(match.group(3)))
+        return counters
+
+    def get_last_n(self, n: int = 50) -> List[Dict]:
+        """Get last N actions (most recent first)."""
+        return self._query("SELECT * FROM actions ORDER BY id DESC LIMIT ?", (n,))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get memory statistics."""
+        with self._lock:
+            types = dict(self._conn.execute(
+                "SELECT action_type, COUNT(*) FROM actions GROUP BY action_type").fetchall())
+            oldest, newest = self._conn.execute("SELECT MIN(timestamp), MAX(timestamp) FROM actions").fetchone()
+        size = sum(os.path.getsize(p) for p in (self.db_file, self.db_file + "-wal") if os.path.exists(p))
+        return {
+            "total_actions": sum(types.values()),
+            "action_types": types,
+            "oldest_action": oldest,
+            "newest_action": newest,
+            "unique_keywords": None,  # not tracked; FTS5 indexes the text directly
+            "backend": "sqlite",
+            "fts_tokenizer": self.fts_tokenizer,
+            "memory_size_kb": size / 1024
+        }
+
+    # ------------------------------------------------------------------
+    # Persistence (MemoryIndex interface)
+    # ------------------------------------------------------------------
+
+    def save(self, full_memory: Dict) -> bool:
+        """Write the non-action memory (facts, tasks, ...) to the JSON file.
+
+        Actions are already committed to SQLite, so vault_actions is dropped
+        from the JSON (a copy of the original file is kept as *.pre-sqlite).
+        """
+        full_memory.pop('vault_actions', None)
+        full_memory.pop('journal_seq', None)
+        try:
+            atomic_write_json(self.memory_file, dict(full_memory), indent=2)
+            return True
+        except Exception as e:
+            print(f"Error saving memory: {e}")
+            return False
+
+    def checkpoint(self, full_memory: Optional[Dict] = None) -> bool:
+        """Fold the SQLite WAL into the database file."""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return True
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Move the Jarvis action history from jarvis_memory.json into SQLite.
+
+Reads the action journal (plus any vault_actions not yet moved into it)
+and writes them to the SQLite memory index. Set "memory_backend": "sqlite"
+in config.json afterwards. The JSON files are left as they are.
+
+Usage:
+  python migrate_memory_to_sqlite.py
+  python migrate_memory_to_sqlite.py --memory jarvis_memory.json --db jarvis_memory.db --force
+"""
+
+import argparse
+import os
+import time
+from typing import List, Optional
+
+from memory_index_sqlite import SQLiteMemoryIndex, load_json_actions
+
+
+def migrate(memory_file: str, db_file: str, force: bool = False) -> int:
+    """Copy every JSON action into db_file; returns the number imported."""
+    actions = load_json_actions(memory_file)
+    if force and os.path.exists(db_file):
+        for path in (db_file, db_file + "-wal", db_file + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+    index = SQLiteMemoryIndex(db_file=db_file, memory_file=memory_file, import_json=False)
+    try:
+        existing = index.count()
+        if existing:
+            raise SystemExit(f"{db_file} already holds {existing} actions (use --force to rebuild it)")
+        return index.import_actions(actions)
+    finally:
+        index.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Migrate the JSON action history into the SQLite memory index")
+    parser.add_argument("--memory", default="jarvis_memory.json", help="JSON memory file to read")
+    parser.add_argument("--db", default="jarvis_memory.db", help="SQLite database to create")
+    parser.add_argument("--force", action="store_true", help="Delete an existing database first")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    count = migrate(args.memory, args.db, force=args.force)
+    print(f"Imported {count} actions from {args.memory} into {args.db} "
+          f"in {time.perf_counter() - started:.2f}s")
+    print('Set "memory_backend": "sqlite" in config.json to use it.')
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
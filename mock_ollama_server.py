@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Mock Ollama server for offline latency testing.
+
+Serves /api/generate, /api/chat and /api/tags with the same response shape as
+Ollama (including prompt_eval_count/eval_count and ns durations). Latency is
+simulated as load + prefill-per-token * prompt tokens + decode-per-token *
+output tokens, and streaming requests get NDJSON chunks paced by the decode rate.
+
+Usage:
+  python mock_ollama_server.py --port 11434 --prefill-ms 0.5 --decode-ms 20
+  python mock_ollama_server.py --canned benchmarks/mock_ollama_canned.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+DEFAULT_RESPONSE = "Understood. Here is a short answer from the mock brain."
+
+
+def count_tokens(text: str) -> int:
+    """Rough token count (whitespace words), good enough for latency shaping."""
+    return max(1, len((text or "").split()))
+
+
+class MockOllamaServer:
+    """Threaded stand-in for an Ollama endpoint. Use port=0 for an ephemeral port."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        prefill_ms_per_token: float = 0.0,
+        decode_ms_per_token: float = 0.0,
+        load_ms: float = 0.0,
+        canned: Optional[Dict[str, str]] = None,
+        default_response: str = DEFAULT_RESPONSE,
+        models: Optional[List[str]] = None,
+        error_status: Optional[int] = None,
+    ):
+        self.prefill_ms_per_token = float(prefill_ms_per_token)
+        self.decode_ms_per_token = float(decode_ms_per_token)
+        self.load_ms = float(load_ms)
+        self.canned = dict(canned or {})  # prompt substring (case-insensitive) -> response
+        self.default_response = default_response
+        self.models = list(models or ["llama3.2:latest", "qwen2.5-coder:14b"])
+        self.error_status = error_status  # answer generate/chat with this HTTP status (e.g. 500)
+        self.requests: List[Dict] = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def generate_url(self) -> str:
+        return f"{self.base_url}/api/generate"
+
+    @property
+    def chat_url(self) -> str:
+        return f"{self.base_url}/api/chat"
+
+    def start(self) -> "MockOllamaServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def pick_response(self, prompt: str) -> str:
+        lowered = (prompt or "").lower()
+        for needle, response in self.canned.items():
+            if needle.lower() in lowered:
+                return response
+        return self.default_response
+
+    def _record(self, path: str, body: Dict) -> None:
+        with self._lock:
+            self.requests.append({"path": path, "body": body, "time": time.time()})
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, fmt, *args):
+                pass
+
+            def _send_json(self, status: int, payload: Dict) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/api/tags":
+                    self._send_json(200, {"models": [{"name": m, "model": m} for m in server.models]})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    self._send_json(400, {"error": "invalid JSON"})
+                    return
+                path = self.path.rstrip("/")
+                if path not in ("/api/generate", "/api/chat"):
+                    self._send_json(404, {"error": "not found"})
+                    return
+                server._record(path, body)
+                if server.error_status:
+                    self._send_json(server.error_status, {"error": "mock failure"})
+                    return
+
+                chat = path == "/api/chat"
+                if chat:
+                    prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+                else:
+                    prompt = "\n".join(filter(None, [body.get("system", ""), body.get("prompt", "")]))
+                answer = server.pick_response(prompt)
+                words = answer.split(" ")
+                num_predict = (body.get("options") or {}).get("num_predict")
+                if isinstance(num_predict, int) and num_predict > 0:
+                    words = words[:num_predict]
+                    answer = " ".join(words)
+
+                model = body.get("model", server.models[0])
+                prompt_tokens = count_tokens(prompt)
+                load_s = server.load_ms / 1000.0
+                prefill_s = server.prefill_ms_per_token * prompt_tokens / 1000.0
+                decode_step_s = server.decode_ms_per_token / 1000.0
+                started = time.perf_counter()
+                time.sleep(load_s + prefill_s)
+
+                def chunk(text: str, done: bool) -> Dict:
+                    item = {"model": model, "created_at": datetime.now(timezone.utc).isoformat(), "done": done}
+                    if chat:
+                        item["message"] = {"role": "assistant", "content": text}
+                    else:
+                        item["response"] = text
+                    return item
+
+                def stats() -> Dict:
+                    total_s = time.perf_counter() - started
+                    return {
+                        "done_reason": "stop",
+                        "total_duration": int(total_s * 1e9),
+                        "load_duration": int(load_s * 1e9),
+                        "prompt_eval_count": prompt_tokens,
+                        "prompt_eval_duration": int(prefill_s * 1e9),
+                        "eval_count": len(words),
+                        "eval_duration": int(len(words) * decode_step_s * 1e9),
+                    }
+
+                # Ollama streams unless the client explicitly disables it.
+                if body.get("stream", True):
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/x-ndjson")
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for idx, word in enumerate(words):
+                        time.sleep(decode_step_s)
+                        self._write_chunk(chunk(word if idx == 0 else " " + word, False))
+                    final = chunk("", True)
+                    final.update(stats())
+                    self._write_chunk(final)
+                    self.wfile.write(b"0\r\n\r\n")
+                    return
+
+                time.sleep(decode_step_s * len(words))
+                payload = chunk(answer, True)
+                payload.update(stats())
+                self._send_json(200, payload)
+
+            def _write_chunk(self, item: Dict) -> None:
+                data = (json.dumps(item) + "\n").encode("utf-8")
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def load_canned(path: Optional[str]) -> Dict[str, str]:
+    if not path:
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Mock Ollama server for offline latency tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--prefill-ms", type=float, default=0.5, help="Simulated prefill ms per prompt token")
+    parser.add_argument("--decode-ms", type=float, default=20.0, help="Simulated decode ms per output token")
+    parser.add_argument("--load-ms", type=float, default=0.0, help="Simulated model load ms per request")
+    parser.add_argument("--canned", help="JSON file mapping prompt substrings to responses")
+    args = parser.parse_args()
+
+    server = MockOllamaServer(
+        host=args.host,
+        port=args.port,
+        prefill_ms_per_token=args.prefill_ms,
+        decode_ms_per_token=args.decode_ms,
+        load_ms=args.load_ms,
+        canned=load_canned(args.canned),
+    )
+    print(f"Mock Ollama listening on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -74,6 +74,8 @@ required_files = {
     "jarvis_main.py":       "Main application",
     "dashboard_bridge.py":  "Dashboard WebSocket bridge",
     "memory_index.py":      "Memory index module",
+    "memory_index_sqlite.py": "SQLite memory backend",
+    "memory_archive.py": "Monthly memory archive segments",
 }
 optional_files = {
     ".env":             "Environment config",
@@ -700,6 +702,9 @@ try:
     facts = mem.get("facts", [])
     projects = mem.get("projects", {})
     actions = mem.get("vault_actions", [])
+    if os.path.exists("jarvis_memory_actions.jsonl"):
+        with open("jarvis_memory_actions.jsonl", "r", encoding="utf-8") as f:
+            actions = [line for line in f if line.strip()]
     tasks = mem.get("tasks", [])
     profile = mem.get("master_profile", {})
 
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Routing microbenchmark for the pre-dispatch stages of process_conversation.
+
+Runs every utterance in a labelled corpus through check_pending_confirmation,
+_handle_contextual_command, _route_by_context, _match_intent and
+_classify_intent (the same order process_conversation uses) with every
+intent handler stubbed, then reports per-stage us/turn, routing accuracy and
+a confusion matrix.
+
+Compares accuracy and misroutes against the committed
+benchmarks/routing_baseline.json by default and exits 1 on a regression;
+refresh the baseline with --json after an intended routing change. Stage
+timings depend on the machine, so comparing them is opt-in (--timings).
+
+Usage:
+  python routing_benchmark.py
+  python routing_benchmark.py --runs 20 --json benchmarks/routing_latest.json
+  python routing_benchmark.py --baseline benchmarks/routing_latest.json --timings --tolerance 0.5
+  python routing_benchmark.py --runs 20 --no-baseline --json benchmarks/routing_baseline.json
+  python routing_benchmark.py --classifier   # include the embedding classifier (vault embeddings)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+from unittest.mock import MagicMock, patch
+
+from jarvis_main import INTENT_CLASSIFIER_THRESHOLD, INTENT_EXAMPLES, INTENTS
+from run_live_session_silent import build_jarvis_for_silent_tests
+from turn_latency_benchmark import percentile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS = os.path.join(HERE, "benchmarks", "routing_corpus.json")
+DEFAULT_BASELINE = os.path.join(HERE, "benchmarks", "routing_baseline.json")
+
+# Pre-dispatch stages in process_conversation order: (label, method).
+STAGES = [
+    ("confirmation", "check_pending_confirmation"),
+    ("short_key", "_handle_contextual_command"),
+    ("context_route", "_route_by_context"),
+    ("intent_match", "_match_intent"),
+    ("embedding_match", "_classify_intent"),
+]
+STAGE_OUTCOMES = {
+    "confirmation": "<confirmation>",
+    "short_key": "<short_key>",
+    "context_route": "<context>",
+}
+
+# Items every case can reference by short key.
+SESSION_ITEMS = [
+    ("e1", "e", "Build Update", {"sender": "Alice <alice@example.com>", "subject": "Build Update", "snippet": "Looks good."}),
+    ("wr1", "w", "Python Decorators Guide", {"url": "https://example.com/decorators", "snippet": "A tutorial."}),
+    ("n1", "news", "Headline 1", {"url": "https://example.com/n1", "description": "Story 1."}),
+    ("c1", "c", "Optimization Report", {"summary": "Report body."}),
+]
+
+# Side-effecting helpers reached from the pre-dispatch stages.
+EXTRA_STUBS = ["fallback_to_llm", "handle_deep_dig", "reply_to_email", "create_calendar_event",
+               "log_vault_action", "add_to_context", "get_calendar"]
+
+
+def build_router(fired: List[str], classifier=None):
+    """Silent-harness Jarvis whose handlers only record that they were called."""
+    j = build_jarvis_for_silent_tests()
+    j.intent_classifier = classifier
+    names = {cfg["handler"] for cfg in INTENTS.values()} | set(EXTRA_STUBS)
+    for name in names:
+        def stub(*args, _name=name, **kwargs):
+            fired.append(_name)
+            return True
+        stub.__name__ = name
+        setattr(j, name, stub)
+    for alias, item_type, label, meta in SESSION_ITEMS:
+        j.session_context.add_item(f"bench-{alias}", label, item_type, dict(meta))
+    return j
+
+
+def reset_state(j, state: Optional[Dict]) -> None:
+    j.pending_reply = None
+    j.pending_calendar_title = None
+    j.last_intent = None
+    for key, value in (state or {}).items():
+        setattr(j, key, json.loads(json.dumps(value)))
+
+
+def route_once(j, text: str, fired: List[str], samples: Dict[str, List[float]]) -> Dict:
+    """Run the pre-dispatch pipeline; returns the outcome label and the handler that ran."""
+    del fired[:]
+    text_lower = text.lower().strip()
+    outcome = None
+    for stage, method in STAGES:
+        fn = getattr(j, method)
+        started = time.perf_counter()
+        if stage == "context_route":
+            result = fn(text, text_lower)
+        else:
+            result = fn(text)
+        samples[stage].append((time.perf_counter() - started) * 1e6)
+        if stage in ("intent_match", "embedding_match"):
+            intent_name, _cfg, handler = result
+            if intent_name:
+                outcome = intent_name
+                handler(text)
+                break
+            continue
+        if result:
+            outcome = STAGE_OUTCOMES[stage]
+            break
+    if outcome is None:
+        outcome = "<fallback>"
+        j.fallback_to_llm(text)
+    return {"outcome": outcome, "handler": fired[0] if fired else None}
+
+
+def build_classifier():
+    """Embedding classifier on the vault's embedding runtime (OpenVINO if present, else hash)."""
+    from core.intent_classifier import EmbeddingIntentClassifier
+    from vault_reference import VaultReference
+
+    vault = VaultReference()
+    classifier = EmbeddingIntentClassifier(vault._embed_text, INTENT_EXAMPLES, threshold=INTENT_CLASSIFIER_THRESHOLD)
+    classifier.warm()
+    print(f"Embedding classifier on {vault.embedding_backend} backend")
+    return classifier
+
+
+def run_benchmark(cases: List[Dict], runs: int = 10, classifier=None) -> Dict:
+    fired: List[str] = []
+    samples: Dict[str, List[float]] = defaultdict(list)
+    turn_us: List[float] = []
+    confusion: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    misroutes = []
+
+    with patch("webbrowser.open", MagicMock()):
+        j = build_router(fired, classifier)
+        for run in range(max(1, runs)):
+            for case in cases:
+                reset_state(j, case.get("state"))
+                before = {stage: len(samples[stage]) for stage, _ in STAGES}
+                result = route_once(j, case["text"], fired, samples)
+                turn_us.append(sum(sum(samples[stage][before[stage]:]) for stage, _ in STAGES))
+                if run:
+                    continue  # accuracy is deterministic; score the first run only
+                expected = case["expect"]
+                confusion[expected][result["outcome"]] += 1
+                ok = result["outcome"] == expected
+                if ok and case.get("handler"):
+                    ok = result["handler"] == case["handler"]
+                if not ok:
+                    misroutes.append({"text": case["text"], "expect": expected,
+                                      "expect_handler": case.get("handler"), **result})
+
+    stages = {}
+    for stage, values in list(samples.items()) + [("turn", turn_us)]:
+        stages[stage] = {
+            "count": len(values),
+            "mean_us": round(sum(values) / len(values), 2) if values else 0.0,
+            "p50_us": round(percentile(values, 50), 2),
+            "p95_us": round(percentile(values, 95), 2),
+        }
+    correct = len(cases) - len(misroutes)
+    return {
+        "runs": runs,
+        "cases": len(cases),
+        "accuracy": round(correct / len(cases), 4) if cases else 0.0,
+        "stages": stages,
+        "confusion": {exp: dict(got) for exp, got in sorted(confusion.items())},
+        "misroutes": misroutes,
+    }
+
+
+def compare_to_baseline(report: Dict, baseline: Dict, tolerance: Optional[float] = None,
+                        metric: str = "p50_us") -> List[str]:
+    """Regression messages: accuracy drops, newly misrouted utterances, and (given a tolerance) slower stages."""
+    regressions = []
+    if report["accuracy"] < baseline.get("accuracy", 0.0):
+        regressions.append(f"accuracy {report['accuracy']:.2%} < baseline {baseline['accuracy']:.2%}")
+    old = {m["text"] for m in baseline.get("misroutes", [])}
+    for m in report["misroutes"]:
+        if m["text"] not in old:
+            regressions.append(f"new misroute: '{m['text']}' -> {m['outcome']} ({m['handler']}), expected {m['expect']}")
+    if tolerance is None:
+        return regressions
+    for stage, current in report["stages"].items():
+        base = baseline.get("stages", {}).get(stage)
+        if not base or base.get(metric, 0) <= 0:
+            continue
+        limit = base[metric] * (1.0 + tolerance)
+        if current[metric] > limit:
+            regressions.append(f"{stage}: {metric} {current[metric]:.1f}us > {limit:.1f}us (baseline {base[metric]:.1f}us)")
+    return regressions
+
+
+def print_report(report: Dict) -> None:
+    print(f"\nRouting benchmark ({report['cases']} utterances x {report['runs']} run(s))")
+    print(f"  {'stage':<14} {'n':>6} {'mean':>10} {'p50':>10} {'p95':>10}")
+    for stage in [s for s, _ in STAGES] + ["turn"]:
+        row = report["stages"].get(stage)
+        if row:
+            print(f"  {stage:<14} {row['count']:>6} {row['mean_us']:>8.1f}us {row['p50_us']:>8.1f}us {row['p95_us']:>8.1f}us")
+
+    print(f"\nAccuracy: {report['accuracy']:.1%}")
+    labels = sorted(set(report["confusion"]) | {g for row in report["confusion"].values() for g in row})
+    off_diagonal = [(exp, got, n) for exp, row in report["confusion"].items() for got, n in row.items() if got != exp]
+    if off_diagonal:
+        print("\nConfusion (expected -> routed):")
+        for exp, got, n in sorted(off_diagonal):
+            print(f"  {exp:<20} -> {str(got):<20} x{n}")
+    print(f"  ({len(labels)} labels; diagonal omitted)")
+    for m in report["misroutes"]:
+        print(f"  MISROUTE '{m['text']}': got {m['outcome']} ({m['handler']}), expected {m['expect']} ({m['expect_handler']})")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time the pre-dispatch routing stages and score routing accuracy")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="JSON file with {'cases': [{'text', 'expect', ...}]}")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--json", dest="json_out", help="Write the report to this path")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Compare against a previous --json report")
+    parser.add_argument("--no-baseline", action="store_true", help="Skip the baseline comparison")
+    parser.add_argument("--timings", action="store_true",
+                        help="Also fail on stages slower than the baseline (same machine only)")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown vs baseline with --timings (0.5 = 50%%)")
+    parser.add_argument("--classifier", action="store_true", help="Enable the embedding intent classifier stage")
+    args = parser.parse_args(argv)
+
+    with open(args.corpus, "r", encoding="utf-8") as f:
+        cases = json.load(f)["cases"]
+
+    report = run_benchmark(cases, runs=args.runs, classifier=build_classifier() if args.classifier else None)
+    print_report(report)
+    if args.json_out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json_out)), exist_ok=True)
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json_out}")
+
+    if args.baseline and not args.no_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.tolerance if args.timings else None)
+        if regressions:
+            print("\nRouting regressions:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\nNo routing regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,5 @@
 import os
+import threading
 from datetime import datetime
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
@@ -67,6 +68,7 @@ def build_jarvis_for_silent_tests():
     j.status_var = SimpleNamespace(set=lambda _x: None)
 
     j.memory = {"facts": [], "projects": {}, "tasks": []}
+    j.memory_lock = threading.RLock()
     j.tasks = []
     j.context_buffer = []
     j.pending_reply = None
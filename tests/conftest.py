@@ -0,0 +1,32 @@
+"""Shared fixtures for the memory tests."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import json
+
+import pytest
+
+from memory_index import MemoryIndex
+
+
+@pytest.fixture
+def index_options():
+    """Extra MemoryIndex arguments for every make_index() in a module; override it there."""
+    return {}
+
+
+@pytest.fixture
+def make_index(tmp_path, index_options):
+    """Factory for a MemoryIndex over tmp_path/memory.json; call it again to reload from disk.
+
+    actions, when given, are written to memory.json as vault_actions first.
+    """
+    def build(actions=None, **kwargs):
+        if actions is not None:
+            with open(tmp_path / "memory.json", "w") as f:
+                json.dump({"facts": [], "vault_actions": actions}, f)
+        options = {"fsync": "never", **index_options, **kwargs}
+        return MemoryIndex(memory_file=str(tmp_path / "memory.json"),
+                           index_file=str(tmp_path / "memory_index.json"), **options)
+    return build
@@ -0,0 +1,148 @@
+"""Test embedding recall over the action history (paraphrases, recency, incremental build, persistence)."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import time
+from datetime import datetime, timedelta
+
+from core.action_recall import ActionRecallIndex, action_text
+
+# Toy sentence embedder: words sharing a concept land on the same dimension,
+# the way a real model places paraphrases close together.
+CONCEPTS = [
+    {"email", "emailed", "replied", "reply", "wrote", "message"},
+    {"landlord", "lettings", "rent", "lease"},
+    {"garden", "plants", "lawn"},
+    {"code", "optimization", "analysis", "jarvis_main.py"},
+    {"dentist", "appointment", "teeth"},
+]
+
+
+def concept_embed(text):
+    words = [w.strip(".,?!@") for w in text.lower().replace("@", " ").replace(".co.uk", "").split()]
+    return [float(sum(1 for w in words if w in concept)) for concept in CONCEPTS]
+
+
+def make_recall(tmp_path, **kwargs):
+    kwargs.setdefault("window_days", 0)  # the fixtures use fixed dates
+    return ActionRecallIndex(concept_embed, path=str(tmp_path / "vectors"), backend="test", **kwargs)
+
+
+def test_paraphrase_finds_action_keyword_search_misses(tmp_path, make_index):
+    memory = make_index()
+    recall = make_recall(tmp_path)
+    memory.on_actions_added = recall.add_actions
+    memory.add_action("email_reply", "Replied to john@lettings.co.uk", {"message_preview": "Rent is paid"})
+    memory.add_action("note", "Garden plans for spring")
+    assert recall.flush(timeout=5)
+
+    assert memory.search_by_keyword("email the landlord") == []
+    hits = recall.search("email the landlord", limit=1, min_similarity=0.5)
+    assert [h["description"] for h in hits] == ["Replied to john@lettings.co.uk"]
+    assert recall.search("book the dentist", min_similarity=0.5) == []
+
+
+def test_recency_breaks_ties(tmp_path):
+    now = datetime(2026, 3, 1, 12, 0)
+    recall = make_recall(tmp_path, half_life_days=30)
+    recall._append([
+        {"timestamp": (now - timedelta(days=300)).isoformat(), "description": "Emailed the landlord"},
+        {"timestamp": (now - timedelta(days=2)).isoformat(), "description": "Emailed the landlord"},
+        {"timestamp": (now - timedelta(days=1)).isoformat(), "description": "Watered the garden"},
+    ])
+    hits = recall.search("message to the landlord", limit=2, now=now)
+    assert [h["timestamp"] for h in hits] == [(now - timedelta(days=2)).isoformat(),
+                                              (now - timedelta(days=300)).isoformat()]
+    assert hits[0]["score"] > hits[1]["score"]
+    assert hits[0]["similarity"] == hits[1]["similarity"]
+
+
+def test_sync_embeds_history_then_only_the_tail(tmp_path, make_index):
+    memory = make_index([
+        {"timestamp": "2026-01-05T09:00:00", "action_type": "file_read", "description": "Code analysis for jarvis_main.py"},
+        {"timestamp": "2026-01-06T10:00:00", "action_type": "email_reply", "description": "Replied about the rent"},
+    ])
+    recall = make_recall(tmp_path)
+    assert recall.sync(memory) == 2
+    memory.add_action("note", "Booked the dentist appointment")
+
+    embedded = []
+    reloaded = ActionRecallIndex(lambda t: embedded.append(t) or concept_embed(t), path=str(tmp_path / "vectors"),
+                                 backend="test", window_days=0)
+    assert reloaded.sync(memory) == 1
+    assert embedded == ["Booked the dentist appointment"]
+    assert len(reloaded) == 3
+    assert reloaded.search("teeth", limit=1)[0]["description"] == "Booked the dentist appointment"
+    assert reloaded.search("optimization", limit=1)[0]["action_type"] == "file_read"
+
+
+def test_backend_change_re_embeds_everything(tmp_path, make_index):
+    memory = make_index([
+        {"timestamp": "2026-01-05T09:00:00", "action_type": "note", "description": "Garden plans"},
+    ])
+    make_recall(tmp_path).sync(memory)
+    other = ActionRecallIndex(concept_embed, path=str(tmp_path / "vectors"), backend="openvino", window_days=0)
+    assert other.sync(memory) == 1
+    assert len(other) == 1
+
+
+def test_action_text_includes_short_metadata():
+    text = action_text({"description": "Replied", "metadata": {"recipient": "john@lettings.co.uk",
+                                                               "short_key": "20260214-e1", "body": "x" * 500}})
+    assert text == "Replied john@lettings.co.uk"
+
+
+def test_logging_does_not_wait_for_the_initial_sync(tmp_path, make_index):
+    now = datetime.now()
+    memory = make_index([
+        {"timestamp": (now - timedelta(hours=i)).isoformat(), "action_type": "note", "description": f"note {i}"}
+        for i in reversed(range(40))])
+
+    def slow_embed(text):
+        time.sleep(0.01)
+        return concept_embed(text)
+    recall = ActionRecallIndex(slow_embed, path=str(tmp_path / "vectors"), backend="test")
+    recall.sync_in_background(memory)
+    memory.on_actions_added = recall.add_actions
+    started = time.monotonic()
+    memory.add_action("note", "Watered the garden")
+    assert time.monotonic() - started < 0.2
+    assert recall.flush(timeout=10)
+    assert len(recall) == 41
+    assert recall.search("lawn", limit=1)[0]["description"] == "Watered the garden"
+
+
+def test_conversation_turns_are_not_indexed(tmp_path, make_index):
+    memory = make_index()
+    recall = make_recall(tmp_path)
+    memory.on_actions_added = recall.add_actions
+    memory.add_action("conversation", "User asked: did I email the landlord?", {"user_query": "email the landlord"})
+    memory.add_action("note", "Garden plans for spring")
+    assert recall.flush(timeout=5)
+    assert len(recall) == 1
+    assert recall.search("email the landlord", min_similarity=0.5) == []
+
+
+def test_rows_are_bounded_by_window_and_count(tmp_path):
+    now = datetime.now()
+    recall = make_recall(tmp_path, window_days=30, max_rows=10)
+    recall._append([{"timestamp": (now - timedelta(days=d)).isoformat(), "description": f"Watered the garden {d}"}
+                    for d in [60] + list(range(11, 0, -1))])
+    # Over max_rows: trimmed to 90% of it, newest first, and the 60-day-old row is gone
+    assert [h["description"] for h in recall.search("garden", limit=20)] == [
+        f"Watered the garden {d}" for d in range(1, 10)]
+    assert len(recall) == 9
+
+
+def test_trim_leaves_headroom_for_later_appends(tmp_path):
+    now = datetime.now()
+    recall = make_recall(tmp_path, window_days=30, max_rows=300)
+    recall._append([{"timestamp": now.isoformat(), "description": f"note {i}"} for i in range(301)])
+    assert len(recall) == 270
+    matrix = recall._rows.matrix
+    for i in range(30):
+        recall._append([{"timestamp": now.isoformat(), "description": f"later {i}"}])
+    # The next 30 appends fill the spare rows in place instead of reallocating
+    assert recall._rows.matrix is matrix
+    assert len(recall) == 300
@@ -0,0 +1,104 @@
+"""Test multi-host brain routing, health probes and failover against mock Ollama hosts."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import socket
+import time
+
+import pytest
+import requests
+
+from core.brain_pool import BrainEndpoint, BrainPool
+from mock_ollama_server import MockOllamaServer
+
+
+def dead_url():
+    """A localhost URL nothing is listening on."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}/api/generate"
+
+
+def test_routes_by_model_availability_after_probe():
+    with MockOllamaServer(models=["llama3.2:latest"]) as small, MockOllamaServer(models=["qwen2.5:14b"]) as big:
+        pool = BrainPool.from_config("unused", [small.base_url, big.base_url])
+        pool.probe_all()
+        resp, endpoint = pool.post({"model": "qwen2.5:14b", "prompt": "hi", "stream": False}, timeout=5)
+        assert resp.json()["done"] is True
+        assert endpoint.base_url == big.base_url
+        _, endpoint = pool.post({"model": "llama3.2", "prompt": "hi", "stream": False}, timeout=5)
+        assert endpoint.base_url == small.base_url
+        pool.stop()
+
+
+def test_fails_over_on_connection_error_and_marks_host_down():
+    with MockOllamaServer() as live:
+        down = BrainEndpoint(url=dead_url(), ewma_ms=1.0)  # looks fastest, but is offline
+        pool = BrainPool([down, BrainEndpoint(url=live.generate_url, ewma_ms=50.0)])
+        _, endpoint = pool.post({"model": "m", "prompt": "hi", "stream": False}, timeout=5)
+        assert endpoint.base_url == live.base_url
+        assert down.healthy is False
+        assert pool.parallelism() == 1
+        pool.stop()
+
+
+def test_fails_over_on_server_error():
+    with MockOllamaServer(error_status=500) as broken, MockOllamaServer() as live:
+        pool = BrainPool([BrainEndpoint(url=broken.generate_url, ewma_ms=1.0),
+                          BrainEndpoint(url=live.generate_url, ewma_ms=50.0)])
+        resp, endpoint = pool.post({"model": "m", "prompt": "hi", "stream": False}, timeout=5)
+        assert resp.status_code == 200 and endpoint.base_url == live.base_url
+        assert len(broken.requests) == 1
+        assert pool.endpoints[0].healthy is False
+
+        live.error_status = 503  # every host failing hands back the last error reply
+        resp, _ = pool.post({"model": "m", "prompt": "hi", "stream": False}, timeout=5)
+        assert resp.status_code in (500, 503)
+        pool.stop()
+
+
+def test_read_timeout_is_raised_without_failing_over():
+    with MockOllamaServer(load_ms=2000) as slow, MockOllamaServer() as live:
+        pool = BrainPool([BrainEndpoint(url=slow.generate_url, ewma_ms=1.0),
+                          BrainEndpoint(url=live.generate_url, ewma_ms=50.0)])
+        with pytest.raises(requests.exceptions.ReadTimeout):  # callers downgrade the tier on this
+            pool.post({"model": "m", "prompt": "hi", "stream": False}, timeout=0.3)
+        assert live.requests == []  # the budget was not spent again on another host
+        assert pool.endpoints[0].healthy is True
+        assert pool.endpoints[0].failures == 0
+        pool.stop()
+
+
+def test_prefers_lower_latency_and_spreads_fan_out():
+    # ~250ms vs ~100ms per call: the fast host takes calls until its queue makes it the slower choice
+    with MockOllamaServer(decode_ms_per_token=25) as slow, MockOllamaServer(decode_ms_per_token=10) as fast:
+        pool = BrainPool([BrainEndpoint(url=slow.generate_url), BrainEndpoint(url=fast.generate_url)])
+        for _ in range(2):
+            pool.post({"model": "m", "prompt": "warm", "stream": False}, timeout=5)
+        assert len(slow.requests) == 1 and len(fast.requests) == 1
+        assert pool.candidates("m")[0].base_url == fast.base_url
+
+        results = pool.map(lambda i: pool.post({"model": "m", "prompt": str(i), "stream": False}, timeout=5)[1].base_url, range(4))
+        assert len(results) == 4 and set(results) <= {slow.base_url, fast.base_url}
+        assert results.count(fast.base_url) >= 2  # the first two calls cannot outweigh the slow host
+        assert len(slow.requests) + len(fast.requests) == 6
+        assert [(e.healthy, e.failures, e.inflight) for e in pool.endpoints] == [(True, 0, 0), (True, 0, 0)]
+        pool.stop()
+
+
+def test_fan_out_reports_time_spent_waiting_for_a_worker():
+    pool = BrainPool([BrainEndpoint(url=dead_url())])  # two workers
+
+    def task(i):
+        waited = pool.take_queue_ms()
+        time.sleep(0.1)
+        return waited, pool.take_queue_ms()
+
+    results = pool.map(task, range(3))
+    assert results[0][0] < 50 and results[1][0] < 50
+    assert results[2][0] >= 80  # queued behind the first two
+    assert all(again == 0.0 for _, again in results)  # reported to the first brain call only
+    assert pool.take_queue_ms() == 0.0  # outside a task
+    pool.stop()
@@ -0,0 +1,62 @@
+"""Test record/replay of requests and callables through core.cassette."""
+import json
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import time
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from core.cassette import Cassette, CassetteMiss
+from mock_ollama_server import MockOllamaServer
+
+
+def test_record_then_replay_offline_with_scaled_latency(tmp_path):
+    path = str(tmp_path / "brain.json")
+    with MockOllamaServer(decode_ms_per_token=10, default_response="alpha beta gamma delta") as server:
+        url = server.generate_url
+        with Cassette(path, mode="record"):
+            recorded = requests.post(url, json={"model": "m", "prompt": "hi", "stream": False}, timeout=5).json()
+            requests.get(f"{server.base_url}/api/tags", params={"apiKey": "secret"}, timeout=5)
+
+    saved = open(path, encoding="utf-8").read()
+    assert "secret" not in saved
+    assert json.loads(saved)["interactions"][0]["elapsed_ms"] >= 40
+
+    # Server is gone; replay must not touch the network.
+    with Cassette(path, mode="replay", latency_scale=0) as cassette:
+        started = time.perf_counter()
+        replayed = requests.post(url, json={"model": "m", "prompt": "hi", "stream": False}, timeout=5)
+        assert (time.perf_counter() - started) < 0.03
+        requests.get(f"{url.rsplit('/api', 1)[0]}/api/tags", params={"apiKey": "other"}, timeout=5)
+        with pytest.raises(CassetteMiss):
+            requests.post(url, json={"model": "m", "prompt": "different"}, timeout=5)
+    assert replayed.json() == recorded
+    assert cassette.hits == 2
+    assert requests.post.__module__ == "requests.api"  # patches removed on exit
+
+
+def test_recorded_errors_replay_as_the_same_exception(tmp_path):
+    path = str(tmp_path / "errors.json")
+    with Cassette(path, mode="record"):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            requests.get("http://127.0.0.1:9/unreachable", timeout=1)
+    with Cassette(path, mode="replay", latency_scale=0):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            requests.get("http://127.0.0.1:9/unreachable", timeout=1)
+
+
+def test_patch_callable_records_return_values(tmp_path):
+    path = str(tmp_path / "search.json")
+    owner = SimpleNamespace(google_search=lambda q, structured=False: [{"title": q.upper()}])
+    with Cassette(path, mode="record") as cassette:
+        cassette.patch_callable(owner, "google_search")
+        assert owner.google_search("python", structured=True) == [{"title": "PYTHON"}]
+
+    owner.google_search = lambda q, structured=False: pytest.fail("live search called during replay")
+    with Cassette(path, mode="replay", latency_scale=0) as cassette:
+        cassette.patch_callable(owner, "google_search")
+        assert owner.google_search("python", structured=True) == [{"title": "PYTHON"}]
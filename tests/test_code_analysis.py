@@ -0,0 +1,150 @@
+"""Test chunked map-reduce code analysis and its content-hash cache."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from core.code_analysis import ChunkedCodeAnalyzer, split_into_chunks
+
+
+def make_source(functions=6, body_lines=20):
+    parts = ["import os\n\n"]
+    for i in range(functions):
+        body = "".join(f"    x{j} = {j} + {i}\n" for j in range(body_lines))
+        parts.append(f"def func_{i}():\n{body}    return x0\n\n\n")
+    return "".join(parts)
+
+
+class FakeModel:
+    def __init__(self):
+        self.prompts = []
+
+    def __call__(self, prompt, timeout):
+        self.prompts.append(prompt)
+        if "Section-by-section findings" in prompt:
+            return "Final report"
+        return "Lines 1-2 | slow loop | faster | use a set"
+
+
+def test_chunks_follow_function_boundaries():
+    source = make_source()
+    chunks = split_into_chunks(source, "sample.py", max_chars=1000)
+    assert len(chunks) > 1
+    assert "".join(c.text for c in chunks) == source
+    for chunk in chunks:
+        assert len(chunk.text) <= 1000
+        assert not chunk.text.startswith("    ")  # never cut inside a function body
+    assert chunks[0].start_line == 1
+    assert chunks[-1].end_line == len(source.splitlines())
+
+
+def test_large_class_split_per_method():
+    methods = "".join(f"    def m{i}(self):\n" + "        pass\n" * 40 for i in range(4))
+    source = f"class Big:\n{methods}"
+    chunks = split_into_chunks(source, "big.py", max_chars=800)
+    assert len(chunks) >= 4
+    assert any("Big.m3" in c.label for c in chunks)
+
+
+def test_small_file_uses_single_call():
+    model = FakeModel()
+    analyzer = ChunkedCodeAnalyzer(model)
+    report = analyzer.analyze("tiny.py", "print('hello')\n", context="ARCH")
+    assert report == "Lines 1-2 | slow loop | faster | use a set"
+    assert len(model.prompts) == 1
+    assert "print('hello')" in model.prompts[0]
+
+
+def test_map_reduce_call_count():
+    model = FakeModel()
+    mapped = []
+
+    def map_fn(fn, items):
+        items = list(items)
+        mapped.append(len(items))
+        return [fn(i) for i in items]
+
+    analyzer = ChunkedCodeAnalyzer(model, map_fn=map_fn, max_chunk_chars=1000)
+    report = analyzer.analyze("sample.py", make_source())
+    chunk_count = mapped[0]
+    assert chunk_count > 1
+    assert len(model.prompts) == chunk_count + 1  # map calls + one reduce
+    assert report == "Final report"
+    assert model.prompts[-1].count("slow loop") == chunk_count
+
+
+def test_cache_hit_skips_model(tmp_path):
+    model = FakeModel()
+    analyzer = ChunkedCodeAnalyzer(model, cache_dir=str(tmp_path), max_chunk_chars=1000)
+    source = make_source()
+    first = analyzer.analyze("sample.py", source)
+    calls = len(model.prompts)
+
+    again = ChunkedCodeAnalyzer(model, cache_dir=str(tmp_path), max_chunk_chars=1000)
+    assert again.analyze("sample.py", source) == first
+    assert len(model.prompts) == calls
+
+    # Any edit to the file invalidates the cached report.
+    again.analyze("sample.py", source + "\n# changed\n")
+    assert len(model.prompts) > calls
+
+
+def test_errors_are_not_cached(tmp_path):
+    analyzer = ChunkedCodeAnalyzer(lambda p, t: "Error: brain offline", cache_dir=str(tmp_path))
+    analyzer.analyze("tiny.py", "x = 1\n")
+    assert analyzer.cached("x = 1\n") is None
+
+
+def test_brain_outage_is_an_error_not_a_clean_result(tmp_path):
+    source = make_source()
+
+    def offline(prompt, timeout):
+        if "SECTION 1 " in prompt:
+            return "Lines 1-2 | slow loop | faster | use a set"
+        return "An unexpected error occurred while I was thinking."
+    analyzer = ChunkedCodeAnalyzer(offline, cache_dir=str(tmp_path), max_chunk_chars=1000)
+    report = analyzer.analyze("sample.py", source)
+    assert report.startswith("Error:")
+    assert analyzer.cached(source) is None
+
+
+def test_partial_failure_is_reported_but_not_cached(tmp_path):
+    source = make_source()
+    model = FakeModel()
+
+    def flaky(prompt, timeout):
+        if "SECTION 2 " in prompt:
+            raise TimeoutError("read timed out")
+        return model(prompt, timeout)
+    analyzer = ChunkedCodeAnalyzer(flaky, cache_dir=str(tmp_path), max_chunk_chars=1000)
+    sections = len(split_into_chunks(source, "sample.py", 1000))
+    assert analyzer.analyze("sample.py", source) == (
+        f"Final report\n\nNote: 1 of {sections} sections could not be reviewed.")
+    assert analyzer.cached(source) is None
+
+
+def test_partial_failure_with_no_findings_is_not_a_clean_result(tmp_path):
+    source = make_source()
+
+    def flaky(prompt, timeout):
+        if "SECTION 2 " in prompt:
+            raise TimeoutError("read timed out")
+        return "NONE"
+    analyzer = ChunkedCodeAnalyzer(flaky, cache_dir=str(tmp_path), max_chunk_chars=1000)
+    sections = len(split_into_chunks(source, "sample.py", 1000))
+    assert analyzer.analyze("sample.py", source) == (
+        "No significant improvements were found in this file."
+        f"\n\nNote: 1 of {sections} sections could not be reviewed.")
+    assert analyzer.cached(source) is None
+
+
+def test_cache_key_uses_the_model_that_answered(tmp_path):
+    source = "x = 1\n"
+    downgraded = ChunkedCodeAnalyzer(lambda p, t: ("Fast report", "llama3.2"), cache_dir=str(tmp_path),
+                                     cache_salt="qwen2.5:14b")
+    assert downgraded.analyze("tiny.py", source) == "Fast report"
+    assert downgraded.cached(source) is None  # not served as the smart model's report
+
+    smart = ChunkedCodeAnalyzer(lambda p, t: ("Smart report", "qwen2.5:14b"), cache_dir=str(tmp_path),
+                                cache_salt="qwen2.5:14b")
+    smart.analyze("tiny.py", source)
+    assert smart.cached(source) == "Smart report"
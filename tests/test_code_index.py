@@ -0,0 +1,106 @@
+"""Test the cached AST code index: symbols, source lookup and invalidation."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import re
+
+from core.code_index import CodeIndex
+
+SAMPLE = '''import os
+
+
+def helper(x):
+    """Add one."""
+    return x + 1
+
+
+class Widget:
+    """A widget."""
+
+    @property
+    def size(self):
+        return 3
+
+    def render(self):
+        def inner():
+            return "ok"
+        return inner()
+'''
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_symbols_and_docstrings(tmp_path):
+    path = write(tmp_path / "sample.py", SAMPLE)
+    index = CodeIndex()
+    symbols = index.symbols(path)
+    assert symbols["helper"].kind == "function"
+    assert symbols["helper"].docstring == "Add one."
+    assert symbols["Widget"].kind == "class"
+    assert symbols["Widget.render"].kind == "method"
+    assert symbols["Widget.size"].start_line == 12  # includes the decorator
+    assert symbols["Widget.size"].def_line == 13
+    assert "Widget.render.inner" in symbols
+
+
+def test_find_and_source(tmp_path):
+    path = write(tmp_path / "sample.py", SAMPLE)
+    index = CodeIndex()
+    assert index.find("render") is None  # nothing indexed yet
+    index.read(path)
+    assert index.find("render").qualname == "Widget.render"
+    assert index.source(path, "helper").startswith("def helper(x):")
+    assert index.source(path, "Widget.size").startswith("    @property")
+    assert index.source(path, "missing") is None
+
+
+def test_line_map_matches_def_lines(tmp_path):
+    path = write(tmp_path / "sample.py", SAMPLE)
+    expected = {}
+    for i, line in enumerate(SAMPLE.splitlines(), 1):
+        m = re.match(r"^\s*def\s+([a-zA-Z_]\w*)\s*\(", line)
+        if m:
+            expected[m.group(1)] = i
+    assert CodeIndex().line_map(path) == expected
+
+
+def test_cached_until_file_changes(tmp_path):
+    path = write(tmp_path / "sample.py", SAMPLE)
+    index = CodeIndex()
+    index.read(path)
+    index.line_map(path)
+    assert index.reads == 1
+
+    write(tmp_path / "sample.py", SAMPLE + "\n\ndef added():\n    pass\n")
+    assert "added" in index.line_map(path)
+    assert index.reads == 2
+    assert index.find("added") is not None
+
+
+def test_contains_and_non_python(tmp_path):
+    path = write(tmp_path / "notes.md", "# Notes\nThe Brain PC runs Ollama.\n")
+    index = CodeIndex()
+    assert index.contains(path, "brain pc")
+    assert not index.contains(path, "gpu")
+    assert index.symbols(path) == {}
+
+
+def test_eviction_by_size(tmp_path):
+    index = CodeIndex(max_bytes=1000)
+    a = write(tmp_path / "a.txt", "a" * 600)
+    b = write(tmp_path / "b.txt", "b" * 600)
+    index.read(a)
+    index.read(b)
+    index.read(a)
+    assert index.reads == 3  # a was evicted when b was loaded
+
+
+def test_unparsable_file_still_readable(tmp_path):
+    path = write(tmp_path / "broken.py", "def broken(:\n")
+    index = CodeIndex()
+    assert index.read(path) == "def broken(:\n"
+    assert index.symbols(path) == {}
@@ -0,0 +1,59 @@
+"""Test concise mode shaping replies at generation time instead of a rewrite pass."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from unittest.mock import MagicMock, patch
+
+from jarvis_main import JarvisGT2, CONCISE_NUM_PREDICT
+
+LONG_REPLY = "First sentence here. Second sentence follows. Third one is extra and should be dropped."
+LONG_TEXT = "This is a long status line that was not produced by the brain and needs shortening for voice."
+
+
+def build_jarvis(ui_mode="concise"):
+    with patch("jarvis_main.JarvisGT2.__init__", return_value=None):
+        j = JarvisGT2()
+    j.ui_mode = ui_mode
+    j.current_llm_tier = "smart"
+    j.log = MagicMock()
+    j.speak_with_piper = MagicMock()
+    return j
+
+
+def fake_brain(response_text):
+    post = MagicMock()
+    post.return_value.json.return_value = {"response": response_text}
+    post.return_value.raise_for_status = lambda: None
+    return post
+
+
+def test_concise_speech_call_caps_generation_and_skips_rewrite():
+    j = build_jarvis()
+    with patch("jarvis_main.requests.post", fake_brain(LONG_REPLY)) as post:
+        answer = j.call_smart_model("question", tier="fast", for_speech=True)
+        j.speak(answer)
+    assert post.call_count == 1  # no second round trip for the rewrite
+    body = post.call_args.kwargs["json"]
+    assert body["options"]["num_predict"] == CONCISE_NUM_PREDICT
+    assert "system" in body
+    assert answer == "First sentence here. Second sentence follows."
+    j.speak_with_piper.assert_called_once_with(answer, preprocessed=True)
+
+
+def test_normal_mode_leaves_generation_untouched():
+    j = build_jarvis(ui_mode="normal")
+    with patch("jarvis_main.requests.post", fake_brain(LONG_REPLY)) as post:
+        answer = j.call_smart_model("question", tier="fast", for_speech=True)
+    body = post.call_args.kwargs["json"]
+    assert "options" not in body and "system" not in body
+    assert answer == LONG_REPLY
+
+
+def test_non_llm_text_rewrite_is_cached():
+    j = build_jarvis()
+    with patch("jarvis_main.requests.post", fake_brain("Short status.")) as post:
+        j.speak(LONG_TEXT)
+        j.speak(LONG_TEXT)
+    assert post.call_count == 1
+    assert j.speak_with_piper.call_args_list[-1].args[0] == "Short status."
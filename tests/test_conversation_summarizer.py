@@ -0,0 +1,71 @@
+"""Test the rolling conversation summary used for LLM context."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import time
+
+from core.conversation_summarizer import RollingSummarizer
+
+
+def add_turns(summarizer, n):
+    for i in range(1, n + 1):
+        summarizer.add("User", f"question {i}")
+        summarizer.add("Jarvis", f"answer {i}")
+
+
+def test_render_is_summary_plus_last_two_turns():
+    prompts = []
+    summarizer = RollingSummarizer(lambda p: prompts.append(p) or "Spencer asked about 1 and 2.", fold_batch=4)
+    add_turns(summarizer, 4)
+    assert summarizer.fold() is True
+    assert "question 1" in prompts[0] and "question 3" not in prompts[0]
+
+    rendered = summarizer.render()
+    assert "Spencer asked about 1 and 2." in rendered
+    assert "question 3" in rendered and "answer 4" in rendered
+    assert "question 1" not in rendered
+
+
+def test_render_leaves_out_unfolded_backlog():
+    summarizer = RollingSummarizer(lambda p: "s", fold_batch=4)
+    add_turns(summarizer, 5)  # nothing folded yet
+    rendered = summarizer.render()
+    assert "question 4" in rendered and "answer 5" in rendered
+    assert "answer 3" not in rendered
+
+
+def test_backlog_is_capped_while_folding_is_paused():
+    gate = {"open": False}
+    summarizer = RollingSummarizer(lambda p: "s", fold_batch=4, should_run=lambda: gate["open"])
+    add_turns(summarizer, 50)
+    assert len(summarizer._messages) == summarizer.keep_messages + summarizer.fold_batch
+    assert summarizer._messages[-1]["message"] == "answer 50"
+    gate["open"] = True
+    assert summarizer.fold() is True
+    assert len(summarizer._messages) == summarizer.keep_messages
+
+
+def test_fold_waits_for_a_full_batch_and_respects_gate():
+    calls = []
+    gate = {"open": False}
+    summarizer = RollingSummarizer(lambda p: calls.append(p) or "s", fold_batch=4,
+                                   should_run=lambda: gate["open"])
+    add_turns(summarizer, 3)
+    assert summarizer.fold() is False  # gaming mode style gate
+    gate["open"] = True
+    assert summarizer.fold() is False  # only 2 messages outside the window
+    assert summarizer.fold(force=True) is True
+    assert len(calls) == 1
+
+
+def test_background_worker_folds_after_idle_gap():
+    summarizer = RollingSummarizer(lambda p: "rolled up", fold_batch=2, idle_delay=0.05)
+    summarizer.start()
+    add_turns(summarizer, 3)
+    deadline = time.time() + 2
+    while summarizer.summary != "rolled up" and time.time() < deadline:
+        time.sleep(0.02)
+    summarizer.stop()
+    assert summarizer.summary == "rolled up"
+    assert "question 1" not in summarizer.render()
@@ -0,0 +1,97 @@
+"""Test relevance-ranked fact selection used by fallback_to_llm."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import pytest
+
+from core.fact_retriever import FactRetriever, estimate_tokens
+
+VOCAB = ["car", "dog", "job", "coffee", "pain", "kent", "music", "diet"]
+
+
+def bag_of_words(text):
+    words = text.lower().split()
+    return [float(sum(1 for w in words if w.strip(".,") == v)) for v in VOCAB]
+
+
+FACTS = [
+    "Spencer drives a blue car",
+    "Spencer has a dog called Rex",
+    "Spencer's job is software engineering",
+    "Spencer drinks black coffee",
+    "Spencer manages chronic pain",
+    "Spencer lives in Kent",
+    "Spencer likes synth music",
+    "Spencer follows a vegetarian diet",
+]
+
+
+def test_small_memory_returned_without_embedding():
+    calls = []
+    retriever = FactRetriever(lambda t: calls.append(t) or bag_of_words(t), top_k=6, token_budget=200)
+    assert retriever.select("hello", FACTS[:3]) == FACTS[:3]
+    assert calls == []
+
+
+def test_top_k_relevant_facts_in_memory_order():
+    retriever = FactRetriever(bag_of_words, top_k=2, token_budget=200)
+    chosen = retriever.select("what coffee should I have with my dog", FACTS)
+    assert chosen == [FACTS[1], FACTS[3]]
+
+
+def test_token_budget_caps_selection():
+    budget = estimate_tokens(FACTS[0]) + 1
+    retriever = FactRetriever(bag_of_words, top_k=5, token_budget=budget)
+    chosen = retriever.select("car dog job", FACTS)
+    assert sum(estimate_tokens(f) for f in chosen) <= budget
+    assert len(chosen) == 1
+
+
+def test_facts_embedded_once_and_cache_pruned():
+    calls = []
+    retriever = FactRetriever(lambda t: calls.append(t) or bag_of_words(t), top_k=2, token_budget=200)
+    retriever.select("car", FACTS)
+    retriever.select("dog", FACTS)
+    fact_calls = [c for c in calls if c in FACTS]
+    assert sorted(fact_calls) == sorted(FACTS)
+
+    retriever.select("car", FACTS[1:])
+    assert len(retriever._vectors) == len(FACTS) - 1
+
+
+def test_facts_are_embedded_again_when_the_backend_changes():
+    state = {"backend": "hash"}
+
+    def embed(text):
+        vec = bag_of_words(text)
+        return vec if state["backend"] == "openvino" else vec[::-1] + [1.0]  # another width and basis
+
+    retriever = FactRetriever(embed, top_k=2, token_budget=200, backend=lambda: state["backend"])
+    retriever.select("car", FACTS)
+    state["backend"] = "openvino"
+    assert retriever.select("what coffee should I have with my dog", FACTS) == [FACTS[1], FACTS[3]]
+    assert retriever._matrix.shape == (len(FACTS), len(VOCAB))
+
+
+def test_width_change_without_backend_report_re_embeds_facts():
+    state = {"wide": False}
+
+    def embed(text):
+        vec = bag_of_words(text)
+        return vec + [0.5] * 4 if state["wide"] else vec
+
+    retriever = FactRetriever(embed, top_k=2, token_budget=200)
+    retriever.select("car", FACTS)
+    state["wide"] = True
+    assert retriever.select("coffee dog", FACTS) == [FACTS[1], FACTS[3]]
+    assert retriever._matrix.shape[1] == len(VOCAB) + 4
+
+
+def test_query_from_another_embedder_is_not_scored():
+    def embed(text):
+        return bag_of_words(text) + [1.0] if text == "car" else bag_of_words(text)  # query fell back
+
+    retriever = FactRetriever(embed, top_k=2, token_budget=200)
+    with pytest.raises(ValueError):
+        retriever.select("car", FACTS)
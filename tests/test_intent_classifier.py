@@ -0,0 +1,75 @@
+"""Test the embedding intent classifier and its hook before the LLM fallback."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import hashlib
+import re
+from unittest.mock import MagicMock
+
+from core.intent_classifier import EmbeddingIntentClassifier
+
+EXEMPLARS = {
+    "WEATHER": ["do I need an umbrella today", "is it going to rain later"],
+    "CALENDAR_READ": ["am I free on thursday afternoon", "when is my next meeting"],
+    "TASK": ["put milk on my to do list"],
+}
+
+
+def bag_of_words(text, dims=256):
+    vec = [0.0] * dims
+    for token in re.findall(r"[a-z0-9']+", text.lower()):
+        vec[int(hashlib.sha1(token.encode()).hexdigest()[:8], 16) % dims] += 1.0
+    return vec
+
+
+def make(threshold=0.6, margin=0.05, exemplars=EXEMPLARS):
+    classifier = EmbeddingIntentClassifier(bag_of_words, exemplars, threshold=threshold, margin=margin)
+    classifier.warm()
+    return classifier
+
+
+def test_not_ready_until_warmed():
+    classifier = EmbeddingIntentClassifier(bag_of_words, EXEMPLARS)
+    assert not classifier.ready
+    assert classifier.classify("do I need an umbrella today") == (None, 0.0)
+
+
+def test_confident_paraphrase_matches():
+    intent, score = make().classify("do I need an umbrella tomorrow")
+    assert intent == "WEATHER"
+    assert score > 0.6
+
+
+def test_low_similarity_is_rejected():
+    intent, score = make().classify("tell me a joke about penguins")
+    assert intent is None
+    assert score < 0.6
+
+
+def test_margin_rejects_ambiguous_utterances():
+    exemplars = {"A": ["check the thing now"], "B": ["check the thing now please"]}
+    assert make(threshold=0.5, margin=0.2, exemplars=exemplars).classify("check the thing now")[0] is None
+    assert make(threshold=0.5, margin=0.0, exemplars=exemplars).classify("check the thing now")[0] == "A"
+
+
+def test_scores_cover_every_intent():
+    scores = make().scores("when is my next meeting")
+    assert set(scores) == set(EXEMPLARS)
+    assert max(scores, key=scores.get) == "CALENDAR_READ"
+    assert abs(scores["CALENDAR_READ"] - 1.0) < 1e-5
+
+
+def test_process_conversation_dispatches_before_fallback():
+    from run_live_session_silent import build_jarvis_for_silent_tests
+
+    j = build_jarvis_for_silent_tests()
+    j.intent_classifier = make()
+    j.handle_weather = MagicMock(__name__="handle_weather")
+    j.fallback_to_llm = MagicMock()
+    j.process_conversation("do I need an umbrella tomorrow")
+    j.handle_weather.assert_called_once()
+    j.fallback_to_llm.assert_not_called()
+
+    j.process_conversation("tell me a joke about penguins")
+    j.fallback_to_llm.assert_called_once()
@@ -0,0 +1,122 @@
+"""Test the compiled intent matcher against the original per-intent scoring loop."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import random
+import re
+
+from core.intent_matcher import AhoCorasick, IntentMatcher
+
+INTENTS = {
+    "LEARN_FACT": {"keywords": ["remember that", "note that", "forget that"], "handler": "h"},
+    "TASK": {"keywords": ["remind me", "remember to", "my tasks", "done", "mark"], "handler": "h"},
+    "MEMORY_RECALL": {"regex": r'\b(?:did|have)\s+(?:i|you|we)\s+(?:ever\s+)?\w', "handler": "h"},
+    "CALENDAR_READ": {
+        "keywords": ["calendar", "what do i have", "upcoming"],
+        "blockers": ["book", "add", "cancel"],
+        "handler": "h",
+    },
+    "CALENDAR_ACTION": {"keywords": ["book", "cancel", "move"], "handler": "h"},
+    "CODE_OPTIMIZATION": {
+        "keywords": ["analys", "optimise", "summary", "report"],
+        "patterns": [r"\banalys[ez]\b", r"\boptimis[ez]\b"],
+        "required": ["file", "code"],
+        "handler": "h",
+    },
+    "EMAIL_SUMMARY": {
+        "keywords": ["summarize", "summary", "read"],
+        "patterns": [r"\bsummari[sz]e\b"],
+        "required": ["email", "emails", "mail"],
+        "handler": "h",
+    },
+    "NEWS": {"keywords": ["news", "headlines"], "blockers": ["google"], "handler": "h"},
+    "WEB_SEARCH": {"keywords": ["search", "who is", "what is", "find", "google"], "handler": "h"},
+}
+
+
+def reference_best(intents, raw_text):
+    """The loop _match_intent used before the matcher was compiled."""
+    text = raw_text.lower().strip()
+    best, best_score = None, 0
+    for name, cfg in intents.items():
+        if any(b in text for b in cfg.get("blockers", [])):
+            continue
+        score = trigger = 0
+        for pat in cfg.get("patterns", []):
+            if re.search(pat, text, re.IGNORECASE):
+                score += 3
+                trigger += 3
+        if cfg.get("regex") and re.search(cfg["regex"], text, re.IGNORECASE):
+            score += 3
+            trigger += 3
+        hits = sum(1 for kw in cfg.get("keywords", []) if kw in text)
+        score += hits
+        trigger += hits
+        required = cfg.get("required", [])
+        if required:
+            req = sum(1 for r in required if r in text)
+            if trigger == 0 or req == 0:
+                continue
+            score += req * 2
+        if trigger == 0:
+            continue
+        if score > best_score:
+            best, best_score = name, score
+    return best, best_score
+
+
+def test_automaton_finds_overlapping_phrases():
+    ac = AhoCorasick(["he", "she", "his", "hers", "email", "mail"])
+    found = {ac.phrases[i] for i in ac.search("ushers send emails")}
+    assert found == {"he", "she", "hers", "email", "mail"}
+    assert ac.search("") == set()
+
+
+def test_known_utterances():
+    matcher = IntentMatcher(INTENTS)
+    assert matcher.best("Remind me to call mum")[0] == "TASK"
+    assert matcher.best("What's on my calendar")[0] == "CALENDAR_READ"
+    assert matcher.best("book a meeting in my calendar")[0] == "CALENDAR_ACTION"
+    assert matcher.best("Analyse the main code file")[0] == "CODE_OPTIMIZATION"
+    assert matcher.best("summarise my emails")[0] == "EMAIL_SUMMARY"
+    assert matcher.best("google the news")[0] == "WEB_SEARCH"
+    assert matcher.best("did I ever email Bob")[0] == "MEMORY_RECALL"
+    assert matcher.best("good morning") == (None, 0)
+    # "required" alone never matches.
+    assert matcher.best("open the code file")[0] is None
+
+
+def test_accept_filter_skips_unavailable_handlers():
+    matcher = IntentMatcher(INTENTS)
+    assert matcher.best("google the news")[0] == "WEB_SEARCH"
+    assert matcher.best("read the news", accept=lambda n: n != "NEWS")[0] is None
+
+
+def test_matches_reference_loop_on_random_utterances():
+    phrases = sorted({p for cfg in INTENTS.values() for key in ("keywords", "blockers", "required")
+                      for p in cfg.get(key, [])})
+    filler = ["the", "please", "jarvis", "did", "i", "ever", "analyse", "optimize", "summarise", "x"]
+    rng = random.Random(7)
+    matcher = IntentMatcher(INTENTS)
+    for _ in range(2000):
+        words = rng.sample(phrases, rng.randint(0, 4)) + rng.sample(filler, rng.randint(0, 4))
+        rng.shuffle(words)
+        text = " ".join(words)
+        if rng.random() < 0.3:
+            text = text.upper()
+        assert matcher.best(text) == reference_best(INTENTS, text), text
+
+
+def test_real_intents_table_matches_reference():
+    import jarvis_main
+    matcher = jarvis_main.INTENT_MATCHER
+    samples = [
+        "remember that my sister is called Kate", "what's on my list", "did you ever send the report",
+        "what's my day look like", "cancel my 3pm", "show me the latest report",
+        "optimise the main code file", "compare main with the spec", "summarize my emails",
+        "search my emails from Dan", "reply to that email", "archive it", "what's the news today",
+        "search the web for rust", "system specs", "refresh vault", "find file config", "who is Ada Lovelace",
+    ]
+    for text in samples:
+        assert matcher.best(text) == reference_best(jarvis_main.INTENTS, text), text
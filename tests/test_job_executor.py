@@ -0,0 +1,174 @@
+"""Test background jobs: lifecycle events, progress, speech capture and completion notices."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+from core.job_executor import JobExecutor
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_lifecycle_events_and_progress():
+    events = []
+    executor = JobExecutor(max_workers=1, on_event=lambda job, event: events.append((job.short_key, event)))
+    release = threading.Event()
+
+    def work(x):
+        executor.progress("halfway")
+        release.wait(2)
+        return x * 2
+
+    job = executor.submit("double it", work, 21)
+    assert job.short_key == "j1"
+    assert wait_for(lambda: ("j1", "progress") in events)
+    assert executor.active() == [job]
+    release.set()
+    assert wait_for(lambda: job.status == "done")
+    assert job.result == 42
+    assert job.progress == "halfway"
+    assert [e for _, e in events] == ["queued", "started", "progress", "done"]
+    assert executor.active() == []
+    executor.shutdown(wait=True)
+
+
+def test_failure_is_reported():
+    events = []
+    executor = JobExecutor(on_event=lambda job, event: events.append(event))
+
+    def boom():
+        raise RuntimeError("brain offline")
+
+    job = executor.submit("explode", boom)
+    assert wait_for(lambda: job.status == "failed")
+    assert "brain offline" in job.outcome
+    assert wait_for(lambda: events[-1:] == ["failed"])
+    executor.shutdown(wait=True)
+
+
+def test_current_job_is_thread_local():
+    executor = JobExecutor()
+    seen = []
+    job = executor.submit("probe", lambda: seen.append(JobExecutor.current()))
+    assert wait_for(lambda: job.status == "done")
+    assert seen == [job]
+    assert JobExecutor.current() is None
+    executor.progress("ignored outside a job")  # no-op
+    executor.shutdown(wait=True)
+
+
+def test_finished_job_history_is_bounded():
+    executor = JobExecutor(history=2)
+    jobs = [executor.submit(f"job {i}", lambda: None) for i in range(4)]
+    assert wait_for(lambda: all(j.status == "done" for j in jobs))
+    executor.submit("one more", lambda: None)
+    assert executor.get("j1") is None
+    assert executor.get("j5") is not None
+    executor.shutdown(wait=True)
+
+
+def test_dispatch_runs_heavy_intent_in_background():
+    from run_live_session_silent import build_jarvis_for_silent_tests
+
+    j = build_jarvis_for_silent_tests()
+    del j.speak_with_piper  # real method: captures speech inside jobs
+    j.piper_available = False
+    j.speak_lock = threading.Lock()
+    j.queue_lock = threading.Lock()
+    j.job_executor = JobExecutor(on_event=j._on_job_event)
+    release = threading.Event()
+
+    def slow_search(text):
+        release.wait(2)
+        j.speak_with_piper("Here is what I found about decorators.")
+
+    handler = MagicMock(side_effect=slow_search, __name__="handle_web_search")
+    j._dispatch_intent("WEB_SEARCH", {}, handler, "search the web for decorators")
+
+    # Dispatch returned while the search is still running.
+    assert j.session_context.get_item("j1")["metadata"]["status"] in ("queued", "running")
+    assert j.notification_queue == []
+    release.set()
+    assert wait_for(lambda: j.notification_queue)
+    notice = j.notification_queue[0]
+    assert notice["message"] == "Here is what I found about decorators."
+    assert notice["metadata"] == {"job": "j1", "status": "done"}
+    assert j.session_context.get_item("j1")["metadata"]["status"] == "done"
+    j.job_executor.shutdown(wait=True)
+
+
+def test_job_results_go_live_when_spoken():
+    from run_live_session_silent import build_jarvis_for_silent_tests
+
+    j = build_jarvis_for_silent_tests()
+    j.queue_lock = threading.Lock()
+    j.job_executor = JobExecutor(on_event=j._on_job_event)
+    j.session_context.add_item("20260214-n1", "Headline the user just heard", "n", {})
+    j.last_intent = "news"
+
+    def search(text):
+        j.session_context.clear()
+        j.session_context.add_item("20260214-wr1", "Decorators explained", "wr", {})
+        j.speak_with_piper("Searching the web for decorators.")
+        j.speak_with_piper("Here is what I found about decorators.")
+        j.last_intent = "search"
+
+    del j.speak_with_piper  # real method: captures speech inside jobs
+    j.piper_available = False
+    j.speak_lock = threading.Lock()
+    handler = MagicMock(side_effect=search, __name__="handle_web_search")
+    j._dispatch_intent("WEB_SEARCH", {}, handler, "search the web for decorators")
+    assert wait_for(lambda: j.notification_queue)
+
+    # Finished, but not yet heard: the user's aliases and intent are untouched
+    assert j.session_context.get_item("n1") is not None
+    assert j.session_context.get_item("wr1") is None
+    assert j.last_intent == "news"
+    # Everything the job said is one notification, so progress is never heard without the result
+    assert [n["message"] for n in j.notification_queue] == [
+        "Searching the web for decorators. Here is what I found about decorators."]
+
+    j.speak_with_piper = MagicMock()
+    j._refresh_command_capture_state = lambda: None
+    j.notification_hold = j.awaiting_command = False
+    j.process_notification_queue()
+    j.speak_with_piper.assert_called_once_with(
+        "Searching the web for decorators. Here is what I found about decorators.")
+    assert j.notification_queue == []
+    assert sorted(j.session_context.items) == ["j1", "wr1"]
+    assert j.last_intent == "search"
+    j.job_executor.shutdown(wait=True)
+
+
+def test_session_context_iteration_survives_job_writes():
+    from core.context_manager import SessionContext
+
+    context = SessionContext()
+    stop = threading.Event()
+
+    def job_writes():
+        n = 0
+        while not stop.is_set():
+            context.add_item(f"20260214-j{n % 50}", "job", "j", {})
+            if n % 40 == 0:
+                context.clear()
+            n += 1
+    writer = threading.Thread(target=job_writes)
+    writer.start()
+    try:
+        for _ in range(2000):
+            for alias, item in context.items.items():
+                assert item["type"] == "j"
+    finally:
+        stop.set()
+        writer.join()
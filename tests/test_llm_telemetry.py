@@ -0,0 +1,97 @@
+"""Test per-call LLM telemetry (prefill/decode split, tokens/s, queue time)."""
+import json
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from core.llm_telemetry import LLMTelemetry
+
+# Shape of a non-streaming Ollama /api/generate response (durations in ns).
+PAYLOAD = {
+    "response": "ok",
+    "prompt_eval_count": 400,
+    "prompt_eval_duration": 200_000_000,
+    "eval_count": 50,
+    "eval_duration": 1_000_000_000,
+    "load_duration": 10_000_000,
+    "total_duration": 1_250_000_000,
+}
+
+
+def test_record_splits_prefill_and_decode(tmp_path):
+    log_path = tmp_path / "llm_calls.jsonl"
+    telemetry = LLMTelemetry(str(log_path))
+    sample = telemetry.record("fallback_to_llm", "fast", "llama3.2", PAYLOAD, wall_ms=1400, local_queue_ms=5)
+
+    assert sample["prefill_ms"] == 200.0
+    assert sample["decode_ms"] == 1000.0
+    assert sample["prefill_tps"] == 2000.0
+    assert sample["decode_tps"] == 50.0
+    assert sample["queue_ms"] == 155.0  # 5ms local + 150ms outside Ollama's total_duration
+
+    assert telemetry.flush(timeout=5)
+    lines = log_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["call_site"] == "fallback_to_llm"
+
+
+def test_histograms_and_breakdown_by_site_and_tier():
+    telemetry = LLMTelemetry(log_path=None, window=3)
+    for wall in (80, 400, 3000, 90000):
+        telemetry.record("handle_web_search", "smart", "qwen", PAYLOAD, wall_ms=wall)
+    telemetry.record("fallback_to_llm", "fast", "llama3.2", {}, wall_ms=120)
+
+    hist = telemetry.histogram("wall_ms", call_site="handle_web_search")
+    assert sum(hist.values()) == 3  # rolling window drops the oldest call
+    assert hist["le_500"] == 1 and hist["le_5000"] == 1 and hist["inf"] == 1
+
+    breakdown = telemetry.breakdown()
+    assert set(breakdown) == {"handle_web_search/smart", "fallback_to_llm/fast"}
+    assert breakdown["fallback_to_llm/fast"]["decode_tps"]["p50"] == 0.0
+    assert telemetry.latest()["call_site"] == "fallback_to_llm"
+    assert telemetry.total_calls == 5
+
+
+def test_log_rolls_over_at_max_size(tmp_path):
+    log_path = tmp_path / "llm_calls.jsonl"
+    telemetry = LLMTelemetry(str(log_path), max_log_bytes=1000)
+    for _ in range(10):
+        telemetry.record("fallback_to_llm", "fast", "llama3.2", PAYLOAD, wall_ms=100)
+    assert telemetry.flush(timeout=5)
+    assert log_path.stat().st_size <= 1000
+    assert (tmp_path / "llm_calls.jsonl.1").stat().st_size <= 1000
+    assert not (tmp_path / "llm_calls.jsonl.2").exists()
+
+
+def test_snapshot_for_dashboard():
+    telemetry = LLMTelemetry(log_path=None)
+    telemetry.record("handle_web_search", "smart", "qwen", PAYLOAD, wall_ms=400)
+    snapshot = json.loads(json.dumps(telemetry.snapshot()))  # sent as JSON
+    assert snapshot["total_calls"] == 1
+    assert snapshot["breakdown"]["handle_web_search/smart"]["prefill_ms"]["p50"] == 200.0
+    assert snapshot["histograms"]["wall_ms"]["le_500"] == 1
+    assert snapshot["buckets_ms"][0] == 50
+
+
+def test_record_does_not_wait_for_the_log(tmp_path, monkeypatch):
+    import threading
+    import core.llm_telemetry as llm_telemetry
+
+    log_path = tmp_path / "llm_calls.jsonl"
+    telemetry = LLMTelemetry(str(log_path))
+    disk = threading.Event()
+    real_open = open
+
+    def slow_open(path, *args, **kwargs):
+        if str(path) == str(log_path):
+            disk.wait(5)  # a stalled disk
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(llm_telemetry, "open", slow_open, raising=False)
+    for _ in range(3):
+        telemetry.record("fallback_to_llm", "fast", "llama3.2", PAYLOAD, wall_ms=100)
+    assert telemetry.total_calls == 3
+    assert not log_path.exists()
+    disk.set()
+    assert telemetry.flush(timeout=5)
+    assert len(log_path.read_text(encoding="utf-8").splitlines()) == 3
@@ -0,0 +1,116 @@
+"""Test tiered retention: hot MemoryIndex window plus monthly archive segments."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+NOW = datetime.now().replace(microsecond=0)
+
+
+def action(days_ago, description, action_type="note", **metadata):
+    return {"timestamp": (NOW - timedelta(days=days_ago)).isoformat(), "action_type": action_type,
+            "description": description, "metadata": metadata}
+
+
+@pytest.fixture
+def index_options():
+    return {"hot_days": 30}
+
+
+HISTORY = [
+    action(400, "Read the lease", "file_read", filename="lease.pdf"),
+    action(200, "Replied to the landlord about the boiler", "email_reply"),
+    action(160, "Garden plans for spring"),
+    action(5, "Replied to the landlord about rent", "email_reply"),
+    action(1, "Optimization report for jarvis_main.py", "doc_created"),
+]
+
+
+def descriptions(actions):
+    return [a["description"] for a in actions]
+
+
+def test_old_actions_move_to_monthly_segments(tmp_path, make_index):
+    index = make_index(HISTORY)
+    assert len(index.actions) == 2
+    assert len(index.archive.segments) == 3  # 400, 200 and 160 days ago: three months
+    assert len((tmp_path / "memory_actions.jsonl").read_text().splitlines()) == 2
+    assert all(name.endswith((".jsonl.gz", ".index.json")) for name in os.listdir(tmp_path / "memory_archive"))
+
+    stats = index.get_stats()
+    assert stats["total_actions"] == 5
+    assert stats["archived_actions"] == 3
+    assert stats["action_types"]["email_reply"] == 2
+    assert stats["oldest_action"] == HISTORY[0]["timestamp"]
+
+
+def test_recent_queries_do_not_open_segments(make_index):
+    index = make_index(HISTORY)
+    reloaded = make_index()
+    assert descriptions(reloaded.search_by_keyword("jarvis_main.py", limit=1)) == ["Optimization report for jarvis_main.py"]
+    assert descriptions(reloaded.search_by_date_range(NOW - timedelta(days=10), NOW)) == descriptions(HISTORY[3:])
+    assert not reloaded.archive._cache
+    assert index.archive.count() == 3
+
+
+def test_queries_reach_into_segments(make_index):
+    index = make_index(HISTORY)
+    assert descriptions(index.search_by_keyword("landlord")) == [
+        "Replied to the landlord about rent", "Replied to the landlord about the boiler"]
+    assert descriptions(index.search_by_keyword("boil")) == ["Replied to the landlord about the boiler"]
+    assert descriptions(index.search_by_type("file_read")) == ["Read the lease"]
+    window = (NOW - timedelta(days=365 * 2), NOW - timedelta(days=100))
+    assert descriptions(index.search_by_date_range(*window)) == descriptions(HISTORY[:3])
+    assert descriptions(index.search_by_date_range(NOW - timedelta(days=250), NOW)) == descriptions(HISTORY[1:])
+    assert descriptions(index.get_last_n(4)) == descriptions(reversed(HISTORY[1:]))
+
+
+def test_archiving_again_merges_without_duplicates(tmp_path, make_index):
+    index = make_index(HISTORY[:2], hot_days=0)
+    assert len(index.actions) == 2
+    index.hot_days = 30
+    assert index.archive_old_actions() == 2
+    index.add_action("note", "fresh")
+    # A crash before the journal rewrite would leave archived records in it too
+    with open(tmp_path / "memory_actions.jsonl", "a") as f:
+        f.write(json.dumps(HISTORY[0], separators=(",", ":")) + "\n")
+    index.close()
+
+    reloaded = make_index()
+    assert descriptions(reloaded.actions) == ["fresh"]
+    assert reloaded.archive.count() == 2
+
+
+def test_disabled_retention_keeps_everything_hot(make_index):
+    index = make_index(HISTORY, hot_days=0)
+    assert len(index.actions) == 5
+    assert not index.archive.segments
+
+
+def test_back_to_back_saves_do_not_rewrite_the_journal(tmp_path, make_index):
+    # Older than the hot window, but in the month the window starts in
+    edge = datetime.now() - timedelta(days=30)
+    month_start = edge.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    recent = dict(action(0, "inside the window month"),
+                  timestamp=max(edge - timedelta(hours=1), month_start).isoformat())
+    index = make_index([HISTORY[0], recent])
+    assert descriptions(index.actions) == ["inside the window month"]
+
+    journal = tmp_path / "memory_actions.jsonl"
+    before = os.stat(journal).st_ino
+    for i in range(2):
+        index.add_action("note", f"turn {i}")
+        assert index.save({"facts": []})
+    assert os.stat(journal).st_ino == before
+    assert index.archive.count() == 1
+
+
+def test_identical_records_are_all_archived(make_index):
+    twin = action(200, "Checked the boiler")
+    index = make_index([twin, dict(twin)])
+    assert len(index.actions) == 0
+    assert index.archive.count() == 2
@@ -0,0 +1,162 @@
+"""Test MemoryIndex snapshot reads against a concurrent writer, and the batch add_actions API."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import memory_index
+
+
+@pytest.fixture
+def index_options():
+    return {"checkpoint_every": 0}
+
+
+def test_readers_see_whole_batches_only(make_index):
+    index = make_index()
+    batches, batch_size = 150, 4
+    errors = []
+    done = threading.Event()
+
+    def writer():
+        for b in range(batches):
+            index.add_actions([("note", f"batch{b} item{i}", {"batch": f"b{b}"}) for i in range(batch_size)])
+        done.set()
+
+    def reader():
+        try:
+            while not done.is_set():
+                seen = index.get_last_n(10 ** 6)
+                assert len(seen) % batch_size == 0
+                assert [a["description"] for a in seen] == [
+                    f"batch{b} item{i}" for b in reversed(range(len(seen) // batch_size))
+                    for i in reversed(range(batch_size))]
+                hits = index.search_by_keyword("item0", limit=10 ** 6)
+                assert all(a["description"].endswith("item0") for a in hits)
+                stats = index.get_stats()
+                assert stats["total_actions"] % batch_size == 0
+        except Exception as e:  # surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(3)] + [threading.Thread(target=writer)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=30)
+    assert not errors, errors[0]
+    assert len(index.actions) == batches * batch_size
+
+
+def test_readers_do_not_wait_for_the_writer_lock(make_index):
+    index = make_index()
+    index.add_action("note", "garden plans")
+    results = []
+    with index._lock:  # a writer mid-update
+        reader = threading.Thread(target=lambda: results.append(index.search_by_keyword("garden")))
+        reader.start()
+        reader.join(timeout=5)
+        assert not reader.is_alive()
+    assert [a["description"] for a in results[0]] == ["garden plans"]
+
+
+def test_add_actions_is_one_journal_write(monkeypatch, make_index):
+    index = make_index()
+    writes = []
+    real_append = index.journal.append
+    monkeypatch.setattr(index.journal, "append", lambda records: writes.append(len(records)) or real_append(records))
+    actions = index.add_actions([("note", "first", None), ("email_reply", "second", {"to": "landlord"})])
+    assert writes == [2]
+    assert [a["description"] for a in actions] == ["first", "second"]
+    assert index.search_by_keyword("landlord") == [actions[1]]
+    assert index.add_actions([]) == []
+    index.close()
+    assert [a["description"] for a in make_index().actions] == ["first", "second"]
+
+
+def test_clock_step_back_leaves_published_views_intact(monkeypatch, make_index):
+    index = make_index()
+    index.add_action("note", "now")
+    view = index._view
+    view_times = list(view.index["by_time"])
+
+    class EarlierClock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) - timedelta(hours=1)
+    monkeypatch.setattr(memory_index, "datetime", EarlierClock)
+    index.add_action("note", "an hour ago")
+    monkeypatch.undo()
+
+    assert list(view.index["by_time"]) == view_times
+    window = (datetime.now() - timedelta(days=1), datetime.now() + timedelta(days=1))
+    assert [a["description"] for a in index.search_by_date_range(*window)] == ["an hour ago", "now"]
+
+
+def test_readers_keep_working_across_an_archive_pass(tmp_path, make_index):
+    now = datetime.now()
+    history = [{"timestamp": (now - timedelta(days=400, minutes=i)).isoformat(), "action_type": "note",
+                "description": f"old landlord note {i}", "metadata": {}} for i in range(3000)]
+    history += [{"timestamp": (now - timedelta(minutes=i)).isoformat(), "action_type": "note",
+                 "description": f"recent landlord note {i}", "metadata": {}} for i in reversed(range(200))]
+    with open(tmp_path / "memory.json", "w") as f:
+        json.dump({"facts": [], "vault_actions": history}, f)
+    index = make_index()
+    assert len(index.actions) == 3200
+    index.hot_days = 30
+    rebuild = index._rebuild_index
+
+    def slow_rebuild():  # widen the window between the journal swap and the new view
+        time.sleep(0.3)
+        rebuild()
+    index._rebuild_index = slow_rebuild
+
+    errors, reads = [], []
+    started, done = threading.Event(), threading.Event()
+
+    def reader():
+        try:
+            while not done.is_set():
+                last = index.get_last_n(20)
+                assert [a["description"] for a in last] == [f"recent landlord note {i}" for i in range(20)]
+                assert len(index.search_by_keyword("landlord", limit=250)) == 250
+                reads.append(1)
+                started.set()
+        except Exception as e:  # surfaced below
+            errors.append(e)
+            started.set()
+
+    threads = [threading.Thread(target=reader) for _ in range(2)]
+    for t in threads:
+        t.start()
+    started.wait(timeout=10)
+    assert index.archive_old_actions() == 3000
+    done.set()
+    for t in threads:
+        t.join(timeout=30)
+    assert not errors, errors[0]
+    assert reads
+    assert len(index.actions) == 200
+    assert len((tmp_path / "memory_actions.jsonl").read_text().splitlines()) == 200
+    index.close()
+    assert len(make_index().actions) == 200
+
+
+def test_interrupted_journal_swap_is_finished_on_load(tmp_path, make_index):
+    index = make_index()
+    index.add_action("note", "kept")
+    index.close()
+    journal = tmp_path / "memory_actions.jsonl"
+    os.replace(journal, str(journal) + ".prev")  # crash after moving the old journal aside
+    (tmp_path / "memory_actions.jsonl.next").write_text(
+        json.dumps({"timestamp": datetime.now().isoformat(), "action_type": "note",
+                    "description": "swapped in", "metadata": {}}) + "\n")
+
+    reloaded = make_index()
+    assert [a["description"] for a in reloaded.actions] == ["swapped in"]
+    assert os.listdir(tmp_path) == ["memory_actions.jsonl"]
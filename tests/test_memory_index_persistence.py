@@ -0,0 +1,106 @@
+"""Test that MemoryIndex trusts its persisted index only when it matches the action journal."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import json
+from datetime import datetime
+
+from memory_index import MemoryIndex
+
+
+def populated(make_index):
+    index = make_index()
+    index.add_action("file_read", "Read jarvis_main.py", {"filename": "jarvis_main.py"})
+    index.add_action("doc_created", "Optimization report for the ear", {"short_key": "20260201-c1"})
+    index.save({"facts": []})
+    return index
+
+
+def no_rebuild(monkeypatch):
+    """Checkpointed actions must not be re-tokenized."""
+    real = MemoryIndex._extract_keywords
+
+    def only_new(self, action):
+        assert action["description"] == "Talked about the garden", "index was rebuilt"
+        return real(self, action)
+    monkeypatch.setattr(MemoryIndex, "_extract_keywords", only_new)
+
+
+def test_valid_index_is_loaded_without_rebuilding(tmp_path, monkeypatch, make_index):
+    original = populated(make_index)
+    no_rebuild(monkeypatch)
+    reloaded = make_index()
+    assert {k: list(v) for k, v in reloaded.index["by_keyword"].items()} == \
+        {k: list(v) for k, v in original.index["by_keyword"].items()}
+    assert reloaded.index["by_time"] == original.index["by_time"]
+    assert reloaded.index["by_time_ids"] == original.index["by_time_ids"]
+    assert reloaded.actions.type_names == original.actions.type_names
+    assert reloaded.search_by_keyword("ear")[0]["action_type"] == "doc_created"
+
+
+def test_journal_tail_is_applied_on_top_of_persisted_index(tmp_path, monkeypatch, make_index):
+    index = populated(make_index)
+    index.add_action("conversation", "Talked about the garden")
+    index.close()
+    no_rebuild(monkeypatch)
+    reloaded = make_index()
+    assert reloaded.index["total_count"] == 3
+    assert reloaded.search_by_keyword("garden")[0]["description"] == "Talked about the garden"
+    assert [a["action_type"] for a in reloaded.search_by_type("conversation")] == ["conversation"]
+
+
+def test_rewritten_journal_forces_rebuild(tmp_path, make_index):
+    populated(make_index)
+    journal = tmp_path / "memory_actions.jsonl"
+    lines = journal.read_text().splitlines()
+    lines[-1] = json.dumps({"timestamp": "2026-02-02T08:30:00", "action_type": "file_read",
+                            "description": "Read vault_reference.py", "metadata": {}})
+    journal.write_text("\n".join(lines) + "\n")
+
+    reloaded = make_index()
+    assert list(reloaded.index["by_keyword"]["vault_reference.py"]) == [1]
+    assert "ear" not in reloaded.index["by_keyword"]
+
+
+def test_truncated_journal_forces_rebuild(tmp_path, make_index):
+    populated(make_index)
+    journal = tmp_path / "memory_actions.jsonl"
+    journal.write_text(journal.read_text().splitlines()[0] + "\n")
+
+    reloaded = make_index()
+    assert len(reloaded.actions) == 1
+    assert reloaded.search_by_type("doc_created") == []
+
+
+def test_stale_or_legacy_index_forces_rebuild(tmp_path, make_index):
+    populated(make_index)
+    with open(tmp_path / "memory_index.json", "w") as f:
+        json.dump({"version": 2, "count": 2, "postings": {}}, f)  # pre-columnar format
+    reloaded = make_index()
+    assert reloaded.search_by_keyword("jarvis_main.py")
+    assert len(reloaded.search_by_type("file_read")) == 1
+
+
+def test_actions_are_materialized_from_the_journal(make_index):
+    index = populated(make_index)
+    store = index.actions
+    assert list(store.times) == sorted(store.times)
+    assert store.action_type(1) == "doc_created"
+    assert store[-1]["metadata"] == {"short_key": "20260201-c1"}  # read back, not held in RAM
+    assert [a["description"] for a in store[0:2]] == ["Read jarvis_main.py", "Optimization report for the ear"]
+
+
+def test_out_of_order_timestamps_stay_sorted(tmp_path, make_index):
+    with open(tmp_path / "memory.json", "w") as f:
+        json.dump({"vault_actions": [
+            {"timestamp": "2026-01-05T09:00:00", "action_type": "note", "description": "later", "metadata": {}},
+            {"timestamp": "2026-01-04T09:00:00", "action_type": "note", "description": "earlier", "metadata": {}},
+            {"timestamp": "not a date", "action_type": "note", "description": "undated", "metadata": {}},
+        ]}, f)
+    index = make_index()
+    window = (datetime(2026, 1, 1), datetime(2026, 1, 31))
+    assert [a["description"] for a in index.search_by_date_range(*window)] == ["earlier", "later"]
+    index.save({})
+    reloaded = make_index()
+    assert [a["description"] for a in reloaded.search_by_date_range(*window)] == ["earlier", "later"]
@@ -0,0 +1,182 @@
+"""Test the MemoryIndex action journal: O(1) appends, index checkpoints and crash recovery."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import json
+
+import pytest
+
+from memory_index import ActionJournal
+
+
+def write_memory(tmp_path, **memory):
+    with open(tmp_path / "memory.json", "w") as f:
+        json.dump(memory, f)
+
+
+def journal_lines(tmp_path):
+    return (tmp_path / "memory_actions.jsonl").read_text().splitlines()
+
+
+def test_add_action_appends_without_rewriting_memory(tmp_path, make_index):
+    write_memory(tmp_path, facts=["likes tea"])
+    before = (tmp_path / "memory.json").read_bytes()
+    index = make_index()
+    for i in range(5):
+        index.add_action("file_read", f"read notes {i}")
+    index.close()
+
+    assert (tmp_path / "memory.json").read_bytes() == before
+    assert [json.loads(line)["description"] for line in journal_lines(tmp_path)] == [f"read notes {i}" for i in range(5)]
+
+
+def test_restart_replays_journal(make_index):
+    index = make_index()
+    index.add_action("doc_created", "optimization report")
+    index.add_action("file_read", "read jarvis_main.py", {"filename": "jarvis_main.py"})
+    index.close()
+
+    reloaded = make_index()
+    assert [a["description"] for a in reloaded.actions] == ["optimization report", "read jarvis_main.py"]
+    assert reloaded.search_by_type("doc_created")[0]["description"] == "optimization report"
+    assert reloaded.search_by_keyword("jarvis_main.py")
+    assert reloaded.unindexed == 2
+
+
+def test_checkpoint_refreshes_index_not_memory(tmp_path, make_index):
+    write_memory(tmp_path, facts=["likes tea"])
+    index = make_index(checkpoint_every=3)
+    for i in range(4):
+        index.add_action("conversation", f"turn {i}")
+    index.close()
+
+    with open(tmp_path / "memory.json") as f:
+        assert json.load(f) == {"facts": ["likes tea"]}
+    with open(tmp_path / "memory_index.json") as f:
+        assert json.load(f)["count"] == 3
+    assert index.unindexed == 1
+
+    reloaded = make_index()
+    assert [a["description"] for a in reloaded.actions] == [f"turn {i}" for i in range(4)]
+
+
+def test_save_drops_vault_actions_from_memory_file(tmp_path, make_index):
+    index = make_index()
+    index.add_action("conversation", "hello")
+    assert index.save({"facts": [], "vault_actions": ["stale"], "journal_seq": 3})
+    with open(tmp_path / "memory.json") as f:
+        assert json.load(f) == {"facts": []}
+    assert index.unindexed == 0
+    assert [a["description"] for a in make_index().actions] == ["hello"]
+
+
+def test_legacy_history_is_moved_into_journal(tmp_path, make_index):
+    legacy = {"timestamp": "2026-01-05T09:00:00", "action_type": "file_read",
+              "description": "Read jarvis_main.py", "metadata": {}}
+    write_memory(tmp_path, facts=[], vault_actions=[legacy], journal_seq=1)
+    with open(tmp_path / "memory_journal.jsonl", "w") as f:
+        f.write(json.dumps({"seq": 1, "action": legacy}) + "\n")  # already in vault_actions
+        f.write(json.dumps({"seq": 2, "action": dict(legacy, description="From the old journal")}) + "\n")
+
+    index = make_index()
+    assert [a["description"] for a in index.actions] == ["Read jarvis_main.py", "From the old journal"]
+    assert not (tmp_path / "memory_journal.jsonl").exists()
+    assert len(journal_lines(tmp_path)) == 2
+    index.close()
+    assert len(make_index().actions) == 2  # not moved twice
+
+
+def test_torn_tail_is_dropped(tmp_path, make_index):
+    index = make_index()
+    index.add_action("conversation", "complete")
+    index.close()
+    with open(tmp_path / "memory_actions.jsonl", "a") as f:
+        f.write('{"timestamp": "2026-01-05T09:00:00", "descr')
+
+    reloaded = make_index()
+    assert [a["description"] for a in reloaded.actions] == ["complete"]
+    reloaded.add_action("conversation", "after crash")
+    reloaded.close()
+    assert [a["description"] for a in make_index().actions] == ["complete", "after crash"]
+
+
+def test_corrupt_line_mid_journal_keeps_later_records(tmp_path, make_index):
+    index = make_index()
+    for i in range(5):
+        index.add_action("note", f"note {i}")
+    index.close()
+    lines = journal_lines(tmp_path)
+    lines[1] = "#" + lines[1][1:]  # same length, no longer JSON
+    (tmp_path / "memory_actions.jsonl").write_text("\n".join(lines) + "\n")
+    size = os.path.getsize(tmp_path / "memory_actions.jsonl")
+
+    reloaded = make_index()
+    assert [a["description"] for a in reloaded.actions] == ["note 0", "note 2", "note 3", "note 4"]
+    reloaded.close()
+    assert os.path.getsize(tmp_path / "memory_actions.jsonl") == size
+    assert (tmp_path / "memory_actions.jsonl.corrupt").read_text() == lines[1] + "\n"
+
+    again = make_index()  # the blanked line is skipped quietly and not moved twice
+    assert len(again.actions) == 4
+    again.add_action("note", "note 5")
+    again.close()
+    assert [a["description"] for a in make_index().actions][-1] == "note 5"
+    assert (tmp_path / "memory_actions.jsonl.corrupt").read_text() == lines[1] + "\n"
+
+
+def test_unwritten_action_stays_searchable(monkeypatch, make_index):
+    index = make_index()
+
+    def disk_full(records):
+        raise OSError("disk full")
+    monkeypatch.setattr(index.journal, "append", disk_full)
+    index.add_action("conversation", "kept in memory")
+    assert index.search_by_keyword("memory")[0]["description"] == "kept in memory"
+    assert index.checkpoint() is False  # positions would not match the journal
+
+
+def test_unwritten_actions_are_retried_and_checkpoint_requests_stay_bounded(monkeypatch, make_index):
+    index = make_index(checkpoint_every=3)
+    requests = []
+    index.on_checkpoint_due = lambda: requests.append(len(index.actions))
+    append = index.journal.append
+
+    def disk_full(records):
+        raise OSError("disk full")
+    monkeypatch.setattr(index.journal, "append", disk_full)
+    index.add_action("note", "lost write")
+    assert index.save({"facts": []}) is False  # the action is not durable yet
+    for i in range(9):
+        index.add_action("note", f"still failing {i}")
+    assert requests == [3, 6, 9]  # one per checkpoint_every actions, not one per add
+
+    monkeypatch.setattr(index.journal, "append", append)  # disk recovers
+    index.add_action("note", "after recovery")
+    assert index.search_by_keyword("lost")[0]["description"] == "lost write"
+    assert index.save({"facts": []}) is True
+    assert index.unindexed == 0
+    index.close()
+
+    descriptions = [a["description"] for a in make_index().actions]
+    assert descriptions == ["lost write"] + [f"still failing {i}" for i in range(9)] + ["after recovery"]
+
+
+def test_failed_append_leaves_no_partial_line(tmp_path, monkeypatch):
+    journal = ActionJournal(str(tmp_path / "j.jsonl"), fsync="always")
+    journal.append([b'{"a":1}'])
+
+    def io_error(fd):
+        raise OSError("I/O error")
+    monkeypatch.setattr(os, "fsync", io_error)
+    with pytest.raises(OSError):
+        journal.append([b'{"a":2}'])
+    monkeypatch.undo()
+    assert journal.append([b'{"a":3}']) == [8]
+    journal.close()
+    assert (tmp_path / "j.jsonl").read_bytes() == b'{"a":1}\n{"a":3}\n'
+
+
+def test_unknown_fsync_policy_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ActionJournal(str(tmp_path / "j.jsonl"), fsync="sometimes")
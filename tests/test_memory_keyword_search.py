@@ -0,0 +1,107 @@
+"""Test trigram-backed substring keyword search in MemoryIndex."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import random
+import threading
+import time
+
+from memory_index import MemoryIndex
+
+WORDS = ["invoice", "landlord", "garden", "optimization", "report", "jarvis_main.py", "vault",
+         "porcupine", "decorators", "python", "meeting", "dentist", "email", "reply", "lettings"]
+
+
+def with_actions(index, actions):
+    for action_type, description, metadata in actions:
+        index.add_action(action_type, description, metadata)
+    return index
+
+
+def reference_search(index, keyword, limit):
+    """The original full-vocabulary scan, ranked newest first."""
+    keyword = keyword.lower()
+    if keyword in index.index["by_keyword"]:
+        ids = set(index.index["by_keyword"][keyword])
+    else:
+        ids = set()
+        for kw, idx_set in index.index["by_keyword"].items():
+            if keyword in kw:
+                ids |= set(idx_set)
+    return [index.actions[i] for i in sorted(ids, reverse=True)[:limit]]
+
+
+def test_matches_reference_scan(make_index):
+    rng = random.Random(7)
+    index = with_actions(make_index(), [
+        ("file_read", " ".join(rng.sample(WORDS, 3)), {"filename": rng.choice(WORDS)}) for _ in range(300)
+    ])
+    queries = WORDS + ["voic", "land", "ptimiz", "main.p", "ly", "zzz", "re", "ttin", "o"]
+    for warm in (False, True):  # vocabulary scan, then trigram lookups
+        if warm:
+            index.warm_in_background().join(5)
+        for query in queries:
+            for limit in (1, 5, 50):
+                assert index.search_by_keyword(query, limit) == reference_search(index, query, limit), query
+
+
+def test_results_are_most_recent_first(make_index):
+    index = with_actions(make_index(), [("email_reply", f"Replied to landlord {i}", {}) for i in range(10)])
+    hits = index.search_by_keyword("landlord", limit=3)
+    assert [h["description"] for h in hits] == ["Replied to landlord 9", "Replied to landlord 8", "Replied to landlord 7"]
+    hits = index.search_by_keyword("andlo", limit=2)
+    assert [h["description"] for h in hits] == ["Replied to landlord 9", "Replied to landlord 8"]
+
+
+def test_keywords_added_after_warming_are_found(make_index):
+    index = with_actions(make_index(), [("note", "garden plans", {})])
+    index.warm_in_background().join(5)
+    assert index._trigram_index is not None
+    index.add_action("note", "porcupine sighting")
+    assert [h["description"] for h in index.search_by_keyword("cupin")] == ["porcupine sighting"]
+
+
+def test_substring_query_never_waits_on_the_writer(make_index):
+    index = with_actions(make_index(), [("note", "garden plans", {})])
+    results = []
+    with index._lock:  # an append (and its fsync) in progress
+        reader = threading.Thread(target=lambda: results.append(index.search_by_keyword("arde")))
+        reader.start()
+        reader.join(2)
+        assert not reader.is_alive()
+    assert [h["description"] for h in results[0]] == ["garden plans"]
+    assert index._trigram_index is None  # readers scan the vocabulary until it is built
+
+
+def test_trigram_index_is_rebuilt_after_a_reindex(make_index):
+    index = with_actions(make_index(), [("note", "garden plans", {})])
+    index.warm_in_background().join(5)
+    index._rebuild_index()
+    deadline = time.time() + 5
+    while index._trigram_index is None and time.time() < deadline:
+        time.sleep(0.01)
+    assert "garden" in index._trigram_index["ard"]
+
+
+def test_trigrams_out_of_order_are_not_matches(make_index):
+    index = with_actions(make_index(), [("note", "abcab", {})])
+    assert index.search_by_keyword("cabc") == []
+    assert index.search_by_keyword("bca")
+
+
+def test_build_picks_up_keywords_added_during_build(monkeypatch, make_index):
+    index = with_actions(make_index(), [("note", "garden plans", {})])
+    real_trigrams = MemoryIndex._trigrams
+    added = []
+
+    def trigrams_with_concurrent_add(text):
+        if not added:
+            added.append(True)
+            index.add_action("note", "porcupine sighting")  # lands mid-build
+        return real_trigrams(text)
+    monkeypatch.setattr(MemoryIndex, "_trigrams", staticmethod(trigrams_with_concurrent_add))
+    index.build_trigram_index()
+    monkeypatch.undo()
+    assert "porcupine" in index._trigram_index["cup"]
+    assert index.search_by_keyword("cupin")
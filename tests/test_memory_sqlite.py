@@ -0,0 +1,97 @@
+"""Test the SQLite memory index backend and the JSON migration tool."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import json
+from datetime import datetime
+
+import pytest
+
+from memory_index import MemoryIndex
+from memory_index_sqlite import SQLiteMemoryIndex
+from migrate_memory_to_sqlite import migrate
+
+ACTIONS = [
+    {"timestamp": "2026-01-05T09:00:00", "action_type": "file_read", "description": "Read jarvis_main.py",
+     "metadata": {"filename": "jarvis_main.py"}},
+    {"timestamp": "2026-01-06T10:00:00", "action_type": "email_reply", "description": "Replied to the landlord",
+     "metadata": {"recipient": "john@lettings.co.uk"}},
+    {"timestamp": "2026-02-01T12:00:00", "action_type": "doc_created", "description": "Optimization report",
+     "metadata": {"short_key": "20260201-c1"}},
+    {"timestamp": "2026-02-02T08:30:00", "action_type": "file_read", "description": "Read vault_reference.py",
+     "metadata": {"filename": "vault_reference.py"}},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    index = SQLiteMemoryIndex(db_file=str(tmp_path / "memory.db"), memory_file=str(tmp_path / "memory.json"))
+    index.import_actions(ACTIONS)
+    yield index
+    index.close()
+
+
+def descriptions(actions):
+    return [a["description"] for a in actions]
+
+
+def test_same_queries_as_json_index(store, tmp_path):
+    with open(tmp_path / "legacy.json", "w") as f:
+        json.dump({"vault_actions": ACTIONS}, f)
+    json_index = MemoryIndex(memory_file=str(tmp_path / "legacy.json"), index_file=str(tmp_path / "legacy_index.json"),
+                             fsync="never")
+
+    assert store.search_by_type("file_read") == json_index.search_by_type("file_read")
+    assert store.get_last_n(3) == json_index.get_last_n(3)
+    window = (datetime(2026, 1, 6), datetime(2026, 2, 1, 23, 59))
+    assert store.search_by_date_range(*window) == json_index.search_by_date_range(*window)
+    assert store.get_stats()["action_types"] == json_index.get_stats()["action_types"]
+
+
+def test_keyword_search_matches_substrings_newest_first(store):
+    assert descriptions(store.search_by_keyword("read")) == ["Read vault_reference.py", "Read jarvis_main.py"]
+    assert descriptions(store.search_by_keyword("lettings")) == ["Replied to the landlord"]
+    assert descriptions(store.search_by_keyword("JARVIS_MAIN")) == ["Read jarvis_main.py"]
+    assert descriptions(store.search_by_keyword("read", limit=1)) == ["Read vault_reference.py"]
+    assert store.search_by_keyword("porcupine") == []
+
+
+def test_add_action_is_searchable(store):
+    action = store.add_action("conversation", "Talked about the garden", {"topic": "garden"})
+    assert store.get_last_n(1) == [action]
+    assert store.search_by_keyword("garden") == [action]
+
+
+def test_save_drops_actions_from_json(store, tmp_path):
+    memory = {"facts": ["likes tea"], "vault_actions": ACTIONS, "journal_seq": 4}
+    assert store.save(memory)
+    with open(tmp_path / "memory.json") as f:
+        assert json.load(f) == {"facts": ["likes tea"]}
+
+
+def test_first_open_imports_json_history(tmp_path):
+    memory_file = tmp_path / "memory.json"
+    with open(memory_file, "w") as f:
+        json.dump({"facts": [], "vault_actions": ACTIONS[:2], "journal_seq": 2}, f)
+    json_index = MemoryIndex(memory_file=str(memory_file), index_file=str(tmp_path / "index.json"), fsync="never")
+    json_index.add_action("conversation", "journaled only")
+    json_index.close()
+
+    index = SQLiteMemoryIndex(db_file=str(tmp_path / "memory.db"), memory_file=str(memory_file))
+    assert index.count() == 3
+    assert descriptions(index.get_last_n(1)) == ["journaled only"]
+    assert os.path.exists(str(memory_file) + ".pre-sqlite")
+    index.close()
+
+
+def test_migrate_refuses_to_overwrite_without_force(tmp_path):
+    memory_file = tmp_path / "memory.json"
+    with open(memory_file, "w") as f:
+        json.dump({"vault_actions": ACTIONS}, f)
+    db_file = str(tmp_path / "memory.db")
+
+    assert migrate(str(memory_file), db_file) == 4
+    with pytest.raises(SystemExit):
+        migrate(str(memory_file), db_file)
+    assert migrate(str(memory_file), db_file, force=True) == 4
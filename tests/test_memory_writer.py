@@ -0,0 +1,127 @@
+"""Test the coalescing memory writer and atomic JSON writes."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from core.memory_writer import CoalescingWriter
+from jarvis_main import JarvisGT2
+from memory_index import atomic_write_json
+
+
+def test_burst_of_marks_becomes_one_write():
+    writes = []
+    writer = CoalescingWriter(lambda: writes.append(time.monotonic()), delay=0.1)
+    for _ in range(20):
+        writer.mark_dirty()
+    assert writes == []  # nothing on the caller's thread
+    assert writer.flush(timeout=2)
+    assert len(writes) == 1
+    assert writer.requests == 20 and writer.writes == 1
+    writer.stop()
+
+
+def test_flush_skips_the_window():
+    writes = []
+    writer = CoalescingWriter(lambda: writes.append(1), delay=30)
+    writer.mark_dirty()
+    started = time.monotonic()
+    assert writer.flush(timeout=2)
+    assert time.monotonic() - started < 1
+    assert writes == [1]
+    assert writer.flush() is True  # nothing pending
+    writer.stop()
+
+
+def test_failed_write_is_retried():
+    results = [False, RuntimeError("dictionary changed size during iteration"), True]
+    calls = []
+
+    def write():
+        calls.append(1)
+        result = results[len(calls) - 1]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    writer = CoalescingWriter(write, delay=0.01)
+    writer.mark_dirty()
+    deadline = time.time() + 2
+    while writer.pending and time.time() < deadline:
+        time.sleep(0.01)
+    assert not writer.pending
+    assert len(calls) == 3 and writer.failures == 2 and writer.writes == 1
+    writer.stop()
+
+
+def test_marks_during_a_write_trigger_another():
+    entered, release = threading.Event(), threading.Event()
+    calls = []
+
+    def write():
+        calls.append(1)
+        entered.set()
+        release.wait(2)
+
+    writer = CoalescingWriter(write, delay=0.01)
+    writer.mark_dirty()
+    assert entered.wait(2)
+    writer.mark_dirty()  # arrives while the first write is running
+    release.set()
+    assert writer.flush(timeout=2)
+    assert len(calls) == 2
+    writer.stop()
+
+
+def test_stop_flushes_pending_changes():
+    writes = []
+    writer = CoalescingWriter(lambda: writes.append(1), delay=30)
+    writer.mark_dirty()
+    assert writer.stop(timeout=2)
+    assert writes == [1]
+
+
+def test_atomic_write_replaces_whole_file(tmp_path):
+    path = tmp_path / "memory.json"
+    atomic_write_json(str(path), {"facts": ["a"]}, indent=2)
+    atomic_write_json(str(path), {"facts": ["b"]})
+    assert json.loads(path.read_text()) == {"facts": ["b"]}
+    assert os.listdir(tmp_path) == ["memory.json"]
+
+
+def test_failed_atomic_write_leaves_old_file(tmp_path):
+    path = tmp_path / "memory.json"
+    atomic_write_json(str(path), {"facts": ["old"]})
+    with pytest.raises(TypeError):
+        atomic_write_json(str(path), {"facts": [object()]})
+    assert json.loads(path.read_text()) == {"facts": ["old"]}
+    assert os.listdir(tmp_path) == ["memory.json"]
+
+
+def test_writer_copies_memory_under_the_lock():
+    with patch("jarvis_main.JarvisGT2.__init__", return_value=None):
+        j = JarvisGT2()
+    j.memory = {"tasks": [{"id": 1}], "vault_actions": [{"description": "x"}]}
+    j.memory_lock = threading.RLock()
+    saved = []
+    j.memory_index = type("Index", (), {"save": lambda self, memory: saved.append(memory)})()
+
+    with j.memory_lock:
+        writer = threading.Thread(target=j._write_memory)
+        writer.start()
+        time.sleep(0.05)
+        assert saved == []  # waits for the mutation in progress
+        j.memory["tasks"].append({"id": 2})
+    writer.join(2)
+
+    assert saved[0] == {"tasks": [{"id": 1}, {"id": 2}]}
+    assert saved[0]["tasks"] is not j.memory["tasks"]
+    j.memory["tasks"].append({"id": 3})  # later changes do not reach the written copy
+    assert len(saved[0]["tasks"]) == 2
+    assert "vault_actions" in j.memory
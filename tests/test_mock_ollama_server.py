@@ -0,0 +1,41 @@
+"""Test the mock Ollama server used by the turn latency benchmark."""
+import json
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import requests
+
+from mock_ollama_server import MockOllamaServer
+
+
+def test_generate_non_streaming_reports_ollama_counters():
+    with MockOllamaServer(prefill_ms_per_token=1, decode_ms_per_token=2, canned={"weather": "It is sunny today."}) as server:
+        resp = requests.post(server.generate_url, json={"model": "m", "prompt": "what is the weather", "stream": False}, timeout=5)
+        body = resp.json()
+    assert body["response"] == "It is sunny today."
+    assert body["done"] is True
+    assert body["prompt_eval_count"] == 4
+    assert body["eval_count"] == 4
+    assert body["eval_duration"] == 8_000_000
+    assert body["total_duration"] >= body["prompt_eval_duration"]
+    assert server.requests[0]["body"]["prompt"] == "what is the weather"
+
+
+def test_streaming_chat_and_num_predict_cap():
+    with MockOllamaServer(default_response="one two three four five") as server:
+        resp = requests.post(
+            server.chat_url,
+            json={"model": "m", "messages": [{"role": "user", "content": "hi"}], "options": {"num_predict": 3}},
+            stream=True,
+            timeout=5,
+        )
+        chunks = [json.loads(line) for line in resp.iter_lines() if line]
+    assert "".join(c["message"]["content"] for c in chunks) == "one two three"
+    assert chunks[-1]["done"] is True and chunks[-1]["eval_count"] == 3
+
+
+def test_tags_lists_models():
+    with MockOllamaServer(models=["llama3.2:latest"]) as server:
+        tags = requests.get(f"{server.base_url}/api/tags", timeout=5).json()
+    assert [m["name"] for m in tags["models"]] == ["llama3.2:latest"]
@@ -0,0 +1,92 @@
+"""Test model preload, idle keep-warm and gaming-mode release."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import time
+
+from core.model_warmer import ModelWarmer, keep_alive_seconds
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def wait_for(sent, count):
+    deadline = time.time() + 2
+    while len(sent) < count and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_preload_is_debounced_and_blocked_in_gaming_mode():
+    sent, clock, gaming = [], Clock(), {"on": False}
+    warmer = ModelWarmer(lambda m, k: sent.append((m, k)), models=["fast"], keep_alive="10m",
+                         min_preload_interval=30, is_blocked=lambda: gaming["on"], clock=clock)
+    assert warmer.preload("fast", background=False) is True
+    assert warmer.preload("fast", background=False) is False  # repeated wake word
+    clock.now += 31
+    gaming["on"] = True
+    assert warmer.preload("fast", background=False) is False
+    assert sent == [("fast", "10m")]
+
+
+def test_keep_warm_pings_only_within_activity_window():
+    sent, clock = [], Clock()
+    warmer = ModelWarmer(lambda m, k: sent.append(m), models=["fast", "smart"],
+                         keep_warm_minutes=10, ping_interval=240, clock=clock)
+    assert warmer.keep_warm_tick() == 0  # no activity yet
+    warmer.note_activity("fast")
+    clock.now += 300
+    assert warmer.keep_warm_tick() == 1
+    assert warmer.keep_warm_tick() == 0  # not due again yet
+    clock.now += 601
+    assert warmer.keep_warm_tick() == 0  # session went idle; let Ollama unload
+    assert sent == ["fast"]
+
+
+def test_keep_warm_follows_the_models_used_since_the_last_wake():
+    sent, clock = [], Clock()
+    warmer = ModelWarmer(lambda m, k: sent.append(m), models=["fast", "smart"],
+                         keep_warm_minutes=10, ping_interval=240, clock=clock)
+    warmer.note_activity("fast")
+    warmer.note_activity("smart")
+    clock.now += 250
+    assert warmer.keep_warm_tick() == 2
+    warmer.note_wake()
+    warmer.note_activity("fast")  # this interaction only needed the fast model
+    clock.now += 250
+    assert warmer.keep_warm_tick() == 1
+    assert sent == ["fast", "smart", "fast"]
+
+
+def test_unload_sends_zero_keep_alive_for_all_models():
+    sent = []
+    warmer = ModelWarmer(lambda m, k: sent.append((m, k)), models=["fast", "smart", "fast"])
+    warmer.unload()
+    wait_for(sent, 2)
+    assert sorted(sent) == [("fast", 0), ("smart", 0)]
+
+
+def test_keep_alive_durations_parse_like_ollama():
+    assert keep_alive_seconds("10m") == 600
+    assert keep_alive_seconds("1h30m") == 5400
+    assert keep_alive_seconds("90s") == keep_alive_seconds(90) == keep_alive_seconds("90") == 90
+    assert keep_alive_seconds("-1") == keep_alive_seconds(-1) == keep_alive_seconds("-1m") == float("inf")
+    assert keep_alive_seconds("soon") is None and keep_alive_seconds("") is None
+
+
+def test_ping_interval_follows_keep_alive():
+    assert ModelWarmer(lambda m, k: None, keep_alive="10m").ping_interval == 480
+    assert ModelWarmer(lambda m, k: None, keep_alive="2m").ping_interval == 96
+    assert ModelWarmer(lambda m, k: None, keep_alive="10m", ping_interval=60).ping_interval == 60
+
+    sent, clock = [], Clock()
+    forever = ModelWarmer(lambda m, k: sent.append(m), models=["fast"], keep_alive=-1, clock=clock)
+    forever.note_activity("fast")
+    clock.now += 3600
+    assert forever.keep_warm_tick() == 0  # never unloads, so never needs a ping
+    assert sent == []
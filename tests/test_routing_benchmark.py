@@ -0,0 +1,53 @@
+"""Test the routing benchmark: stage outcomes, accuracy scoring and baseline diff."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import json
+
+from routing_benchmark import DEFAULT_BASELINE, DEFAULT_CORPUS, compare_to_baseline, run_benchmark
+
+CASES = [
+    {"text": "remind me to call mum", "expect": "TASK", "handler": "handle_task_request"},
+    {"text": "what's the news today", "expect": "NEWS", "handler": "handle_news_request"},
+    {"text": "dig deeper into wr1", "expect": "<short_key>", "handler": "handle_deep_dig"},
+    {"text": "the second one is done", "expect": "<context>", "state": {"last_intent": "task"}},
+    {"text": "yes", "expect": "<confirmation>", "state": {"pending_reply": {
+        "email_id": "m1", "sender": "a@example.com", "sender_name": "A", "reply_text": "ok"}}},
+    {"text": "tell me a joke", "expect": "WEB_SEARCH"},  # deliberately mislabelled
+]
+
+
+def test_outcomes_accuracy_and_confusion():
+    report = run_benchmark(CASES, runs=2)
+    assert report["cases"] == len(CASES)
+    assert report["accuracy"] == round(5 / 6, 4)
+    assert report["confusion"]["TASK"] == {"TASK": 1}
+    assert report["confusion"]["<confirmation>"] == {"<confirmation>": 1}
+    assert report["confusion"]["WEB_SEARCH"] == {"<fallback>": 1}
+    assert [m["text"] for m in report["misroutes"]] == ["tell me a joke"]
+    assert report["stages"]["confirmation"]["count"] == 2 * len(CASES)
+    assert report["stages"]["intent_match"]["count"] == 2 * 3  # three cases reach the intent table
+
+
+def test_baseline_diff_flags_new_misroutes_and_slow_stages():
+    report = run_benchmark(CASES[:2], runs=1)
+    baseline = {"accuracy": 1.0, "misroutes": [], "stages": {"intent_match": {"p50_us": 0.001}}}
+    worse = dict(report, accuracy=0.5, misroutes=[
+        {"text": "x", "outcome": "<fallback>", "handler": "fallback_to_llm", "expect": "TASK"}])
+    messages = compare_to_baseline(worse, baseline, tolerance=0.5)
+    assert any("accuracy" in m for m in messages)
+    assert any("new misroute" in m for m in messages)
+    assert any(m.startswith("intent_match") for m in messages)
+    assert compare_to_baseline(report, report, tolerance=0.5) == []
+    untimed = compare_to_baseline(worse, baseline)  # timings are opt-in
+    assert untimed and not any(m.startswith("intent_match") for m in untimed)
+
+
+def test_corpus_routes_no_worse_than_committed_baseline():
+    with open(DEFAULT_CORPUS, "r", encoding="utf-8") as f:
+        cases = json.load(f)["cases"]
+    with open(DEFAULT_BASELINE, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    report = run_benchmark(cases, runs=1)
+    assert compare_to_baseline(report, baseline) == []
@@ -0,0 +1,84 @@
+"""Test the persistent ledger short-key index and restart-safe ShortKeyGenerator counters."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import json
+from datetime import date, datetime, timedelta
+
+from core.context_manager import ConversationalLedger, ShortKeyGenerator, expand_dated_aliases
+from memory_index import MemoryIndex
+from memory_index_sqlite import SQLiteMemoryIndex
+
+TODAY = date.today().strftime("%Y%m%d")
+
+
+def make_ledger(index):
+    return ConversationalLedger(index, ShortKeyGenerator(index.short_key_counters))
+
+
+def test_full_key_resolves_to_ledger_entry(make_index):
+    index = make_index()
+    ledger = make_ledger(index)
+    web = ledger.add_entry("w", "Web result: Porcupines", {"url": "https://example.com/porcupines"})
+    ledger.add_entry("e", "Email from John", {"sender": "john@lettings.co.uk"})
+
+    assert web["metadata"]["short_key"] == f"{TODAY}-wr1"
+    assert index.get_by_short_key(f"{TODAY}-wr1") == web
+    assert index.get_by_short_key(f" {TODAY}-WR1 ")["metadata"]["url"] == "https://example.com/porcupines"
+    assert index.get_by_short_key(f"{TODAY}-e1")["description"] == "Email from John"
+    assert index.get_by_short_key(f"{TODAY}-wr9") is None
+
+
+def test_keys_survive_restart_without_rebuild(monkeypatch, make_index):
+    index = make_index()
+    make_ledger(index).add_entry("c", "Code analysis for jarvis_main.py", {"source_file": "jarvis_main.py"})
+    index.save({})
+
+    monkeypatch.setattr(MemoryIndex, "_rebuild_index", lambda self: (_ for _ in ()).throw(AssertionError("rebuilt")))
+    reloaded = make_index()
+    assert reloaded.get_by_short_key(f"{TODAY}-c1")["metadata"]["source_file"] == "jarvis_main.py"
+
+
+def test_generator_counters_continue_after_restart(make_index):
+    index = make_index()
+    ledger = make_ledger(index)
+    for _ in range(2):
+        ledger.add_entry("w", "Web result", {})
+    ledger.add_entry("c", "Code analysis", {})
+    index.close()
+
+    reloaded = make_index()
+    assert reloaded.short_key_counters(TODAY) == {"wr": 2, "c": 1}
+    ledger = make_ledger(reloaded)
+    assert ledger.add_entry("w", "Web result", {})["metadata"]["short_key"] == f"{TODAY}-wr3"
+    assert ledger.add_entry("e", "Email", {})["metadata"]["short_key"] == f"{TODAY}-e1"
+
+
+def test_archived_keys_are_found_in_their_month(tmp_path, make_index):
+    old = datetime.now() - timedelta(days=200)
+    key = old.strftime("%Y%m%d") + "-c1"
+    with open(tmp_path / "memory.json", "w") as f:
+        json.dump({"vault_actions": [{"timestamp": old.isoformat(), "action_type": "c",
+                                      "description": "Old analysis", "metadata": {"short_key": key}}]}, f)
+    index = make_index(hot_days=30)
+    assert len(index.actions) == 0
+    assert index.get_by_short_key(key)["description"] == "Old analysis"
+
+
+def test_sqlite_backend_lookup_and_counters(tmp_path):
+    index = SQLiteMemoryIndex(db_file=str(tmp_path / "memory.db"), memory_file=str(tmp_path / "memory.json"))
+    ledger = make_ledger(index)
+    ledger.add_entry("w", "Web result", {"url": "https://example.com"})
+    ledger.add_entry("w", "Web result 2", {})
+    assert index.get_by_short_key(f"{TODAY}-wr1")["metadata"]["url"] == "https://example.com"
+    assert index.short_key_counters(TODAY) == {"wr": 2}
+    assert make_ledger(index).add_entry("w", "Web result 3", {})["metadata"]["short_key"] == f"{TODAY}-wr3"
+    index.close()
+
+
+def test_dated_aliases_expand_to_full_keys():
+    today = date(2026, 2, 14)
+    assert expand_dated_aliases("show yesterday's c1", today) == "show 20260213-c1"
+    assert expand_dated_aliases("open todays wr3", today) == "open 20260214-wr3"
+    assert expand_dated_aliases("open wr3", today) == "open wr3"
@@ -0,0 +1,85 @@
+"""Test single-flight sharing of concurrent identical brain requests."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import threading
+import time
+
+import pytest
+
+from core.single_flight import FlightTimeout, SingleFlight, brain_request_key
+
+
+def run_concurrently(n, target):
+    results = [None] * n
+    errors = [None] * n
+
+    def worker(i):
+        try:
+            results[i] = target()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def test_concurrent_callers_share_one_execution():
+    flights = SingleFlight()
+    executions = []
+
+    def slow():
+        executions.append(1)
+        time.sleep(0.2)
+        return "summary"
+
+    results, _ = run_concurrently(4, lambda: flights.do("k", slow))
+    assert results == ["summary"] * 4
+    assert len(executions) == 1
+    stats = flights.stats()
+    assert stats["executed"] == 1 and stats["hits"] == 3 and stats["max_attached"] == 3
+    assert flights.in_flight() == 0
+
+
+def test_errors_are_shared_and_nothing_is_cached():
+    flights = SingleFlight()
+
+    def boom():
+        time.sleep(0.1)
+        raise TimeoutError("brain timeout")
+
+    _, errors = run_concurrently(3, lambda: flights.do("k", boom))
+    assert all(isinstance(e, TimeoutError) for e in errors)
+
+    assert flights.do("k", lambda: "fresh") == "fresh"
+    with pytest.raises(ValueError):
+        flights.do("k", lambda: (_ for _ in ()).throw(ValueError("x")))
+
+
+def test_follower_wait_is_bounded_by_its_timeout():
+    flights = SingleFlight()
+    release = threading.Event()
+    leader = threading.Thread(target=lambda: flights.do("k", lambda: release.wait(5) and "late"))
+    leader.start()
+    while not flights.in_flight():
+        time.sleep(0.01)
+
+    started = time.monotonic()
+    with pytest.raises(FlightTimeout):
+        flights.do("k", lambda: "unused", timeout=0.1)
+    assert time.monotonic() - started < 1
+    assert flights.stats()["timeouts"] == 1
+    release.set()
+    leader.join()
+
+
+def test_key_covers_generation_options():
+    base = brain_request_key("m", "p")
+    assert base == brain_request_key("m", "p", None, {})
+    assert base != brain_request_key("m", "p", None, {"num_predict": 40})
+    assert base != brain_request_key("other", "p")
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+End-to-end turn latency benchmark.
+
+Replays utterance scripts through the real process_conversation routing and
+handlers, with the brain served by mock_ollama_server.MockOllamaServer and the
+Google/news services stubbed as in run_live_session_silent.py. Reports per-stage
+latency percentiles and can fail on regressions against a saved baseline.
+
+Usage:
+  python turn_latency_benchmark.py --runs 5
+  python turn_latency_benchmark.py --decode-ms 15 --json benchmarks/turn_latency_latest.json
+  python turn_latency_benchmark.py --baseline benchmarks/turn_latency_baseline.json --tolerance 0.25
+  python turn_latency_benchmark.py --cassette benchmarks/cassettes/turns.json --cassette-mode replay --latency-scale 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import contextlib
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+from unittest.mock import patch
+
+import requests
+
+from core.cassette import Cassette
+from core.llm_telemetry import LLMTelemetry
+from mock_ollama_server import MockOllamaServer, load_canned
+from run_live_session_silent import build_jarvis_for_silent_tests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SCRIPTS = os.path.join(HERE, "benchmarks", "turn_scripts.json")
+DEFAULT_CANNED = os.path.join(HERE, "benchmarks", "mock_ollama_canned.json")
+
+# Stage name -> JarvisGT2 method timed for that stage (inclusive wall time).
+STAGES = {
+    "confirmation": "check_pending_confirmation",
+    "short_key": "_handle_contextual_command",
+    "context_route": "_route_by_context",
+    "intent_match": "_match_intent",
+    "dispatch": "_dispatch_intent",
+    "fallback": "fallback_to_llm",
+    "brain": "_call_brain_model",
+}
+
+NEWS_PAYLOAD = {
+    "status": "ok",
+    "articles": [
+        {"title": f"Headline {i}", "description": f"Story {i} summary.", "url": f"https://example.com/n{i}", "source": {"name": "Wire"}}
+        for i in range(1, 6)
+    ],
+}
+
+
+def _fake_get(url, *args, **kwargs):
+    """Offline stand-in for NewsAPI and page fetches."""
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.url = url
+    resp.encoding = "utf-8"
+    if "newsapi.org" in url:
+        resp.headers["Content-Type"] = "application/json"
+        resp._content = json.dumps(NEWS_PAYLOAD).encode("utf-8")
+    else:
+        resp.headers["Content-Type"] = "text/html"
+        resp._content = b"<html><body><h1>Article</h1><p>Detailed content for benchmarking.</p></body></html>"
+    return resp
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    idx = int(round(pct / 100.0 * (len(s) - 1)))
+    return s[idx]
+
+
+def build_jarvis(turn_samples: Dict[str, List[float]], telemetry: LLMTelemetry):
+    """Silent-harness Jarvis with the real brain path and timed stage methods."""
+    j = build_jarvis_for_silent_tests()
+    del j.call_smart_model  # use the real tiered call against the mock server
+    j.current_llm_tier = "smart"
+    j.ui_mode = "normal"
+    j.llm_telemetry = telemetry
+
+    for stage, method_name in STAGES.items():
+        original = getattr(j, method_name)
+
+        def timed(*args, _orig=original, _stage=stage, **kwargs):
+            started = time.perf_counter()
+            try:
+                return _orig(*args, **kwargs)
+            finally:
+                turn_samples[_stage].append((time.perf_counter() - started) * 1000.0)
+
+        setattr(j, method_name, functools.wraps(original)(timed))
+    return j
+
+
+def run_benchmark(scripts: List[Dict], server: MockOllamaServer, runs: int = 3,
+                  cassette: Optional[Cassette] = None) -> Dict:
+    """Replay scripts; with a cassette, brain/HTTP/search calls are recorded or replayed."""
+    stage_samples: Dict[str, List[float]] = defaultdict(list)
+    turn_ms: List[float] = []
+    telemetry = LLMTelemetry(log_path=None)
+    with patch("jarvis_main.BRAIN_URL", server.generate_url), \
+            patch("jarvis_main.NEWS_API_KEY", "benchmark-key"), \
+            patch("jarvis_main.requests.get", side_effect=_fake_get), \
+            (cassette or contextlib.nullcontext()):
+        for _ in range(max(1, runs)):
+            for script in scripts:
+                # Fresh instance per script so short keys/context do not leak between scripts.
+                per_turn: Dict[str, List[float]] = defaultdict(list)
+                j = build_jarvis(per_turn, telemetry)
+                if cassette is not None:
+                    cassette.patch_callable(j, "google_search")
+                for utterance in script.get("turns", []):
+                    per_turn.clear()
+                    started = time.perf_counter()
+                    j.process_conversation(utterance)
+                    turn_ms.append((time.perf_counter() - started) * 1000.0)
+                    for stage, values in per_turn.items():
+                        # A stage may run more than once per turn (e.g. two brain calls).
+                        stage_samples[stage].append(sum(values))
+
+    stage_samples["turn"] = turn_ms
+    report = {"runs": runs, "turns": len(turn_ms), "stages": {}}
+    for stage, values in stage_samples.items():
+        report["stages"][stage] = {
+            "count": len(values),
+            "p50": round(percentile(values, 50), 3),
+            "p90": round(percentile(values, 90), 3),
+            "p95": round(percentile(values, 95), 3),
+            "p99": round(percentile(values, 99), 3),
+            "max": round(max(values), 3) if values else 0.0,
+        }
+    report["brain_breakdown"] = telemetry.summary()
+    return report
+
+
+def compare_to_baseline(report: Dict, baseline: Dict, tolerance: float, metric: str = "p95") -> List[str]:
+    """Return regression messages for stages slower than baseline * (1 + tolerance)."""
+    regressions = []
+    for stage, current in report.get("stages", {}).items():
+        base = baseline.get("stages", {}).get(stage)
+        if not base or base.get(metric, 0) <= 0:
+            continue
+        limit = base[metric] * (1.0 + tolerance)
+        if current[metric] > limit:
+            regressions.append(f"{stage}: {metric} {current[metric]:.2f}ms > {limit:.2f}ms (baseline {base[metric]:.2f}ms)")
+    return regressions
+
+
+def print_report(report: Dict) -> None:
+    print(f"\nTurn latency ({report['turns']} turns, {report['runs']} run(s))")
+    print(f"  {'stage':<14} {'n':>5} {'p50':>10} {'p90':>10} {'p95':>10} {'p99':>10} {'max':>10}")
+    order = ["turn"] + [s for s in STAGES if s in report["stages"]]
+    for stage in order:
+        row = report["stages"].get(stage)
+        if not row:
+            continue
+        print(f"  {stage:<14} {row['count']:>5} {row['p50']:>9.2f}ms {row['p90']:>8.2f}ms "
+              f"{row['p95']:>8.2f}ms {row['p99']:>8.2f}ms {row['max']:>8.2f}ms")
+    brain = report.get("brain_breakdown")
+    if brain and brain.get("count"):
+        print(f"  brain prefill p50={brain['prefill_ms']['p50']}ms decode p50={brain['decode_ms']['p50']}ms "
+              f"queue p50={brain['queue_ms']['p50']}ms")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay utterance scripts and report per-stage latency")
+    parser.add_argument("--scripts", default=DEFAULT_SCRIPTS, help="JSON file with {'scripts': [{'name', 'turns'}]}")
+    parser.add_argument("--canned", default=DEFAULT_CANNED, help="Mock brain canned responses")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--prefill-ms", type=float, default=0.2, help="Mock prefill ms per prompt token")
+    parser.add_argument("--decode-ms", type=float, default=2.0, help="Mock decode ms per output token")
+    parser.add_argument("--json", dest="json_out", help="Write the report to this path")
+    parser.add_argument("--baseline", help="Compare against a previous --json report")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--cassette", help="Record/replay brain, HTTP and search calls to this file")
+    parser.add_argument("--cassette-mode", choices=["record", "replay", "auto"], default="auto")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Replay latency multiplier (0 = instant)")
+    args = parser.parse_args(argv)
+
+    with open(args.scripts, "r", encoding="utf-8") as f:
+        scripts = json.load(f)["scripts"]
+
+    canned = load_canned(args.canned) if args.canned and os.path.exists(args.canned) else {}
+    with MockOllamaServer(prefill_ms_per_token=args.prefill_ms, decode_ms_per_token=args.decode_ms, canned=canned) as server:
+        cassette = None
+        if args.cassette:
+            # Match on path only: the mock server port changes between runs.
+            cassette = Cassette(args.cassette, mode=args.cassette_mode, latency_scale=args.latency_scale, match_host=False)
+        report = run_benchmark(scripts, server, runs=args.runs, cassette=cassette)
+
+    print_report(report)
+    if args.json_out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json_out)), exist_ok=True)
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json_out}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print("\nLatency regressions:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\nNo latency regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())